@@ -0,0 +1,126 @@
+"""Measure compress_pdf and the optimize flag on synthetic image-heavy fixtures.
+
+Usage:
+    python benchmarks/bench_compress.py [--pages 10] [--image-px 2000] [--dpi 150]
+
+Fixtures:
+    scanned   one distinct photo-like image per page (images_to_pdf style)
+    repeated  the same PDF merged several times (duplicate fonts and images)
+    text      text-only pages written without content compression
+
+Reports input/output bytes, ratio and wall time for each mode.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from PIL import Image  # noqa: E402
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.utils import ImageReader  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from fastmcp_pdf_server.services import pdf_processor  # noqa: E402
+
+
+def photo(size: int, seed: int) -> Image.Image:
+    angle = (seed * 37) % 360
+    return Image.merge(
+        "RGB",
+        (
+            Image.radial_gradient("L").resize((size, size)),
+            Image.effect_noise((size, size), 30 + seed % 20),
+            Image.linear_gradient("L").rotate(angle).resize((size, size)),
+        ),
+    )
+
+
+def make_scanned(path: Path, pages: int, image_px: int) -> None:
+    c = canvas.Canvas(str(path), pagesize=A4)
+    width, height = A4
+    for i in range(pages):
+        c.drawImage(ImageReader(photo(image_px, i)), 0, 0, width=width, height=height)
+        c.drawString(50, height - 50, f"Scanned page {i+1}")
+        c.showPage()
+    c.save()
+
+
+def make_text(path: Path, pages: int) -> None:
+    c = canvas.Canvas(str(path), pagesize=A4, pageCompression=0)
+    width, height = A4
+    for i in range(pages):
+        y = height - 60
+        while y > 60:
+            c.drawString(50, y, f"Line {int(y)} of page {i+1}: quarterly totals and balances")
+            y -= 14
+        c.showPage()
+    c.save()
+
+
+def timed(fn) -> tuple[dict, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, round(time.perf_counter() - start, 4)
+
+
+def row(input_size: int, output_size: int, seconds: float, **extra) -> dict:
+    return {
+        "input_bytes": input_size,
+        "output_bytes": output_size,
+        "ratio": round(output_size / input_size, 4),
+        "seconds": seconds,
+        **extra,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--image-px", type=int, default=2000)
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--copies", type=int, default=4, help="merge count for the repeated fixture")
+    args = parser.parse_args()
+
+    report: dict = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        scanned = tmpdir / "scanned.pdf"
+        make_scanned(scanned, args.pages, args.image_px)
+        text = tmpdir / "text.pdf"
+        make_text(text, args.pages)
+
+        for label, src in (("scanned", scanned), ("text", text)):
+            size = src.stat().st_size
+            lossless, t1 = timed(lambda: pdf_processor.compress_pdf(str(src), str(tmpdir / "l.pdf"), None))
+            lossy, t2 = timed(lambda: pdf_processor.compress_pdf(str(src), str(tmpdir / "d.pdf"), args.dpi))
+            report[label] = {
+                "lossless": row(size, lossless["output_size"], t1),
+                f"downsample_{args.dpi}dpi": row(
+                    size, lossy["output_size"], t2, images=lossy["optimization"]["images_downsampled"]
+                ),
+            }
+
+        inputs = [str(scanned)] * args.copies
+        plain, t1 = timed(lambda: pdf_processor.merge_pdfs(inputs, str(tmpdir / "m.pdf"), dedupe=False))
+        optimized, t2 = timed(lambda: pdf_processor.merge_pdfs(inputs, str(tmpdir / "mo.pdf"), optimize=True))
+        report["repeated"] = {
+            "merge": row(plain["output_size"], plain["output_size"], t1),
+            "merge_optimize": row(
+                plain["output_size"],
+                optimized["output_size"],
+                t2,
+                deduplicated=optimized["optimization"]["objects_deduplicated"],
+            ),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure the write-time cost of the linearize option.
+
+Usage:
+    python benchmarks/bench_linearize.py [--pages 10,100,500] [--repeat 3]
+
+Fixture:
+    report  text pages sharing a logo image and fonts, with an outline entry
+            per page
+
+For each page count, merges the fixture into a new file with and without
+linearize and reports the best wall time of each, the added time, the output
+sizes and the /E offset (bytes a viewer needs before it can show page 1).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from PIL import Image  # noqa: E402
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.utils import ImageReader  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from fastmcp_pdf_server.services import pdf_processor  # noqa: E402
+
+
+def make_report(path: Path, pages: int) -> None:
+    logo = ImageReader(Image.effect_noise((300, 300), 50).convert("RGB"))
+    c = canvas.Canvas(str(path), pagesize=A4)
+    width, height = A4
+    for i in range(pages):
+        c.drawImage(logo, 50, height - 150, width=100, height=100)
+        y = height - 200
+        while y > 60:
+            c.drawString(50, y, f"Page {i+1} line {int(y)}: revenue, costs and margin by region")
+            y -= 14
+        c.bookmarkPage(f"p{i}")
+        c.addOutlineEntry(f"Page {i+1}", f"p{i}", level=0)
+        c.showPage()
+    c.save()
+
+
+def best_of(repeat: int, fn) -> tuple[dict, float]:
+    best = float("inf")
+    result: dict = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, round(best, 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="10,100,500", help="comma-separated page counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    report: dict = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        for pages in [int(n) for n in args.pages.split(",")]:
+            src = tmpdir / f"report{pages}.pdf"
+            make_report(src, pages)
+            plain_out, lin_out = tmpdir / "plain.pdf", tmpdir / "lin.pdf"
+            plain, t1 = best_of(args.repeat, lambda: pdf_processor.merge_pdfs([str(src)], str(plain_out)))
+            lin, t2 = best_of(
+                args.repeat, lambda: pdf_processor.merge_pdfs([str(src)], str(lin_out), linearize=True)
+            )
+            first_page_end = int(re.search(rb"/E\s+(\d+)", lin_out.read_bytes()[:1024]).group(1))
+            report[f"{pages}_pages"] = {
+                "plain": {"output_bytes": plain["output_size"], "seconds": t1},
+                "linearized": {
+                    "output_bytes": lin["output_size"],
+                    "seconds": t2,
+                    "first_page_bytes": first_page_end,
+                },
+                "added_seconds": round(t2 - t1, 4),
+                "added_ratio": round(t2 / t1, 3) if t1 else None,
+            }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare resident memory of concurrent readers: path-opened vs mapped inputs.
+
+Usage:
+    python benchmarks/bench_mapped_inputs.py [--readers 8] [--size-mb 64]
+
+Each mode runs in a fresh subprocess. N threads open the same large PDF at
+once (PdfReader, every page resolved) and wait on a barrier, so all readers
+are alive together; the report is the peak RSS growth (Linux VmHWM) per mode.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+def make_fixture(path: Path, size_mb: int) -> None:
+    from PIL import Image
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    # A 1024x1024 noise image is ~2 MB after Flate + ASCII85
+    c = canvas.Canvas(str(path))
+    for page in range(max(1, size_mb // 2)):
+        # Distinct images so nothing is shared between pages
+        img = Image.effect_noise((1024, 1024), 60 + page).convert("RGB")
+        c.drawImage(ImageReader(img), 0, 0, 595, 842)
+        c.showPage()
+    c.save()
+
+
+def status_kb(field: str) -> int:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith(field + ":"):
+            return int(line.split()[1])
+    return 0
+
+
+def child(mode: str, pdf: str, readers: int) -> None:
+    from PyPDF2 import PdfReader
+
+    from fastmcp_pdf_server.services.file_manager import open_input
+
+    baseline = status_kb("VmRSS")
+    barrier = threading.Barrier(readers)
+
+    def work() -> None:
+        if mode == "mapped":
+            with open_input(pdf) as src:
+                reader = PdfReader(src)
+                _ = [p.get("/Contents") for p in reader.pages]
+                barrier.wait()
+        else:
+            reader = PdfReader(pdf)
+            _ = [p.get("/Contents") for p in reader.pages]
+            barrier.wait()
+
+    threads = [threading.Thread(target=work) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(json.dumps({"peak_rss_growth_mb": round((status_kb("VmHWM") - baseline) / 1024, 1)}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], args.child[1], args.readers)
+        return
+    if not Path("/proc/self/status").exists():
+        raise SystemExit("This benchmark reads peak RSS from /proc and needs Linux.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = Path(tmp) / "large.pdf"
+        make_fixture(pdf, args.size_mb)
+        report = {"file_mb": round(pdf.stat().st_size / 1024 / 1024, 1), "readers": args.readers}
+        for mode in ("path", "mapped"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--readers", str(args.readers), "--child", mode, str(pdf)],
+                check=True,
+                capture_output=True,
+                text=True,
+                env={**os.environ, "PYTHONWARNINGS": "ignore"},
+            )
+            report[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
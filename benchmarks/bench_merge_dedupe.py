@@ -0,0 +1,89 @@
+"""Measure cross-document deduplication in merge_pdfs on a shared-resource corpus.
+
+Usage:
+    python benchmarks/bench_merge_dedupe.py [--docs 10,100,300] [--logo-px 400]
+
+Fixture:
+    invoices  one-page documents that each embed the same logo image and
+              font dictionaries, with per-document text
+
+Reports output bytes, ratio against a merge without deduplication, objects
+merged, bytes saved and wall time for each corpus size.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from PIL import Image  # noqa: E402
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.utils import ImageReader  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from fastmcp_pdf_server.services import pdf_processor  # noqa: E402
+
+
+def make_invoice(path: Path, logo: Image.Image, index: int) -> None:
+    c = canvas.Canvas(str(path), pagesize=A4, invariant=1)
+    width, height = A4
+    c.drawImage(ImageReader(logo), 50, height - 200, width=150, height=150)
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(250, height - 100, f"Invoice #{index:05d}")
+    c.setFont("Times-Roman", 11)
+    y = height - 260
+    for line in range(20):
+        c.drawString(50, y, f"Item {line + 1}: service period {index % 12 + 1}, amount {index * 3 + line}.00")
+        y -= 16
+    c.showPage()
+    c.save()
+
+
+def timed(fn) -> tuple[dict, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, round(time.perf_counter() - start, 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", default="10,100,300", help="comma-separated corpus sizes")
+    parser.add_argument("--logo-px", type=int, default=400)
+    args = parser.parse_args()
+    sizes = [int(n) for n in args.docs.split(",")]
+
+    report: dict = {}
+    logo = Image.effect_noise((args.logo_px, args.logo_px), 60).convert("RGB")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        corpus = []
+        for i in range(max(sizes)):
+            p = tmpdir / f"invoice{i}.pdf"
+            make_invoice(p, logo, i)
+            corpus.append(str(p))
+
+        for n in sizes:
+            inputs = corpus[:n]
+            plain, t1 = timed(lambda: pdf_processor.merge_pdfs(inputs, str(tmpdir / "p.pdf"), dedupe=False))
+            deduped, t2 = timed(lambda: pdf_processor.merge_pdfs(inputs, str(tmpdir / "d.pdf")))
+            report[f"{n}_docs"] = {
+                "merge": {"output_bytes": plain["output_size"], "seconds": t1},
+                "merge_dedupe": {
+                    "output_bytes": deduped["output_size"],
+                    "ratio": round(deduped["output_size"] / plain["output_size"], 4),
+                    "objects_deduplicated": deduped["dedupe"]["objects_deduplicated"],
+                    "bytes_saved": deduped["dedupe"]["bytes_saved"],
+                    "seconds": t2,
+                },
+            }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
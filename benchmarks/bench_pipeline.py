@@ -0,0 +1,103 @@
+"""Compare chained tool calls with one in-memory pipeline.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--inputs 5] [--pages 40] [--repeat 3]
+
+Workflow: merge N inputs, rotate two pages, split the result into chapters.
+"chained" runs merge_pdfs, rotate_pages and split_pdf (each parses its input
+and writes a full PDF); "pipeline" runs the same steps with run_pipeline.
+Reports the best wall time of each and the bytes written.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from fastmcp_pdf_server.services import pdf_processor, pipeline  # noqa: E402
+
+
+def make_input(path: Path, pages: int, label: str) -> None:
+    c = canvas.Canvas(str(path))
+    for i in range(pages):
+        y = 780
+        while y > 60:
+            c.drawString(50, y, f"{label} page {i+1} line {y}: revenue, costs and margin by region")
+            y -= 14
+        c.showPage()
+    c.save()
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best, 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inputs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=40, help="pages per input")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        inputs = []
+        for n in range(args.inputs):
+            path = tmpdir / f"in{n}.pdf"
+            make_input(path, args.pages, f"doc{n}")
+            inputs.append(str(path))
+        total = args.inputs * args.pages
+        chapters = [(s, min(total, s + args.pages - 1)) for s in range(1, total + 1, args.pages)]
+
+        def chained() -> list[Path]:
+            merged, rotated = tmpdir / "merged.pdf", tmpdir / "rotated.pdf"
+            pdf_processor.merge_pdfs(inputs, str(merged), dedupe=False)
+            pdf_processor.rotate_pages(
+                str(merged), [{"page": 3, "degrees": 90}, {"page": 7, "degrees": 90}], str(rotated)
+            )
+            ranges = [{"start_page": s, "end_page": e, "output_path": str(tmpdir / f"c{s}.pdf")} for s, e in chapters]
+            pdf_processor.split_pdf(str(rotated), ranges)
+            return [merged, rotated] + [Path(r["output_path"]) for r in ranges]
+
+        def piped() -> list[Path]:
+            ranges = [{"start_page": s, "end_page": e, "output_path": str(tmpdir / f"p{s}.pdf")} for s, e in chapters]
+            pipeline.run_pipeline(
+                [
+                    {"op": "merge", "inputs": inputs},
+                    {"op": "rotate", "pages": "3,7", "degrees": 90},
+                    {"op": "split", "ranges": ranges},
+                ]
+            )
+            return [Path(r["output_path"]) for r in ranges]
+
+        t_chained = best_of(args.repeat, chained)
+        chained_bytes = sum(p.stat().st_size for p in chained())
+        t_piped = best_of(args.repeat, piped)
+        piped_bytes = sum(p.stat().st_size for p in piped())
+
+    report = {
+        "inputs": args.inputs,
+        "pages_per_input": args.pages,
+        "chapters": len(chapters),
+        "chained": {"seconds": t_chained, "bytes_written": chained_bytes},
+        "pipeline": {"seconds": t_piped, "bytes_written": piped_bytes},
+        "speedup": round(t_chained / t_piped, 2) if t_piped else None,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare text extraction engines on synthetic fixtures.
+
+Usage:
+    python benchmarks/bench_text_engines.py [--pages 200] [--repeat 3]
+
+Reports pages/second per engine and a fidelity score (word-level similarity
+against the text that was drawn into the fixture, 1.0 = identical).
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from fastmcp_pdf_server.services.text_engines import ENGINES, select_engine  # noqa: E402
+
+WORDS = (
+    "invoice total amount due payment terms customer account balance "
+    "shipping address order number quantity description unit price tax"
+).split()
+
+
+def make_fixture(path: Path, pages: int, columns: int, seed: int = 7) -> list[str]:
+    """Draw random lines of words and return the ground-truth text per page."""
+    rnd = random.Random(seed)
+    c = canvas.Canvas(str(path), pagesize=A4)
+    width, height = A4
+    truth: list[str] = []
+    col_w = (width - 100) / columns
+    for _ in range(pages):
+        page_words: list[str] = []
+        for col in range(columns):
+            y = height - 60
+            while y > 60:
+                line = " ".join(rnd.choice(WORDS) for _ in range(max(2, 8 // columns)))
+                c.drawString(50 + col * col_w, y, line)
+                page_words.extend(line.split())
+                y -= 14
+        truth.append(" ".join(page_words))
+        c.showPage()
+    c.save()
+    return truth
+
+
+def fidelity(extracted: str, truth: str) -> float:
+    return difflib.SequenceMatcher(None, extracted.split(), truth.split(), autojunk=False).ratio()
+
+
+def bench(path: Path, truth: list[str], repeat: int) -> dict:
+    results = {}
+    for name, engine in sorted(ENGINES.items()):
+        best = float("inf")
+        texts: list[str] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with engine.open(path) as doc:
+                texts = [doc.extract_page(p) for p in range(1, doc.page_count + 1)]
+            best = min(best, time.perf_counter() - start)
+        score = sum(fidelity(t, g) for t, g in zip(texts, truth)) / len(truth)
+        results[name] = {
+            "seconds": round(best, 4),
+            "pages_per_second": round(len(truth) / best, 1),
+            "fidelity": round(score, 4),
+        }
+    start = time.perf_counter()
+    chosen = select_engine(path).name
+    results["auto"] = {"selected": chosen, "selection_ms": round((time.perf_counter() - start) * 1000, 2)}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, columns in (("single_column", 1), ("two_column", 2)):
+            path = Path(tmp) / f"{label}.pdf"
+            truth = make_fixture(path, args.pages, columns)
+            report[label] = bench(path, truth, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
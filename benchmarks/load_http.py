@@ -0,0 +1,151 @@
+"""Measure HTTP transport throughput as the worker count grows.
+
+Usage:
+    python benchmarks/load_http.py [--workers 1,2,4] [--clients 16] [--seconds 10]
+
+For each worker count a server is started with TRANSPORT=http, concurrent
+MCP clients call a tool in a loop for a fixed time, and the server is stopped
+with SIGTERM (graceful shutdown). Prints one JSON report.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_fixture(path: Path, pages: int) -> None:
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(str(path))
+    for i in range(pages):
+        c.drawString(100, 750, f"Load test page {i+1}")
+        c.showPage()
+    c.save()
+
+
+def wait_healthy(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become healthy")
+
+
+def worker_pids(port: int, probes: int = 40) -> list[int]:
+    pids = set()
+    for _ in range(probes):
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=2) as resp:
+            pids.add(json.loads(resp.read())["pid"])
+    return sorted(pids)
+
+
+async def drive(url: str, tool: str, args: dict, clients: int, seconds: float) -> dict:
+    from fastmcp import Client
+
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.perf_counter() + seconds
+
+    async def one_client() -> None:
+        nonlocal errors
+        async with Client(url) as client:
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                try:
+                    await client.call_tool(tool, args)
+                    latencies.append(time.perf_counter() - start)
+                except Exception:  # noqa: BLE001
+                    errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(q: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2)
+
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def run_level(workers: int, args: argparse.Namespace, fixture: Path, temp_dir: str) -> dict:
+    port = free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT / "src"),
+        "TRANSPORT": "http",
+        "HTTP_PORT": str(port),
+        "HTTP_WORKERS": str(workers),
+        "TEMP_DIR": temp_dir,
+        "LOG_LEVEL": "WARNING",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "fastmcp_pdf_server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_healthy(port)
+        pids = worker_pids(port)
+        url = f"http://127.0.0.1:{port}/mcp"
+        tool_args = {"file": str(fixture), "engine": "pypdf2"} if args.tool == "extract_text" else {"file_path": str(fixture)}
+        stats = asyncio.run(drive(url, args.tool, tool_args, args.clients, args.seconds))
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return {"workers": workers, "observed_worker_pids": len(pids), "shutdown_code": proc.returncode, **stats}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--tool", choices=["extract_text", "get_pdf_info"], default="extract_text")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture = Path(tmp) / "load.pdf"
+        make_fixture(fixture, args.pages)
+        levels = [run_level(int(w), args, fixture, tmp) for w in args.workers.split(",")]
+    print(json.dumps({"tool": args.tool, "clients": args.clients, "seconds": args.seconds, "levels": levels}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Drive the registered tools concurrently, in-process, and report how the server scales.
+
+Usage:
+    python benchmarks/load_tools.py [--concurrency 1,5,10,20] [--seconds 10]
+        [--mix extract_text=4,get_pdf_info=2,...] [--pages 20] [--output report.json]
+
+The app is built with ``main.build_app()`` and called through an in-memory
+MCP client, so the numbers cover argument validation, tool bodies, worker
+threads and result serialization but not a transport. For each concurrency
+level N, N clients call tools in a closed loop for --seconds; each call picks
+an operation from --mix by weight. Reported per level: throughput, latency
+percentiles (overall and per operation), error rate and peak RSS of this
+process (sampled; table workers run in child processes and are reported
+separately as their high-water mark).
+
+Operations (fixtures are generated in a temp dir):
+    extract_text, extract_text_by_page, extract_metadata, get_pdf_info,
+    extract_tables, extract_images, split_pdf, merge_pdfs, rotate_pages,
+    compress_pdf, pdf_to_images (needs Poppler)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+DEFAULT_MIX = (
+    "extract_text=4,extract_text_by_page=2,get_pdf_info=3,extract_metadata=2,"
+    "extract_tables=1,extract_images=1,split_pdf=1,merge_pdfs=1,rotate_pages=1"
+)
+
+
+def make_fixtures(tmpdir: Path, pages: int) -> Dict[str, Path]:
+    from PIL import Image
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import Table, TableStyle
+
+    text = tmpdir / "text.pdf"
+    c = canvas.Canvas(str(text), pagesize=A4)
+    width, height = A4
+    logo = ImageReader(Image.effect_noise((200, 200), 40).convert("RGB"))
+    for i in range(pages):
+        c.drawImage(logo, 50, height - 130, width=80, height=80)
+        y = height - 160
+        while y > 60:
+            c.drawString(50, y, f"Page {i+1} line {int(y)}: revenue, costs and margin by region")
+            y -= 14
+        c.showPage()
+    c.save()
+
+    tables = tmpdir / "tables.pdf"
+    c = canvas.Canvas(str(tables), pagesize=A4)
+    for i in range(max(1, pages // 4)):
+        rows = [["Region", "Revenue", "Cost"]] + [[f"R{r}", str(100 * r + i), str(50 * r)] for r in range(1, 12)]
+        table = Table(rows)
+        table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
+        table.wrapOn(c, width, height)
+        table.drawOn(c, 60, height - 400)
+        c.showPage()
+    c.save()
+    return {"text": text, "tables": tables}
+
+
+def operations(fixtures: Dict[str, Path], outdir: Path, pages: int) -> Dict[str, Callable[[int], dict]]:
+    text, tables = str(fixtures["text"]), str(fixtures["tables"])
+    half = max(1, pages // 2)
+    return {
+        "extract_text": lambda n: {"file": text, "engine": "pypdf2"},
+        "extract_text_by_page": lambda n: {"file": text, "page_range": "1-3,last", "inline": True},
+        "extract_metadata": lambda n: {"file": text},
+        "get_pdf_info": lambda n: {"file_path": text},
+        "extract_tables": lambda n: {"file": tables, "inline": True},
+        "extract_images": lambda n: {"file_path": text, "output_dir": str(outdir / f"img{n}"), "inline": True},
+        "split_pdf": lambda n: {
+            "file_path": text,
+            "split_ranges": [
+                {"start_page": 1, "end_page": half, "output_path": str(outdir / f"split{n}a.pdf")},
+                {"start_page": half + 1, "end_page": pages, "output_path": str(outdir / f"split{n}b.pdf")},
+            ]
+            if pages > 1
+            else [{"start_page": 1, "end_page": 1, "output_path": str(outdir / f"split{n}a.pdf")}],
+            "inline": True,
+        },
+        "merge_pdfs": lambda n: {"input_files": [text, tables], "output_path": str(outdir / f"merge{n}.pdf")},
+        "rotate_pages": lambda n: {
+            "file_path": text,
+            "rotations": [{"page": 1, "degrees": 90}],
+            "output_path": str(outdir / f"rot{n}.pdf"),
+        },
+        "compress_pdf": lambda n: {"file_path": text, "output_path": str(outdir / f"small{n}.pdf")},
+        "pdf_to_images": lambda n: {
+            "file_path": text,
+            "output_dir": str(outdir / f"png{n}"),
+            "pages": [1],
+            "dpi": 72,
+            "inline": True,
+        },
+    }
+
+
+def parse_mix(spec: str, known: Dict[str, Callable]) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for term in spec.split(","):
+        name, _, weight = term.strip().partition("=")
+        if name not in known:
+            raise SystemExit(f"unknown operation {name!r}; choose from {', '.join(sorted(known))}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class RssSampler:
+    """Peak resident set size of this process, sampled from /proc (ru_maxrss elsewhere)."""
+
+    def __init__(self, interval: float = 0.02) -> None:
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._page = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def _current(self) -> int:
+        try:
+            with open("/proc/self/statm", "rb") as fh:
+                return int(fh.read().split()[1]) * self._page
+        except OSError:
+            scale = 1 if platform.system() == "Darwin" else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self.peak = self._current()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._current())
+
+
+def percentiles(latencies: list) -> dict:
+    latencies = sorted(latencies)
+
+    def pct(q: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2)
+
+    return {"p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99), "max_ms": pct(1.0)}
+
+
+async def run_level(
+    client, ops: dict, mix: Dict[str, float], concurrency: int, seconds: float, seed: int, counter: itertools.count
+) -> dict:
+    names, weights = list(mix), list(mix.values())
+    per_op: Dict[str, dict] = {name: {"latencies": [], "errors": 0} for name in names}
+    first_errors: Dict[str, str] = {}
+    stop_at = time.perf_counter() + seconds
+
+    async def one_client(index: int) -> None:
+        rng = random.Random(seed + index)
+        while time.perf_counter() < stop_at:
+            name = rng.choices(names, weights)[0]
+            args = ops[name](next(counter))
+            start = time.perf_counter()
+            try:
+                await client.call_tool(name, args)
+                per_op[name]["latencies"].append(time.perf_counter() - start)
+            except Exception as e:  # noqa: BLE001
+                per_op[name]["errors"] += 1
+                first_errors.setdefault(name, str(e)[:200])
+
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        await asyncio.gather(*(one_client(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies = [lat for stats in per_op.values() for lat in stats["latencies"]]
+    errors = sum(stats["errors"] for stats in per_op.values())
+    calls = len(latencies) + errors
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "calls": calls,
+        "errors": errors,
+        "error_rate": round(errors / calls, 4) if calls else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        **percentiles(latencies),
+        "peak_rss_mb": round(rss.peak / 2**20, 1),
+        "operations": {
+            name: {
+                "calls": len(stats["latencies"]) + stats["errors"],
+                "errors": stats["errors"],
+                **percentiles(stats["latencies"]),
+                **({"first_error": first_errors[name]} if name in first_errors else {}),
+            }
+            for name, stats in per_op.items()
+        },
+    }
+
+
+async def run_all(args: argparse.Namespace, tmpdir: Path) -> dict:
+    from fastmcp import Client
+
+    from fastmcp_pdf_server.main import build_app
+    from fastmcp_pdf_server.services import table_extractor
+    from fastmcp_pdf_server.services.maintenance import scheduler
+
+    fixtures = make_fixtures(tmpdir, args.pages)
+    outdir = tmpdir / "out"
+    outdir.mkdir()
+    ops = operations(fixtures, outdir, args.pages)
+    mix = parse_mix(args.mix, ops)
+
+    app = build_app()
+    levels = []
+    counter = itertools.count()  # distinct output paths across levels
+    try:
+        async with Client(app) as client:
+            for name in mix:  # warm imports, pools and caches outside the measurement
+                try:
+                    await client.call_tool(name, ops[name](-1))
+                except Exception:  # noqa: BLE001
+                    pass  # counted (with first_error) in every level
+            for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                levels.append(await run_level(client, ops, mix, concurrency, args.seconds, args.seed, counter))
+    finally:
+        scheduler.stop()
+        table_extractor.shutdown_pool()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "mix": mix,
+        "pages": args.pages,
+        "seconds_per_level": args.seconds,
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "child_peak_rss_mb": round(children * (1 if platform.system() == "Darwin" else 1024) / 2**20, 1),
+        "levels": levels,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,5,10,20", help="comma-separated client counts")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight pairs")
+    parser.add_argument("--pages", type=int, default=20, help="pages in the text fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        # Before the package is imported: settings are read once
+        os.environ["TEMP_DIR"] = str(tmpdir / "store")
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        report = asyncio.run(run_all(args, tmpdir))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
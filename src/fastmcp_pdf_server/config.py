@@ -12,13 +12,48 @@ class Settings(BaseSettings):
     log_level: str = Field("INFO")
     log_file_path: str = Field("logs/fastmcp_pdf_server.log")
     temp_dir: str = Field("temp_files")
+    temp_retention_seconds: int = Field(24 * 60 * 60)
+    temp_quota_mb: int = Field(0)
+    maintenance_interval_seconds: int = Field(300)
+    watch_enabled: bool = Field(False)
+    watch_dir: str = Field("")
+    watch_mode: str = Field("auto")
+    watch_interval_seconds: int = Field(30)
+    watch_settle_seconds: float = Field(2.0)
     server_name: str = Field("pdf-processor-fastmcp")
     server_version: str = Field("1.0.0")
+    text_engine: str = Field("pdfplumber")
+    page_text_cache: bool = Field(True)
+    pdfplumber_recycle_pages: int = Field(0)
+    table_cache: bool = Field(True)
+    table_workers: int = Field(0)
+    inline_result_max_bytes: int = Field(256 * 1024)
+    result_preview_items: int = Field(5)
+    transport: str = Field("stdio")
+    http_host: str = Field("127.0.0.1")
+    http_port: int = Field(8000)
+    http_path: str = Field("/mcp")
+    http_workers: int = Field(1)
+    http_graceful_timeout: int = Field(30)
+    trace_file: str = Field("")
+    trace_meta: bool = Field(False)
+    interactive_tools: str = Field(
+        "server_info,get_pdf_info,list_temp_resources,extract_metadata,read_result,get_resource_base64"
+    )
+    interactive_workers: int = Field(4)
+    bulk_workers: int = Field(0)
+    coalesce_tools: str = Field(
+        "extract_text,extract_text_by_page,extract_tables,extract_metadata,pdf_to_images,extract_images"
+    )
 
     @field_validator("log_level")
     def _upper(cls, v: str) -> str:  # noqa: N805
         return v.upper()
 
+    @field_validator("text_engine", "transport", "watch_mode")
+    def _lower(cls, v: str) -> str:  # noqa: N805
+        return v.lower()
+
     @property
     def temp_path(self) -> Path:
         return Path(self.temp_dir).resolve()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
+import time
 from typing import Any
 
 from .config import settings
+from .services.lanes import lanes
 from .utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,7 +23,8 @@ def build_app() -> Any:
 
     # Register tools
     from .tools import utilities, text_extraction, pdf_manipulation, conversion, uploads
-    from .services.file_manager import cleanup_expired
+    from .services.maintenance import scheduler
+    from .services.watcher import watcher
 
     utilities.register(app)
     text_extraction.register(app)
@@ -28,16 +32,120 @@ def build_app() -> Any:
     conversion.register(app)
     uploads.register(app)
 
-    # Clean up expired files on startup
+    # Expiry and quota eviction run in the background, starting immediately
     try:
-        cleanup_expired()
+        scheduler.start()
     except Exception as exc:  # noqa: BLE001
-        logger.error("cleanup_expired at startup failed: %s", exc)
+        logger.error("maintenance scheduler failed to start: %s", exc)
+
+    # Optional: pre-warm caches for PDFs dropped into the watched directory
+    if settings.watch_enabled:
+        try:
+            watcher.start()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("folder watcher failed to start: %s", exc)
 
     return app
 
 
+class _WorkerStats:
+    """Per-process request counters reported by the /health endpoint."""
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.requests = 0
+        self.in_flight = 0
+        self.errors = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "errors": self.errors,
+            "temp_dir": str(settings.temp_path),
+            "lanes": lanes.snapshot()["lanes"],
+        }
+
+
+worker_stats = _WorkerStats()
+
+
+class _CountingMiddleware:
+    """Pure ASGI middleware counting HTTP requests handled by this worker."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        worker_stats.requests += 1
+        worker_stats.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            worker_stats.errors += 1
+            raise
+        finally:
+            worker_stats.in_flight -= 1
+
+
+def create_http_app() -> Any:
+    """ASGI factory: one app per worker process, all sharing settings.temp_path.
+
+    Sessions are stateless so any worker can serve any request.
+    """
+    from starlette.middleware import Middleware
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+
+    app = build_app()
+
+    @app.custom_route("/health", methods=["GET"])
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse(worker_stats.snapshot())
+
+    logger.info("http worker pid=%s starting path=%s", os.getpid(), settings.http_path)
+    return app.http_app(
+        path=settings.http_path,
+        stateless_http=True,
+        middleware=[Middleware(_CountingMiddleware)],
+    )
+
+
+def run_http() -> None:
+    try:
+        import uvicorn  # type: ignore
+    except Exception as exc:  # pragma: no cover
+        raise SystemExit("HTTP transport requires uvicorn. Please install dependencies first.") from exc
+
+    logger.info(
+        "starting http transport host=%s port=%s workers=%s",
+        settings.http_host,
+        settings.http_port,
+        settings.http_workers,
+    )
+    # uvicorn supervises the worker processes and forwards SIGINT/SIGTERM; each
+    # worker stops accepting connections and drains in-flight requests.
+    uvicorn.run(
+        "fastmcp_pdf_server.main:create_http_app",
+        factory=True,
+        host=settings.http_host,
+        port=settings.http_port,
+        workers=max(1, settings.http_workers),
+        timeout_graceful_shutdown=settings.http_graceful_timeout,
+        log_level=settings.log_level.lower(),
+    )
+
+
 def run() -> None:
+    if settings.transport in {"http", "streamable-http"}:
+        run_http()
+        return
     app = build_app()
     # Avoid printing; delegate to the framework. Support multiple API variants.
     if hasattr(app, "run_stdio"):
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from ..config import settings
+from ..utils.logger import get_logger
+from ..utils.tracing import span
+from .file_manager import content_digest
+from .lanes import lanes
+
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalescingMetrics:
+    leaders: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    # Leader execution time summed once per follower: work that did not run again.
+    saved_ms: int = 0
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.followers = 0
+        self.started = time.perf_counter()
+
+
+def enabled_operations() -> set[str]:
+    return {name.strip() for name in settings.coalesce_tools.split(",") if name.strip()}
+
+
+def flight_key(operation: str, path: Path, **params: Any) -> Tuple:
+    """(operation, content digest of ``path``, normalized parameters).
+
+    Keyed on the bytes, not the file: a retried inline upload lands under a
+    new temp name but still joins the first call. The first key for a file
+    hashes all of it, so call this from a lane worker, never on the event
+    loop. Operations that are not coalesced skip the hash.
+    """
+    if operation not in enabled_operations():
+        return (operation,)
+    try:
+        identity: Tuple = ("sha256", content_digest(path))
+    except OSError:
+        # Missing file: the call fails anyway, let identical failures share it
+        identity = (str(path),)
+    return (operation, identity, json.dumps(params, sort_keys=True, default=str))
+
+
+class SingleFlight:
+    """Coalesces identical in-flight calls onto one computation.
+
+    The first caller (leader) runs ``fn`` in a lane worker thread; callers arriving
+    with the same key while it runs await the same task and receive a deep
+    copy of its result (or the same exception). Keys are dropped as soon as
+    the computation finishes, so nothing is cached. Per process: HTTP
+    workers coalesce independently.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Tuple, _Flight] = {}
+        self._metrics: Dict[str, CoalescingMetrics] = {}
+
+    def _m(self, operation: str) -> CoalescingMetrics:
+        return self._metrics.setdefault(operation, CoalescingMetrics())
+
+    def _finish(self, key: Tuple, flight: _Flight) -> None:
+        self._flights.pop(key, None)
+        m = self._m(key[0])
+        if flight.task.cancelled() or flight.task.exception() is not None:
+            m.errors += 1
+            return
+        m.saved_ms += int((time.perf_counter() - flight.started) * 1000) * flight.followers
+
+    async def run(self, key: Tuple, fn: Callable[[], T], lane: Optional[str] = None) -> T:
+        """Run ``fn`` for ``key`` (see ``flight_key``), or join the identical call in flight.
+
+        ``fn`` runs in the operation's scheduling lane (``lane`` overrides it);
+        operations not listed in COALESCE_TOOLS are scheduled without coalescing.
+        """
+        operation = key[0]
+        if operation not in enabled_operations():
+            return await lanes.run(operation, fn, lane)
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.followers += 1
+            self._m(operation).coalesced += 1
+            logger.debug("coalesced %s followers=%d", operation, flight.followers)
+            # The leader's trace holds the phases; this call only waited
+            with span("coalesced"):
+                result = await asyncio.shield(flight.task)
+            return copy.deepcopy(result)
+
+        task = asyncio.ensure_future(lanes.run(operation, fn, lane))
+        flight = _Flight(task)
+        self._flights[key] = flight
+        self._m(operation).leaders += 1
+        # Registered before anyone awaits, so the key is gone before the leader resumes
+        task.add_done_callback(lambda _t: self._finish(key, flight))
+        result = await asyncio.shield(task)
+        # Followers copy the shared result; the leader keeps it only if nobody joined
+        return copy.deepcopy(result) if flight.followers else result
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": sorted(enabled_operations()),
+            "in_flight": len(self._flights),
+            "operations": {name: asdict(m) for name, m in sorted(self._metrics.items())},
+        }
+
+
+single_flight = SingleFlight()
@@ -1,17 +1,40 @@
 from __future__ import annotations
 
 import base64
+import binascii
+import hashlib
+import io
+import mmap
+import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
 import uuid
-import base64 as _b64
 from pathlib import Path
-from typing import Iterable, List
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple
 
 from ..config import settings
+from ..utils.files import file_identity
+from ..utils.tracing import span
 
 
-RETENTION_SECONDS = 24 * 60 * 60
+# Lease markers older than this are considered abandoned (crashed worker).
+LEASE_TTL_SECONDS = 60 * 60
+# A sweep lock older than this is considered abandoned and is broken.
+SWEEP_LOCK_STALE_SECONDS = 10 * 60
+
+LEASE_DIR = ".leases"
+LOCK_DIR = ".locks"
+
+# Base64 characters decoded per step (a multiple of 4); bounds the decode buffers.
+BASE64_WINDOW = 1 << 20
+# Content digests remembered per file identity (see content_digest).
+DIGEST_CACHE_SIZE = 4096
+_B64_WHITESPACE = b" \t\r\n\v\f"
+_B64_INVALID = re.compile(rb"[^A-Za-z0-9+/=]")
 
 
 def temp_dir() -> Path:
@@ -20,25 +43,215 @@ def temp_dir() -> Path:
     return p
 
 
-def cleanup_expired(now: float | None = None) -> int:
-    now = now or time.time()
-    removed = 0
-    for f in temp_dir().glob("**/*"):
-        if not f.is_file():
-            continue
+def _is_internal(path: Path, root: Path) -> bool:
+    """Lease markers, locks and in-progress writes are dot-prefixed."""
+    try:
+        rel = path.relative_to(root)
+    except ValueError:
+        return False
+    return any(part.startswith(".") for part in rel.parts)
+
+
+def _is_in_flight(path: Path) -> bool:
+    """Temp files of ``atomic_writer`` and streaming uploads, not yet renamed into place."""
+    return path.name.startswith(".") and path.name.endswith(".tmp")
+
+
+def _lease_key(path: Path) -> str:
+    return hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+
+
+def _live_lease_keys(now: float) -> set[str]:
+    keys: set[str] = set()
+    for marker in (temp_dir() / LEASE_DIR).glob("*"):
         try:
-            if now - f.stat().st_mtime > RETENTION_SECONDS:
-                f.unlink(missing_ok=True)
-                removed += 1
+            if now - marker.stat().st_mtime <= LEASE_TTL_SECONDS:
+                keys.add(marker.name.split(".", 1)[0])
         except FileNotFoundError:
-            pass
-    return removed
+            continue
+    return keys
+
+
+def is_leased(path: Path, now: float | None = None) -> bool:
+    """Whether any process holds a live lease on ``path``."""
+    return _lease_key(path) in _live_lease_keys(now or time.time())
+
+
+@contextmanager
+def lease(*paths: Path | str) -> Iterator[None]:
+    """Mark temp files as in use for the duration of the block.
+
+    Each holder creates its own marker file, so the markers act as a
+    cross-process reference count; expiry sweeps skip leased files. Paths
+    outside the temp directory are ignored.
+    """
+    root = temp_dir().resolve()
+    markers: List[Path] = []
+    try:
+        for value in paths:
+            target = Path(value).resolve()
+            try:
+                target.relative_to(root)
+            except ValueError:
+                continue
+            marker = root / LEASE_DIR / f"{_lease_key(target)}.{os.getpid()}-{uuid.uuid4().hex[:8]}"
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(str(target), encoding="utf-8")
+            markers.append(marker)
+            touch_access(target)
+        yield
+    finally:
+        for marker in markers:
+            marker.unlink(missing_ok=True)
+
+
+@contextmanager
+def _sweep_lock() -> Iterator[bool]:
+    """Exclusive, cross-process lock for expiry sweeps; yields False if held elsewhere."""
+    lock = temp_dir() / LOCK_DIR / "sweep.lock"
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                stale = time.time() - lock.stat().st_mtime > SWEEP_LOCK_STALE_SECONDS
+            except FileNotFoundError:
+                continue
+            if not stale:
+                yield False
+                return
+            lock.unlink(missing_ok=True)
+            continue
+        try:
+            os.write(fd, str(os.getpid()).encode("ascii"))
+        finally:
+            os.close(fd)
+        try:
+            yield True
+        finally:
+            lock.unlink(missing_ok=True)
+        return
+    yield False
+
+
+@dataclass
+class SweepStats:
+    expired_files: int = 0
+    expired_bytes: int = 0
+    evicted_files: int = 0
+    evicted_bytes: int = 0
+    # Everything left after the sweep, pinned files included
+    remaining_bytes: int = 0
+    # Leased files and in-flight writes: kept, and not held against the quota
+    pinned_bytes: int = 0
+
+
+def sweep(now: float | None = None, quota_bytes: int | None = None) -> SweepStats | None:
+    """One coordinated maintenance pass over the temp store.
+
+    Deletes files older than ``settings.temp_retention_seconds``, then, if the
+    remaining total exceeds ``quota_bytes``, evicts least recently accessed
+    files until it fits; cache entries compete with outputs on recency.
+    Leased files and in-flight writes are never removed and do not count
+    towards the quota (``pinned_bytes``). Returns None without
+    doing anything when another process is already sweeping.
+    """
+    now = now or time.time()
+    with _sweep_lock() as acquired:
+        if not acquired:
+            return None
+        root = temp_dir()
+        for marker in (root / LEASE_DIR).glob("*"):
+            try:
+                if now - marker.stat().st_mtime > LEASE_TTL_SECONDS:
+                    marker.unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+        leased = _live_lease_keys(now)
+        stats = SweepStats()
+        survivors: List[tuple[float, int, Path]] = []
+        for f in root.glob("**/*"):
+            if not f.is_file() or f.parent.name in (LEASE_DIR, LOCK_DIR):
+                continue
+            try:
+                st = f.stat()
+                if now - st.st_mtime > settings.temp_retention_seconds and _lease_key(f) not in leased:
+                    f.unlink(missing_ok=True)
+                    stats.expired_files += 1
+                    stats.expired_bytes += st.st_size
+                    continue
+            except FileNotFoundError:
+                continue
+            survivors.append((max(st.st_atime, st.st_mtime), st.st_size, f))
+
+        # Caches under .cache are evictable like any output
+        evictable: List[tuple[float, int, Path]] = []
+        for item in survivors:
+            f = item[2]
+            if _is_in_flight(f) or _lease_key(f) in leased:
+                stats.pinned_bytes += item[1]
+            else:
+                evictable.append(item)
+        # Pinned files cannot be reclaimed, so the quota only bounds the rest;
+        # counting them would evict every other file once they alone exceed it
+        total = sum(size for _, size, _ in evictable)
+        if quota_bytes is not None and quota_bytes > 0 and total > quota_bytes:
+            for _, size, f in sorted(evictable, key=lambda item: item[0]):
+                if total <= quota_bytes:
+                    break
+                try:
+                    f.unlink()
+                except FileNotFoundError:
+                    pass
+                else:
+                    stats.evicted_files += 1
+                    stats.evicted_bytes += size
+                total -= size
+        stats.remaining_bytes = total + stats.pinned_bytes
+    return stats
+
+
+def cleanup_expired(now: float | None = None) -> int:
+    """Delete expired temp files; returns the number removed.
+
+    Only one process sweeps at a time (others return 0 immediately) and
+    files with a live lease are kept.
+    """
+    stats = sweep(now)
+    return stats.expired_files if stats else 0
+
+
+def touch_access(path: Path) -> None:
+    """Record an access (atime) for LRU eviction without changing the mtime used for expiry."""
+    try:
+        st = path.stat()
+        os.utime(path, (time.time(), st.st_mtime))
+    except OSError:
+        pass
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """Write to a hidden temp file next to ``path`` and rename it into place.
+
+    Readers never observe a partially written file; on error the temp file is
+    removed and ``path`` is left untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f".{path.name}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with span("write", file=path.name), tmp.open("wb") as fh:
+            yield fh
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
 
 
 def write_bytes(name: str, content: bytes) -> Path:
     p = temp_dir() / name
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_bytes(content)
+    with atomic_writer(p) as fh:
+        fh.write(content)
     return p.resolve()
 
 
@@ -47,24 +260,269 @@ def read_bytes(path: Path) -> bytes:
 
 
 def to_base64(path: Path) -> str:
-    return base64.b64encode(read_bytes(path)).decode("ascii")
+    # Encode straight from the shared mapping; no private copy of the input.
+    with open_input(path) as src, src.getbuffer() as view, span("encode", format="base64"):
+        return base64.b64encode(view).decode("ascii")
+
+
+class MappedInput(io.RawIOBase):
+    """Read-only, seekable file object over a shared memory map.
+
+    Each reader gets its own cursor; the mapped pages themselves live in the
+    OS page cache and are shared by every reader of the same file, in this
+    process and in other workers.
+    """
+
+    def __init__(self, buffer: mmap.mmap | bytes, name: str) -> None:
+        super().__init__()
+        self._buf = buffer
+        self._pos = 0
+        self._size = len(buffer)
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("negative seek position")
+        self._pos = pos
+        return pos
+
+    def read(self, size: int = -1) -> bytes:
+        start = min(self._pos, self._size)
+        end = self._size if size is None or size < 0 else min(self._size, start + size)
+        self._pos = end
+        return self._buf[start:end]
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, b) -> int:  # type: ignore[override]
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def readline(self, size: int | None = -1) -> bytes:
+        start = min(self._pos, self._size)
+        nl = self._buf.find(b"\n", start)
+        end = self._size if nl < 0 else nl + 1
+        if size is not None and size >= 0:
+            end = min(end, start + size)
+        self._pos = end
+        return self._buf[start:end]
+
+    def getbuffer(self) -> memoryview:
+        """Zero-copy view of the whole file; release it before the input closes."""
+        return memoryview(self._buf)
+
+
+@dataclass
+class _Mapping:
+    buffer: mmap.mmap
+    size: int
+    readers: int = 0
 
 
-def _unique_name(name: str) -> str:
-    """Return a unique filename if the target already exists in temp_dir()."""
+_mappings: Dict[Tuple, _Mapping] = {}
+_mappings_lock = threading.Lock()
+
+
+@contextmanager
+def open_input(path: Path | str) -> Iterator[MappedInput]:
+    """Open an input file as a read-only, zero-copy file object.
+
+    Concurrent readers of the same file share one ``mmap`` (reference
+    counted, unmapped when the last reader leaves). Hand the result to
+    ``PdfReader`` or ``pdfplumber.open`` instead of a path: given a path,
+    PyPDF2 reads the whole file into a private ``bytes`` copy.
+    """
+    p = Path(path)
+    key = file_identity(p)
+    if key[3] == 0:
+        # Empty files cannot be mapped
+        yield MappedInput(b"", str(p))
+        return
+    with span("open", file=p.name, bytes=key[3]), _mappings_lock:
+        entry = _mappings.get(key)
+        if entry is None:
+            with p.open("rb") as fh:
+                entry = _Mapping(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ), key[3])
+            _mappings[key] = entry
+        entry.readers += 1
+    try:
+        yield MappedInput(entry.buffer, str(p))
+    finally:
+        with _mappings_lock:
+            entry.readers -= 1
+            if entry.readers == 0:
+                _mappings.pop(key, None)
+                try:
+                    entry.buffer.close()
+                except BufferError:
+                    # A view is still exported; the map is released when it is collected
+                    pass
+
+
+_digests: "OrderedDict[Tuple, str]" = OrderedDict()
+_digests_lock = threading.Lock()
+
+
+def remember_digest(path: Path, sha256: str) -> None:
+    """Record the sha256 of ``path``'s current content, computed while writing it."""
+    try:
+        key = file_identity(path)
+    except OSError:
+        return
+    with _digests_lock:
+        _digests[key] = sha256
+        _digests.move_to_end(key)
+        while len(_digests) > DIGEST_CACHE_SIZE:
+            _digests.popitem(last=False)
+
+
+def content_digest(path: Path) -> str:
+    """sha256 of the file's bytes, cached per ``file_identity``.
+
+    Uploads record their digest as they are written, so identical bytes
+    under different temp names are recognised without reading them again;
+    other files are hashed once from the shared mapping.
+    """
+    key = file_identity(path)
+    with _digests_lock:
+        digest = _digests.get(key)
+        if digest is not None:
+            _digests.move_to_end(key)
+            return digest
+    with open_input(path) as src, src.getbuffer() as view, span("hash", bytes=key[3]):
+        digest = hashlib.sha256(view).hexdigest()
+    remember_digest(path, digest)
+    return digest
+
+
+def mapping_stats() -> dict:
+    """Currently mapped inputs (for server_info)."""
+    with _mappings_lock:
+        entries = list(_mappings.values())
+    return {
+        "mapped_files": len(entries),
+        "mapped_bytes": sum(e.size for e in entries),
+        "readers": sum(e.readers for e in entries),
+    }
+
+
+def _candidate_names(name: str) -> Iterator[str]:
+    """Yield the requested name, then uuid-suffixed variants."""
+    yield name
+    p = Path(name)
+    while True:
+        yield str(p.with_name(f"{p.stem}-{uuid.uuid4().hex[:6]}{p.suffix}"))
+
+
+def _publish_unique(tmp: Path, name: str) -> Path:
+    """Atomically give ``tmp`` a name that no other writer holds.
+
+    ``os.link`` fails if the target exists, so reserving the name and making
+    the complete content visible is one step. Filesystems without hard links
+    fall back to an exclusive placeholder that is then replaced.
+    """
     root = temp_dir()
-    candidate = root / name
-    if not candidate.exists():
-        return name
-    stem = candidate.stem
-    suffix = candidate.suffix
-    return f"{stem}-{uuid.uuid4().hex[:6]}{suffix}"
+    for candidate in _candidate_names(name):
+        target = root / candidate
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(tmp, target)
+            return target.resolve()
+        except FileExistsError:
+            continue
+        except OSError:
+            try:
+                os.close(os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            os.replace(tmp, target)
+            return target.resolve()
+    raise AssertionError("unreachable")  # pragma: no cover
 
 
 def write_bytes_unique(name: str, content: bytes) -> Path:
     """Write bytes to temp_dir(), avoiding overwrite by appending a short uuid if needed."""
-    safe_name = _unique_name(name)
-    return write_bytes(safe_name, content)
+    root = temp_dir()
+    tmp = root / f".upload-{uuid.uuid4().hex}.tmp"
+    try:
+        tmp.write_bytes(content)
+        path = _publish_unique(tmp, name)
+    finally:
+        tmp.unlink(missing_ok=True)
+    remember_digest(path, hashlib.sha256(content).hexdigest())
+    return path
+
+
+@dataclass
+class StoredUpload:
+    path: Path
+    size: int
+    sha256: str
+
+
+def _decode_base64_to(encoded: str | bytes, fh: BinaryIO) -> tuple[int, str]:
+    """Decode ``encoded`` into ``fh`` window by window; return (size, sha256 hex).
+
+    Only one window of the input is ever copied (str slices are encoded per
+    window), so peak memory stays close to the encoded string itself.
+    Whitespace and line breaks are skipped; any other non-alphabet character
+    or bad padding raises ValueError.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    carry = b""
+    for start in range(0, len(encoded), BASE64_WINDOW):
+        window = encoded[start : start + BASE64_WINDOW]
+        chunk = window.encode("ascii") if isinstance(window, str) else bytes(window)
+        chunk = carry + chunk.translate(None, _B64_WHITESPACE)
+        if _B64_INVALID.search(chunk):
+            raise ValueError("Invalid base64 content.")
+        usable = len(chunk) - len(chunk) % 4
+        carry = chunk[usable:]
+        decoded = binascii.a2b_base64(chunk[:usable])
+        digest.update(decoded)
+        size += len(decoded)
+        fh.write(decoded)
+    if carry:
+        raise ValueError("Invalid base64 content: incorrect padding.")
+    return size, digest.hexdigest()
+
+
+def write_base64_unique(name: str, encoded: str | bytes) -> StoredUpload:
+    """Decode base64 straight into a new file under temp_dir() (unique name as in
+    ``write_bytes_unique``), hashing and counting the bytes in the same pass."""
+    root = temp_dir()
+    tmp = root / f".upload-{uuid.uuid4().hex}.tmp"
+    try:
+        with span("decode", format="base64", chars=len(encoded)), tmp.open("wb") as fh:
+            try:
+                size, sha = _decode_base64_to(encoded, fh)
+            except (UnicodeEncodeError, binascii.Error) as e:
+                raise ValueError("Invalid base64 content.") from e
+        stored = StoredUpload(_publish_unique(tmp, name), size, sha)
+    finally:
+        tmp.unlink(missing_ok=True)
+    remember_digest(stored.path, sha)
+    return stored
 
 
 @dataclass
@@ -77,8 +535,9 @@ class ResourceInfo:
 
 def list_resources() -> List[ResourceInfo]:
     resources: List[ResourceInfo] = []
-    for f in temp_dir().glob("**/*"):
-        if f.is_file():
+    root = temp_dir()
+    for f in root.glob("**/*"):
+        if f.is_file() and not _is_internal(f, root):
             resources.append(
                 ResourceInfo(
                     path=f.resolve(),
@@ -98,6 +557,8 @@ def _infer_content_type(path: Path) -> str:
         return "image/png"
     if ext in {".jpg", ".jpeg"}:
         return "image/jpeg"
+    if ext == ".ndjson":
+        return "application/x-ndjson"
     return "application/octet-stream"
 
 
@@ -111,6 +572,7 @@ def ensure_within_temp(path: Path) -> Path:
     return target
 
 
+@span("resolve")
 def resolve_to_path(value: object, filename_hint: str | None = None) -> Path:
     """
     Resolve various incoming representations into a Path under temp_dir().
@@ -148,12 +610,11 @@ def resolve_to_path(value: object, filename_hint: str | None = None) -> Path:
 
     # 3) Dict with base64
     if isinstance(value, dict) and "base64" in value:
-        try:
-            data = _b64.b64decode(value["base64"])  # type: ignore[arg-type]
-        except Exception as e:  # noqa: BLE001
-            raise ValueError("Invalid base64 content.") from e
+        encoded = value["base64"]
+        if not isinstance(encoded, (str, bytes, bytearray)):
+            raise ValueError("Invalid base64 content.")
         name = value.get("filename") or filename_hint or "upload.bin"  # type: ignore[assignment]
-        return write_bytes_unique(str(name), data)
+        return write_base64_unique(str(name), encoded).path
 
     # 3b) Dict with URL
     if isinstance(value, dict) and "url" in value:
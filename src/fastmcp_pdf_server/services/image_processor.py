@@ -1,15 +1,178 @@
 from __future__ import annotations
 
+import hashlib
+import io
 from pathlib import Path
 import shutil
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from PIL import Image
+from PIL import Image, ImageChops
 from pdf2image import convert_from_path
+from PyPDF2 import PdfReader
+from PyPDF2.filters import ASCII85Decode, ASCIIHexDecode
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
 
 from ..config import settings
-from ..services.file_manager import temp_dir
-from ..utils.validators import IMAGE_EXTENSIONS, validate_image, validate_pdf
+from ..services.file_manager import atomic_writer, open_input, temp_dir
+from ..services.linearizer import linearize_file
+from ..services.pdf_optimizer import optimize_file
+from ..services.pdf_probe import probe_pdf
+from ..utils.parsers import PageSelection, select_pages
+from ..utils.tracing import span
+from ..utils.validators import IMAGE_EXTENSIONS, preflight_pdf, validate_image, validate_pdf
+
+
+# Output formats: extension -> Pillow encoder. tiff and ppm are lossless and
+# kept for callers of the original pdf2image-based tool.
+RENDER_FORMATS = {
+    "png": "PNG",
+    "jpeg": "JPEG",
+    "jpg": "JPEG",
+    "webp": "WEBP",
+    "tiff": "TIFF",
+    "tif": "TIFF",
+    "ppm": "PPM",
+}
+COLOR_MODES = ("color", "auto", "gray", "bilevel")
+DEFAULT_QUALITY = {"JPEG": 85, "WEBP": 80}
+# Lowest quality tried when shrinking a page to target_bytes, before downscaling.
+MIN_QUALITY = 30
+# Downscale rounds allowed for target_bytes; each keeps at least half of each side.
+TARGET_SCALE_ROUNDS = 4
+# "auto" color detection works on a nearest-neighbour sample of this size.
+SAMPLE_SIZE = 256
+# Channel spread at or below which a pixel counts as gray, and the share of
+# colored pixels (sample) above which a page is kept in color.
+GRAY_TOLERANCE = 12
+COLOR_SHARE = 0.002
+# Pages with at most this share of midtone pixels (64..191) are treated as bilevel.
+BILEVEL_MIDTONE_SHARE = 0.06
+# Blocks separated by at most this many unselected pages share one renderer
+# call (the extra pages are rasterized and dropped) ...
+RENDER_GAP_PAGES = 2
+# ... and one pdf_to_images call never starts more than this many renderers.
+MAX_RENDER_CALLS = 16
+
+
+def detect_color_mode(img: Image.Image) -> str:
+    """Classify a rendered page as "color", "gray" or "bilevel" (black and white)."""
+    sample = img.resize(
+        (min(img.width, SAMPLE_SIZE), min(img.height, SAMPLE_SIZE)), Image.Resampling.NEAREST
+    )
+    total = sample.width * sample.height
+    if sample.mode not in {"L", "1"}:
+        r, g, b = sample.convert("RGB").split()
+        spread = ImageChops.lighter(
+            ImageChops.lighter(ImageChops.difference(r, g), ImageChops.difference(g, b)),
+            ImageChops.difference(r, b),
+        )
+        if sum(spread.histogram()[GRAY_TOLERANCE + 1 :]) > COLOR_SHARE * total:
+            return "color"
+    midtones = sum(sample.convert("L").histogram()[64:192])
+    return "bilevel" if midtones <= BILEVEL_MIDTONE_SHARE * total else "gray"
+
+
+def _apply_color_mode(img: Image.Image, mode: str, encoder: str) -> Image.Image:
+    if mode == "color":
+        return img if img.mode in {"RGB", "L"} else img.convert("RGB")
+    gray = img.convert("L")
+    if mode == "gray":
+        return gray
+    bilevel = gray.point(lambda v: 255 if v >= 128 else 0)
+    # 1-bit only pays off for PNG; JPEG and WebP encode it as 8-bit anyway
+    return bilevel.convert("1", dither=Image.Dither.NONE) if encoder == "PNG" else bilevel
+
+
+def _save(img: Image.Image, encoder: str, quality: Optional[int]) -> bytes:
+    buf = io.BytesIO()
+    if encoder == "PNG":
+        img.save(buf, format="PNG", optimize=img.mode == "1")
+    elif encoder == "JPEG":
+        img.save(buf, format="JPEG", quality=quality, optimize=True)
+    elif encoder == "WEBP":
+        img.save(buf, format="WEBP", quality=quality, method=4)
+    else:
+        img.save(buf, format=encoder)
+    return buf.getvalue()
+
+
+def encode_page(
+    img: Image.Image,
+    encoder: str,
+    quality: Optional[int] = None,
+    target_bytes: Optional[int] = None,
+) -> Tuple[bytes, Image.Image, Optional[int]]:
+    """Encode a page, shrinking it to ``target_bytes`` if given.
+
+    Lossy formats first lower the quality (binary search down to
+    MIN_QUALITY); if that is not enough, or for PNG, the page is downscaled
+    in proportion to the overshoot. Returns (data, image written, quality).
+    """
+    start_quality = quality or DEFAULT_QUALITY.get(encoder)
+    quality = start_quality
+    data = _save(img, encoder, quality)
+    rounds = 0
+    while target_bytes and len(data) > target_bytes:
+        if quality is not None:
+            lo, hi, fits = MIN_QUALITY, quality - 1, None
+            while lo <= hi:
+                q = (lo + hi) // 2
+                candidate = _save(img, encoder, q)
+                if len(candidate) <= target_bytes:
+                    fits, lo = (candidate, q), q + 1
+                else:
+                    data, quality, hi = candidate, q, q - 1
+            if fits is not None:
+                data, quality = fits
+                break
+        if rounds == TARGET_SCALE_ROUNDS:
+            break
+        rounds += 1
+        scale = max(0.5, min(0.9, (target_bytes / len(data)) ** 0.5))
+        size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        img = img.resize(size, Image.Resampling.NEAREST if img.mode == "1" else Image.Resampling.LANCZOS)
+        quality = start_quality
+        data = _save(img, encoder, quality)
+    return data, img, quality
+
+
+def _block_dpi(reader: PdfReader, pages: Iterable[int], dpi: int, max_dimension: Optional[int]) -> int:
+    """Render resolution for a block of pages: ``dpi``, lowered so the largest page fits max_dimension."""
+    if not max_dimension:
+        return dpi
+    longest = max(
+        max(float(reader.pages[p - 1].mediabox.width), float(reader.pages[p - 1].mediabox.height))
+        for p in pages
+    )
+    if longest <= 0:
+        return dpi
+    return max(1, min(dpi, int(max_dimension * 72 / longest)))
+
+
+def render_blocks(selection: PageSelection) -> List[Tuple[int, int]]:
+    """(first, last) spans to hand to the renderer for ``selection``.
+
+    Each renderer call is a separate pdftoppm process, so "odd" over 500
+    pages must not become 250 of them. Blocks closer than RENDER_GAP_PAGES
+    are merged; past MAX_RENDER_CALLS, only the widest gaps stay split.
+    """
+    blocks: List[Tuple[int, int]] = []
+    for first, last in selection.intervals():
+        if blocks and first - blocks[-1][1] - 1 <= RENDER_GAP_PAGES:
+            blocks[-1] = (blocks[-1][0], last)
+        else:
+            blocks.append((first, last))
+    if len(blocks) <= MAX_RENDER_CALLS:
+        return blocks
+    widest = sorted(
+        range(1, len(blocks)), key=lambda i: blocks[i][0] - blocks[i - 1][1], reverse=True
+    )
+    merged: List[Tuple[int, int]] = []
+    start = 0
+    for cut in sorted(widest[: MAX_RENDER_CALLS - 1]) + [len(blocks)]:
+        merged.append((blocks[start][0], blocks[cut - 1][1]))
+        start = cut
+    return merged
 
 
 def pdf_to_images(
@@ -18,8 +181,33 @@ def pdf_to_images(
     format: str = "png",
     dpi: int = 150,
     pages: Optional[List[int]] = None,
+    page_range: Optional[str] = None,
+    quality: Optional[int] = None,
+    color_mode: str = "color",
+    max_dimension: Optional[int] = None,
+    target_bytes: Optional[int] = None,
 ) -> list[dict]:
+    fmt = format.lower().lstrip(".")
+    encoder = RENDER_FORMATS.get(fmt)
+    if encoder is None:
+        raise ValueError(
+            f"Unsupported image format: {format} (use png, jpeg, webp, tiff or ppm)"
+        )
+    color_mode = color_mode.lower()
+    if color_mode not in COLOR_MODES:
+        raise ValueError(f"color_mode must be one of {', '.join(COLOR_MODES)}")
+    if quality is not None and not 1 <= quality <= 100:
+        raise ValueError("quality must be between 1 and 100")
+    if max_dimension is not None and max_dimension < 16:
+        raise ValueError("max_dimension must be at least 16 pixels")
+    if target_bytes is not None and target_bytes < 1024:
+        raise ValueError("target_bytes must be at least 1024")
     pdf_path = validate_pdf(file_path)
+    # Linearized files carry the page count up front; otherwise read /Count
+    page_count = preflight_pdf(pdf_path).page_count_hint or probe_pdf(pdf_path).page_count
+    if not page_count:
+        raise ValueError("Cannot render: encrypted or unreadable PDF (page count unavailable)")
+    selection = select_pages(page_count, pages, page_range)
     if shutil.which("pdftoppm") is None:
         raise ValueError(
             "Poppler not found (pdftoppm missing). Install Poppler and put 'bin' on PATH."
@@ -28,20 +216,240 @@ def pdf_to_images(
     outdir.mkdir(parents=True, exist_ok=True)
 
     # Note: On Windows, pdf2image requires poppler. Documented in README.
-    images = convert_from_path(
-        str(pdf_path),
-        dpi=dpi,
-        fmt=format,
-        first_page=min(pages) if pages else None,
-        last_page=max(pages) if pages else None,
-    )
+    # Renderer calls are batched by render_blocks; pages in the gaps are dropped.
+    # Poppler hands back raw pixels (PPM/PGM) that are encoded once, here;
+    # gray/bilevel pages are rendered gray and max_dimension lowers the DPI.
+    results: list[dict] = []
+    with open_input(pdf_path) as buf:
+        reader = PdfReader(buf)
+        for first, last in render_blocks(selection):
+            wanted = [p for p in range(first, last + 1) if p in selection]
+            images = convert_from_path(
+                str(pdf_path),
+                dpi=_block_dpi(reader, wanted, dpi, max_dimension),
+                first_page=first,
+                last_page=last,
+                grayscale=color_mode in {"gray", "bilevel"},
+            )
+            for page_no, img in enumerate(images, start=first):
+                if page_no not in selection:
+                    continue
+                with span("page", page=page_no):
+                    if max_dimension and max(img.size) > max_dimension:
+                        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+                    mode = detect_color_mode(img) if color_mode == "auto" else color_mode
+                    data, img, used_quality = encode_page(
+                        _apply_color_mode(img, mode, encoder), encoder, quality, target_bytes
+                    )
+                    out_path = outdir / f"page-{page_no:04d}.{fmt}"
+                    with atomic_writer(out_path) as fh:
+                        fh.write(data)
+                item = {
+                    "path": str(out_path.resolve()),
+                    "page_number": page_no,
+                    "format": fmt,
+                    "color_mode": mode,
+                    "width": img.width,
+                    "height": img.height,
+                    "size": len(data),
+                }
+                if used_quality is not None:
+                    item["quality"] = used_quality
+                results.append(item)
+    return results
+
+
+# Streams already in a standalone image format: written byte for byte.
+PASSTHROUGH_FILTERS = {"/DCTDecode": "jpg", "/JPXDecode": "jp2"}
+# Text encodings some writers wrap around them; undone without touching the image data.
+_ASCII_FILTERS = {
+    "/ASCII85Decode": ASCII85Decode,
+    "/A85": ASCII85Decode,
+    "/ASCIIHexDecode": ASCIIHexDecode,
+    "/AHx": ASCIIHexDecode,
+}
+_COMPONENTS_MODE = {1: "L", 3: "RGB", 4: "CMYK"}
+_DEVICE_MODE = {"/DeviceGray": "L", "/DeviceRGB": "RGB", "/DeviceCMYK": "CMYK"}
+
+
+def _image_filters(img: StreamObject) -> List[str]:
+    filt = img.get("/Filter")
+    if isinstance(filt, ArrayObject):
+        return [str(f) for f in filt]
+    return [str(filt)] if filt is not None else []
+
+
+def _passthrough(filters: List[str], raw: bytes) -> Optional[Tuple[str, bytes]]:
+    """(extension, encoded image bytes) when the stream is a JPEG/JPEG 2000 file, else None."""
+    if not filters or filters[-1] not in PASSTHROUGH_FILTERS:
+        return None
+    data = raw
+    for name in filters[:-1]:
+        codec = _ASCII_FILTERS.get(name)
+        if codec is None:
+            return None
+        data = codec.decode(data)
+    return PASSTHROUGH_FILTERS[filters[-1]], data
+
+
+def _page_images(resources: object, seen_forms: set) -> Iterator[Tuple[str, IndirectObject]]:
+    """Image XObjects of a resource dictionary, including those inside form XObjects."""
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else None
+    if not isinstance(xobjects, DictionaryObject):
+        return
+    for name, ref in xobjects.items():
+        if not isinstance(ref, IndirectObject):
+            continue
+        obj = ref.get_object()
+        if not isinstance(obj, StreamObject):
+            continue
+        subtype = obj.get("/Subtype")
+        if subtype == "/Image":
+            yield str(name), ref
+        elif subtype == "/Form" and ref.idnum not in seen_forms:
+            seen_forms.add(ref.idnum)
+            yield from _page_images(obj.get("/Resources"), seen_forms)
+
+
+def _color_mode(img: StreamObject) -> Tuple[Optional[str], Optional[bytes]]:
+    """(PIL mode, RGB palette) for an image's color space; (None, None) if unsupported."""
+    cs = img.get("/ColorSpace")
+    cs = cs.get_object() if cs is not None else None
+    if isinstance(cs, ArrayObject) and cs:
+        family = str(cs[0])
+        if family == "/ICCBased":
+            return _COMPONENTS_MODE.get(int(cs[1].get_object().get("/N", 0))), None
+        if family == "/Indexed" and len(cs) == 4:
+            base = cs[1].get_object()
+            lookup = cs[3].get_object()
+            if isinstance(lookup, StreamObject):
+                table = lookup.get_data()
+            else:
+                table = lookup.original_bytes if hasattr(lookup, "original_bytes") else bytes(lookup)
+            if base == "/DeviceGray":
+                table = b"".join(bytes([b]) * 3 for b in table)
+            elif base != "/DeviceRGB":
+                return None, None
+            return "P", table
+        return None, None
+    return _DEVICE_MODE.get(str(cs)), None
+
+
+def _decode_xobject(img: StreamObject) -> Tuple[str, bytes]:
+    """Render an image XObject as a PNG (or TIFF for CCITT fax); raises ValueError if unsupported."""
+    filters = _image_filters(img)
+    if filters and filters[-1] == "/CCITTFaxDecode":
+        # PyPDF2 wraps the fax data in a TIFF header
+        return "tiff", img.get_data()
+    if any(f in PASSTHROUGH_FILTERS for f in filters):
+        raise ValueError(f"unsupported filter chain {filters}")
+    size = (int(img["/Width"]), int(img["/Height"]))
+    bpc = int(img.get("/BitsPerComponent", 1))
+    if img.get("/ImageMask"):
+        mode, palette = "1", None
+    else:
+        mode, palette = _color_mode(img)
+        if mode is None:
+            raise ValueError(f"unsupported color space {img.get('/ColorSpace')}")
+        if bpc == 1 and mode == "L":
+            mode = "1"
+        elif bpc != 8:
+            raise ValueError(f"unsupported BitsPerComponent {bpc}")
+    pil = Image.frombytes(mode, size, img.get_data())
+    if palette is not None:
+        pil.putpalette(palette)
+        pil = pil.convert("RGB")
+    if mode == "CMYK":
+        pil = pil.convert("RGB")
+    smask = img.get("/SMask")
+    smask = smask.get_object() if smask is not None else None
+    if isinstance(smask, StreamObject) and (int(smask["/Width"]), int(smask["/Height"])) == size:
+        pil = pil.convert("RGBA") if pil.mode != "L" else pil.convert("LA")
+        pil.putalpha(Image.frombytes("L", size, smask.get_data()))
+    out = io.BytesIO()
+    pil.save(out, format="PNG")
+    return "png", out.getvalue()
+
+
+def _write_image(img: StreamObject, raw: bytes, outdir: Path, page_no: int, seq: int) -> dict:
+    filters = _image_filters(img)
+    entry = {
+        "width": int(img.get("/Width", 0)),
+        "height": int(img.get("/Height", 0)),
+        "filter": filters,
+        "pages": [],
+        "names": [],
+    }
+    stem = outdir / f"image-{seq:04d}-p{page_no:04d}"
+    passthrough = _passthrough(filters, raw)
+    if passthrough is not None:
+        (ext, data), copied = passthrough, True
+    else:
+        try:
+            ext, data = _decode_xobject(img)
+        except Exception as e:  # noqa: BLE001
+            entry.update(path=None, format=None, size=0, copied=False, error=str(e))
+            return entry
+        copied = False
+    out_path = stem.with_suffix(f".{ext}")
+    with atomic_writer(out_path) as fh:
+        fh.write(data)
+    entry.update(path=str(out_path.resolve()), format=ext, size=len(data), copied=copied)
+    return entry
+
+
+def extract_images(
+    file_path: str,
+    output_dir: str,
+    pages: Optional[List[int]] = None,
+    page_range: Optional[str] = None,
+) -> list[dict]:
+    """Write the image XObjects of the selected pages without rasterizing pages.
+
+    JPEG (DCT) and JPEG 2000 (JPX) streams are copied byte for byte (after
+    removing an ASCII85/ASCIIHex wrapper, if any); other
+    images are decoded and written as PNG (CCITT fax as TIFF). An image used on
+    several pages, or stored several times with identical bytes, is written
+    once and lists every page it appears on. Inline images are not extracted.
+    """
+    pdf_path = validate_pdf(file_path)
+    outdir = Path(output_dir)
+    outdir.mkdir(parents=True, exist_ok=True)
 
     results: list[dict] = []
-    for idx, img in enumerate(images, start=1 if not pages else min(pages)):
-        page_no = idx
-        out_path = outdir / f"page-{page_no:04d}.{format}"
-        img.save(str(out_path))
-        results.append({"path": str(out_path.resolve()), "width": img.width, "height": img.height})
+    by_object: Dict[int, dict] = {}
+    by_digest: Dict[str, dict] = {}
+    with open_input(pdf_path) as src:
+        reader = PdfReader(src)
+        selection = select_pages(len(reader.pages), pages, page_range)
+        for page_no in selection:
+            page = reader.pages[page_no - 1]
+            with span("page", page=page_no):
+                for name, ref in _page_images(page.get("/Resources"), set()):
+                    entry = by_object.get(ref.idnum)
+                    if entry is None:
+                        img = ref.get_object()
+                        raw = img._data
+                        raw = raw.encode("latin-1") if isinstance(raw, str) else raw
+                        h = hashlib.sha256(raw)
+                        for key in ("/Width", "/Height", "/ColorSpace", "/BitsPerComponent", "/Filter", "/DecodeParms"):
+                            h.update(repr(img.get(key)).encode("utf-8"))
+                        digest = h.hexdigest()
+                        entry = by_digest.get(digest)
+                        if entry is None:
+                            entry = _write_image(img, raw, outdir, page_no, len(results) + 1)
+                            entry["sha256"] = digest
+                            by_digest[digest] = entry
+                            results.append(entry)
+                        by_object[ref.idnum] = entry
+                    if page_no not in entry["pages"]:
+                        entry["pages"].append(page_no)
+                    if name not in entry["names"]:
+                        entry["names"].append(name)
     return results
 
 
@@ -58,6 +466,8 @@ def images_to_pdf(
     output_path: str,
     page_size: str = "A4",
     orientation: str = "portrait",
+    optimize: bool = False,
+    linearize: bool = False,
 ) -> dict:
     if not image_paths:
         raise ValueError("image_paths cannot be empty")
@@ -101,7 +511,16 @@ def images_to_pdf(
         pages.append(canvas)
 
     out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    # Save multi-page PDF
-    pages[0].save(str(out), save_all=True, append_images=pages[1:])
-    return {"output_path": str(out.resolve()), "page_count": len(pages), "output_size": out.stat().st_size}
+    # Save multi-page PDF (atomically: out may be a file other requests are reading)
+    with atomic_writer(out) as fh:
+        pages[0].save(fh, format="PDF", save_all=True, append_images=pages[1:])
+    result = {"output_path": str(out.resolve()), "page_count": len(pages), "output_size": out.stat().st_size}
+    if optimize:
+        result["input_size"] = result["output_size"]
+        result["optimization"] = optimize_file(out).as_dict()
+        result["output_size"] = out.stat().st_size
+    if linearize:
+        linearize_file(out)
+        result["output_size"] = out.stat().st_size
+    result["linearized"] = linearize
+    return result
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import io
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import DictionaryObject, NameObject, NumberObject, PdfObject
+
+
+# Bytes scanned at the end of the file for the last startxref keyword.
+TAIL_BYTES = 2048
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+
+
+def last_startxref(path: Path) -> Optional[int]:
+    """Return the offset of the newest cross-reference section, if one is declared."""
+    size = path.stat().st_size
+    with path.open("rb") as fh:
+        fh.seek(max(0, size - TAIL_BYTES))
+        tail = fh.read()
+    matches = _STARTXREF_RE.findall(tail)
+    if not matches:
+        return None
+    return int(matches[-1])
+
+
+def supports_incremental(path: Path, reader: PdfReader) -> bool:
+    """Whether an update can be appended with a classic xref table.
+
+    Encrypted documents (objects would need re-encryption) and documents whose
+    newest cross-reference section is a stream are left to a full rewrite.
+    """
+    if reader.is_encrypted:
+        return False
+    offset = last_startxref(path)
+    if offset is None:
+        return False
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        return fh.read(4) == b"xref"
+
+
+def _subsections(ids: List[int]) -> List[List[int]]:
+    groups: List[List[int]] = []
+    for idnum in sorted(ids):
+        if groups and groups[-1][-1] + 1 == idnum:
+            groups[-1].append(idnum)
+        else:
+            groups.append([idnum])
+    return groups
+
+
+def _update_section(
+    reader: PdfReader,
+    objects: Dict[Tuple[int, int], PdfObject],
+    base_offset: int,
+    prev_xref: int,
+) -> bytes:
+    buf = io.BytesIO()
+    buf.write(b"\n")
+    offsets: Dict[int, Tuple[int, int]] = {}
+    for (idnum, generation), obj in sorted(objects.items()):
+        offsets[idnum] = (base_offset + buf.tell(), generation)
+        buf.write(f"{idnum} {generation} obj\n".encode("ascii"))
+        obj.write_to_stream(buf, None)
+        buf.write(b"\nendobj\n")
+
+    xref_offset = base_offset + buf.tell()
+    buf.write(b"xref\n")
+    for group in _subsections(list(offsets)):
+        buf.write(f"{group[0]} {len(group)}\n".encode("ascii"))
+        for idnum in group:
+            offset, generation = offsets[idnum]
+            buf.write(f"{offset:010d} {generation:05d} n\r\n".encode("ascii"))
+
+    trailer = DictionaryObject()
+    for key, value in reader.trailer.items():
+        if key not in ("/Prev", "/XRefStm"):
+            trailer[NameObject(key)] = value
+    size = max(int(reader.trailer.get("/Size", 0)), max(offsets) + 1)
+    trailer[NameObject("/Size")] = NumberObject(size)
+    trailer[NameObject("/Prev")] = NumberObject(prev_xref)
+    buf.write(b"trailer\n")
+    trailer.write_to_stream(buf, None)
+    buf.write(f"\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+    return buf.getvalue()
+
+
+def append_update(
+    source: Path,
+    reader: PdfReader,
+    objects: Dict[Tuple[int, int], PdfObject],
+    output: Path,
+) -> int:
+    """Append changed objects and a new xref section; return the bytes appended.
+
+    ``objects`` maps ``(idnum, generation)`` of existing objects to their new
+    value. When ``output`` is not ``source`` the original is copied first, so
+    only the copy grows; otherwise ``source`` is updated in place.
+    """
+    prev_xref = last_startxref(source)
+    if prev_xref is None:
+        raise ValueError("Cannot locate startxref; incremental update not possible")
+    if output.resolve() != source.resolve():
+        output.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, output)
+    base_offset = output.stat().st_size
+    section = _update_section(reader, objects, base_offset, prev_xref)
+    with output.open("ab") as fh:
+        fh.write(section)
+    return len(section)
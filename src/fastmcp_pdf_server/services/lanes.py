@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+from ..config import settings
+from ..utils.logger import get_logger
+from ..utils.tracing import span
+
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+# Waits kept per lane for the p95 in snapshots.
+WAIT_SAMPLES = 256
+# Upper bound for BULK_WORKERS=0 (one per CPU).
+DEFAULT_MAX_BULK_WORKERS = 8
+
+
+def interactive_tools() -> set[str]:
+    return {name.strip() for name in settings.interactive_tools.split(",") if name.strip()}
+
+
+def lane_for(tool: str, override: Optional[str] = None) -> str:
+    """The lane ``tool`` runs in: ``override`` when given, else its default
+    (INTERACTIVE_TOOLS are interactive, everything else is bulk)."""
+    if override:
+        lane = override.lower()
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane '{override}', choose one of {list(LANES)}")
+        return lane
+    return INTERACTIVE if tool in interactive_tools() else BULK
+
+
+def current_client() -> str:
+    """Key used for fairness: the MCP client id, else the session id."""
+    try:
+        from fastmcp.server.dependencies import get_context  # type: ignore
+
+        ctx = get_context()
+        return ctx.client_id or ctx.session_id
+    except Exception:  # noqa: BLE001
+        # No request context (in-process callers, older fastmcp)
+        return "local"
+
+
+def default_capacity(lane: str) -> int:
+    if lane == INTERACTIVE:
+        return max(1, settings.interactive_workers)
+    if settings.bulk_workers > 0:
+        return settings.bulk_workers
+    return max(2, min(DEFAULT_MAX_BULK_WORKERS, os.cpu_count() or 1))
+
+
+@dataclass
+class LaneMetrics:
+    admitted: int = 0
+    completed: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    max_queue_depth: int = 0
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=WAIT_SAMPLES))
+
+    def record_wait(self, ms: float) -> None:
+        self.admitted += 1
+        self.wait_ms_total += ms
+        self.wait_ms_max = max(self.wait_ms_max, ms)
+        self.waits.append(ms)
+
+
+class _Lane:
+    """Fixed number of worker threads plus a queue per client.
+
+    Slots are handed out round-robin over the clients that are waiting, so
+    one client submitting fifty renders does not push another client's
+    single call to the back. Queue state is only touched on the event loop.
+    """
+
+    def __init__(self, name: str, capacity: int) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.executor = ThreadPoolExecutor(capacity, thread_name_prefix=f"lane-{name}")
+        self.running = 0
+        self.waiting: "OrderedDict[str, Deque[asyncio.Future[None]]]" = OrderedDict()
+        self.metrics = LaneMetrics()
+
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self.waiting.values())
+
+    async def acquire(self, client: str) -> None:
+        if self.running < self.capacity and not self.waiting:
+            self.running += 1
+            self.metrics.record_wait(0.0)
+            return
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self.waiting.setdefault(client, deque()).append(fut)
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.queue_depth())
+        start = time.perf_counter()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was granted just before the cancel: pass it on
+                self.release()
+            else:
+                queue = self.waiting.get(client)
+                if queue is not None and fut in queue:
+                    queue.remove(fut)
+                    if not queue:
+                        del self.waiting[client]
+            raise
+        self.metrics.record_wait((time.perf_counter() - start) * 1000)
+
+    def release(self) -> None:
+        self.running -= 1
+        while self.running < self.capacity and self.waiting:
+            client, queue = next(iter(self.waiting.items()))
+            fut = queue.popleft()
+            # Served clients go to the back of the rotation
+            del self.waiting[client]
+            if queue:
+                self.waiting[client] = queue
+            if fut.cancelled():
+                continue
+            self.running += 1
+            fut.set_result(None)
+
+    def snapshot(self) -> dict:
+        m = self.metrics
+        waits = sorted(m.waits)
+        return {
+            "capacity": self.capacity,
+            "running": self.running,
+            "queue_depth": self.queue_depth(),
+            "waiting_clients": len(self.waiting),
+            "max_queue_depth": m.max_queue_depth,
+            "completed": m.completed,
+            "wait_ms": {
+                "avg": round(m.wait_ms_total / m.admitted, 3) if m.admitted else 0.0,
+                "p95": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0,
+                "max": round(m.wait_ms_max, 3),
+            },
+        }
+
+
+class LaneScheduler:
+    """Runs blocking tool work in separate interactive and bulk thread pools.
+
+    Cheap calls (info, metadata, listings) keep their own capacity, so they
+    answer in milliseconds while every bulk worker is busy rendering or
+    merging. Within a lane, clients are served round-robin. Per process:
+    HTTP workers schedule independently.
+    """
+
+    def __init__(self, capacity: Optional[Dict[str, int]] = None) -> None:
+        self._capacity = dict(capacity or {})
+        self._lanes: Dict[str, _Lane] = {}
+
+    def _lane(self, name: str) -> _Lane:
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = _Lane(name, self._capacity.get(name) or default_capacity(name))
+            self._lanes[name] = lane
+        return lane
+
+    async def run(
+        self, tool: str, fn: Callable[[], T], lane: Optional[str] = None, client: Optional[str] = None
+    ) -> T:
+        """Run ``fn`` in a worker thread of ``tool``'s lane (``lane`` overrides it)."""
+        target = self._lane(lane_for(tool, lane))
+        with span("queue", lane=target.name):
+            await target.acquire(client or current_client())
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        # The slot is held until the thread finishes, even if the caller goes away
+        job = target.executor.submit(ctx.run, fn)
+
+        def done(_job: object) -> None:
+            target.metrics.completed += 1
+            target.release()
+
+        job.add_done_callback(lambda j: _call_soon(loop, done, j))
+        return await asyncio.wrap_future(job)
+
+    def snapshot(self) -> dict:
+        return {
+            "interactive_tools": sorted(interactive_tools()),
+            "lanes": {name: self._lane(name).snapshot() for name in LANES},
+        }
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, fn: Callable[..., None], *args: object) -> None:
+    try:
+        loop.call_soon_threadsafe(fn, *args)
+    except RuntimeError:
+        # Loop already closed (shutdown); nothing is waiting on this lane any more
+        logger.debug("lane release after loop close")
+
+
+lanes = LaneScheduler()
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import io
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, NullObject, PdfObject, StreamObject
+
+from .file_manager import atomic_writer, open_input
+
+
+# Numbers patched in after layout (/L, /H, /E, /T, /Prev) are padded to this width
+# so the first-page section keeps its size between the two layout passes.
+OFFSET_WIDTH = 10
+
+_HEADER_BINARY = b"%\xe2\xe3\xcf\xd3\n"
+
+
+class _BitWriter:
+    """Big-endian bit packer for the hint tables."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value: int, nbits: int) -> None:
+        for shift in range(nbits - 1, -1, -1):
+            self._acc = (self._acc << 1) | ((value >> shift) & 1)
+            self._nbits += 1
+            if self._nbits == 8:
+                self._buf.append(self._acc)
+                self._acc = self._nbits = 0
+
+    def align(self) -> None:
+        if self._nbits:
+            self.write(0, 8 - self._nbits)
+
+    def items(self, values: List[int], nbits: int) -> None:
+        """One hint-table item for every page or group, starting at a byte boundary."""
+        for value in values:
+            self.write(value, nbits)
+        self.align()
+
+    def getvalue(self) -> bytes:
+        self.align()
+        return bytes(self._buf)
+
+
+def _refs(obj: PdfObject, skip_parent: bool = True) -> List[int]:
+    """Object numbers referenced directly by ``obj`` (not following references)."""
+    found: List[int] = []
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, IndirectObject):
+            found.append(value.idnum)
+        elif isinstance(value, DictionaryObject):
+            for key, item in value.items():
+                if (skip_parent and key == "/Parent") or (key == "/Length" and isinstance(value, StreamObject)):
+                    continue
+                stack.append(item)
+        elif isinstance(value, ArrayObject):
+            stack.extend(value)
+    return found
+
+
+def _renumber(value: PdfObject, mapping: Dict[int, int]) -> PdfObject:
+    if isinstance(value, IndirectObject):
+        new = mapping.get(value.idnum)
+        return IndirectObject(new, 0, None) if new is not None else NullObject()
+    if isinstance(value, DictionaryObject):
+        for key, item in list(value.items()):
+            value[key] = _renumber(item, mapping)
+    elif isinstance(value, ArrayObject):
+        for i, item in enumerate(value):
+            value[i] = _renumber(item, mapping)
+    return value
+
+
+def _serialize(idnum: int, obj: PdfObject) -> bytes:
+    buf = io.BytesIO()
+    buf.write(f"{idnum} 0 obj\n".encode("ascii"))
+    obj.write_to_stream(buf, None)
+    buf.write(b"\nendobj\n")
+    return buf.getvalue()
+
+
+def _padded(value: int) -> str:
+    return f"{value:>{OFFSET_WIDTH}d}"
+
+
+def _xref_entries(offsets: List[int]) -> bytes:
+    return b"".join(f"{offset:010d} 00000 n\r\n".encode("ascii") for offset in offsets)
+
+
+class _Plan:
+    """Object order for a linearized file (ISO 32000-1 Annex F).
+
+    Sections, in file order: catalog, first page (its page object and every
+    object it uses), each remaining page (objects used by that page only),
+    objects shared by several later pages, and everything else.
+    """
+
+    def __init__(self, reader: PdfReader) -> None:
+        self.reader = reader
+        self._cache: Dict[int, PdfObject] = {}
+        trailer = reader.trailer
+        self.root = trailer.raw_get("/Root").idnum
+        info = trailer.raw_get("/Info") if "/Info" in trailer else None
+        self.info = info.idnum if isinstance(info, IndirectObject) else None
+
+        self.pages = [page.indirect_reference.idnum for page in reader.pages]
+        self.contents = {pid: self._first_content(pid) for pid in self.pages}
+        page_set = set(self.pages)
+        tree = self._tree_nodes(page_set)
+        boundary = page_set | tree | {self.root} | ({self.info} if self.info else set())
+
+        reach = [self._walk(pid, boundary - {pid}) for pid in self.pages]
+        users: Dict[int, set] = {}
+        for index, ids in enumerate(reach):
+            for idnum in ids:
+                users.setdefault(idnum, set()).add(index)
+
+        self.first = reach[0]
+        first_set = set(self.first)
+        self.own: List[List[int]] = [self.first]
+        self.shared_refs: List[List[int]] = [[]]
+        shared: Dict[int, None] = {}
+        for index, ids in enumerate(reach[1:], start=1):
+            self.own.append([i for i in ids if i not in first_set and users[i] == {index}])
+            refs = [i for i in ids if i in first_set or len(users[i]) > 1]
+            self.shared_refs.append(refs)
+            shared.update((i, None) for i in refs if i not in first_set)
+        self.shared = list(shared)
+
+        placed = {self.root, *first_set, *shared}
+        for ids in self.own:
+            placed.update(ids)
+        # The outline tree gets its own contiguous group (outline hint table)
+        self.outlines: List[int] = []
+        outlines = self.obj(self.root).get("/Outlines")
+        if isinstance(outlines, IndirectObject) and outlines.idnum not in placed:
+            self.outlines = [i for i in self._walk(outlines.idnum, boundary) if i not in placed]
+            placed.update(self.outlines)
+        starts = [self.root] + ([self.info] if self.info else [])
+        self.other = self.outlines + [i for i in self._walk_all(starts) if i not in placed]
+
+    def obj(self, idnum: int) -> PdfObject:
+        if idnum not in self._cache:
+            self._cache[idnum] = self.reader.get_object(IndirectObject(idnum, 0, self.reader))
+        return self._cache[idnum]
+
+    def _first_content(self, pid: int) -> Optional[int]:
+        contents = self.obj(pid).get("/Contents")
+        if isinstance(contents, ArrayObject) and contents:
+            contents = contents[0]
+        return contents.idnum if isinstance(contents, IndirectObject) else None
+
+    def _tree_nodes(self, page_set: set) -> set:
+        nodes = set()
+        stack = [self.reader.trailer["/Root"].raw_get("/Pages")]
+        while stack:
+            ref = stack.pop()
+            if not isinstance(ref, IndirectObject) or ref.idnum in page_set or ref.idnum in nodes:
+                continue
+            nodes.add(ref.idnum)
+            kids = self.obj(ref.idnum).get("/Kids", ArrayObject())
+            stack.extend(kids.get_object() if isinstance(kids, IndirectObject) else kids)
+        return nodes
+
+    def _children(self, idnum: int, skip_parent: bool = True) -> List[int]:
+        return [i for i in _refs(self.obj(idnum), skip_parent) if self.obj(i) is not None]
+
+    def _walk(self, start: int, boundary: set) -> List[int]:
+        """Objects reachable from ``start`` without crossing ``boundary`` or /Parent links."""
+        order: List[int] = []
+        seen = {start}
+        stack = [start]
+        while stack:
+            idnum = stack.pop()
+            order.append(idnum)
+            for child in reversed(self._children(idnum)):
+                if child not in seen and child not in boundary:
+                    seen.add(child)
+                    stack.append(child)
+        return order
+
+    def _walk_all(self, starts: List[int]) -> List[int]:
+        order: List[int] = []
+        seen = set(starts)
+        stack = list(reversed(starts))
+        while stack:
+            idnum = stack.pop()
+            order.append(idnum)
+            for child in reversed(self._children(idnum, skip_parent=False)):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return order
+
+
+def _hint_stream(
+    plan: _Plan,
+    mapping: Dict[int, int],
+    bodies: Dict[int, bytes],
+    offsets: Dict[int, int],
+) -> Tuple[bytes, Dict[str, int]]:
+    """Page offset, shared object and outline hint tables; returns the data and
+    the table offsets for the hint stream dictionary (/S, /O).
+
+    ``offsets`` are computed as if the hint stream were absent, as the
+    specification requires.
+    """
+    sections = plan.own
+    nobjects = [len(ids) for ids in sections]
+    starts = [offsets[ids[0]] for ids in sections]
+    lengths = [sum(len(bodies[i]) for i in ids) for ids in sections]
+
+    content_offsets: List[int] = []
+    content_lengths: List[int] = []
+    for pid, ids, start in zip(plan.pages, sections, starts):
+        contents = plan.contents[pid]
+        if contents in ids:
+            content_offsets.append(offsets[contents] - start)
+            content_lengths.append(len(bodies[contents]))
+        else:
+            content_offsets.append(0)
+            content_lengths.append(0)
+
+    groups = plan.first + plan.shared
+    group_index = {idnum: index for index, idnum in enumerate(groups)}
+    refs = [[group_index[i] for i in ids] for ids in plan.shared_refs]
+
+    bits = _BitWriter()
+    least_objects, least_length = min(nobjects), min(lengths)
+    least_offset, least_content = min(content_offsets), min(content_lengths)
+    objects_bits = (max(nobjects) - least_objects).bit_length()
+    length_bits = (max(lengths) - least_length).bit_length()
+    offset_bits = (max(content_offsets) - least_offset).bit_length()
+    content_bits = (max(content_lengths) - least_content).bit_length()
+    nrefs_bits = max(len(r) for r in refs).bit_length()
+    ident_bits = (len(groups) - 1).bit_length()
+    for value, nbits in (
+        (least_objects, 32),
+        (offsets[plan.pages[0]], 32),
+        (objects_bits, 16),
+        (least_length, 32),
+        (length_bits, 16),
+        (least_offset, 32),
+        (offset_bits, 16),
+        (least_content, 32),
+        (content_bits, 16),
+        (nrefs_bits, 16),
+        (ident_bits, 16),
+        (0, 16),  # bits for the fractional position numerator
+        (1, 16),  # its denominator
+    ):
+        bits.write(value, nbits)
+    bits.items([n - least_objects for n in nobjects], objects_bits)
+    bits.items([n - least_length for n in lengths], length_bits)
+    bits.items([len(r) for r in refs], nrefs_bits)
+    bits.items([g for r in refs for g in r], ident_bits)
+    bits.items([content - least_offset for content in content_offsets], offset_bits)
+    bits.items([content - least_content for content in content_lengths], content_bits)
+    shared_offset = len(bits.getvalue())
+
+    group_lengths = [len(bodies[i]) for i in groups]
+    least_group = min(group_lengths)
+    group_bits = (max(group_lengths) - least_group).bit_length()
+    first_shared = plan.shared[0] if plan.shared else None
+    for value, nbits in (
+        (mapping[first_shared] if first_shared else 0, 32),
+        (offsets[first_shared] if first_shared else 0, 32),
+        (len(plan.first), 32),
+        (len(groups), 32),
+        (0, 16),  # every group holds a single object
+        (least_group, 32),
+        (group_bits, 16),
+    ):
+        bits.write(value, nbits)
+    bits.items([n - least_group for n in group_lengths], group_bits)
+    bits.items([0] * len(groups), 1)  # no MD5 signatures
+
+    tables = {"/S": shared_offset}
+    if plan.outlines:
+        tables["/O"] = len(bits.getvalue())
+        first_outline = plan.outlines[0]
+        bits.write(mapping[first_outline], 32)
+        bits.write(offsets[first_outline], 32)
+        bits.write(len(plan.outlines), 32)
+        bits.write(sum(len(bodies[i]) for i in plan.outlines), 32)
+    return bits.getvalue(), tables
+
+
+def linearize_reader(reader: PdfReader) -> bytes:
+    """Serialize ``reader``'s document as a linearized ("fast web view") PDF.
+
+    The catalog, the first page and everything it needs come first, behind a
+    linearization dictionary and a first-page cross-reference table, so a
+    viewer can render page 1 after reading only ``/E`` bytes. The reader's
+    objects are renumbered in place; do not reuse it afterwards.
+    """
+    if reader.is_encrypted:
+        raise ValueError("Encrypted PDFs cannot be linearized")
+    if not reader.pages:
+        raise ValueError("Cannot linearize a PDF without pages")
+    plan = _Plan(reader)
+
+    # Main section (1..m-1) in file order, then lin dict, catalog, hint, first page
+    main = [i for ids in plan.own[1:] for i in ids] + plan.shared + plan.other
+    m = len(main) + 1
+    lin_id, hint_id = m, m + 2
+    mapping = {old: new for new, old in enumerate(main, start=1)}
+    mapping[plan.root] = m + 1
+    mapping.update((old, new) for new, old in enumerate(plan.first, start=m + 3))
+    n = m + 3 + len(plan.first)
+
+    trailer_extra = io.BytesIO()
+    trailer_extra.write(f"/Root {m + 1} 0 R ".encode("ascii"))
+    if plan.info in mapping:
+        trailer_extra.write(f"/Info {mapping[plan.info]} 0 R ".encode("ascii"))
+    if "/ID" in reader.trailer:
+        trailer_extra.write(b"/ID ")
+        _renumber(reader.trailer["/ID"], mapping).write_to_stream(trailer_extra, None)
+        trailer_extra.write(b" ")
+
+    bodies: Dict[int, bytes] = {}
+    for old in [plan.root, *plan.first, *main]:
+        bodies[old] = _serialize(mapping[old], _renumber(plan.obj(old), mapping))
+
+    version = reader.pdf_header[5:] if reader.pdf_header.startswith("%PDF-1.") else "1.4"
+    header = f"%PDF-{max(version, '1.4')}\n".encode("ascii") + _HEADER_BINARY
+
+    def lin_dict(length: int, hint: Tuple[int, int], end: int, main_xref: int) -> bytes:
+        return (
+            f"{lin_id} 0 obj\n<< /Linearized 1 /L {_padded(length)}"
+            f" /H [ {_padded(hint[0])} {_padded(hint[1])} ] /O {mapping[plan.pages[0]]}"
+            f" /E {_padded(end)} /N {len(plan.pages)} /T {_padded(main_xref)} >>\nendobj\n"
+        ).encode("ascii")
+
+    def first_xref(entries: List[int], prev: int) -> bytes:
+        return (
+            f"xref\n{m} {n - m}\n".encode("ascii")
+            + _xref_entries(entries)
+            + f"trailer\n<< /Size {n} ".encode("ascii")
+            + trailer_extra.getvalue()
+            + f"/Prev {_padded(prev)} >>\nstartxref\n0\n%%EOF\n".encode("ascii")
+        )
+
+    # Pass 1: offsets without the hint stream (fixed-width fields keep sizes stable)
+    first_xref_offset = len(header) + len(lin_dict(0, (0, 0), 0, 0))
+    catalog_offset = first_xref_offset + len(first_xref([0] * (n - m), 0))
+    offsets: Dict[int, int] = {}
+    pos = catalog_offset + len(bodies[plan.root])
+    hint_offset = pos
+    for old in [*plan.first, *main]:
+        offsets[old] = pos
+        pos += len(bodies[old])
+    hint_data, tables = _hint_stream(plan, mapping, bodies, offsets)
+
+    compressed = zlib.compress(hint_data, 9)
+    hint_body = (
+        f"{hint_id} 0 obj\n<< /Filter /FlateDecode /Length {len(compressed)} "
+        + "".join(f"{key} {value} " for key, value in tables.items())
+        + ">>\nstream\n"
+    ).encode("ascii") + compressed + b"\nendstream\nendobj\n"
+
+    # Pass 2: real offsets
+    shift = len(hint_body)
+    real = {old: offset + shift for old, offset in offsets.items()}
+    end_of_first = real[plan.first[-1]] + len(bodies[plan.first[-1]])
+    main_xref = pos + shift
+    main_table = (
+        f"xref\n0 {m}\n".encode("ascii")
+        + b"0000000000 65535 f\r\n"
+        + _xref_entries([real[old] for old in main])
+        + f"trailer\n<< /Size {m} >>\n".encode("ascii")
+    )
+    tail = f"startxref\n{first_xref_offset}\n%%EOF\n".encode("ascii")
+    total = main_xref + len(main_table) + len(tail)
+    first_entries = [len(header), catalog_offset, hint_offset] + [real[old] for old in plan.first]
+
+    out = io.BytesIO()
+    out.write(header)
+    out.write(lin_dict(total, (hint_offset, len(hint_body)), end_of_first, main_xref + len(f"xref\n0 {m}")))
+    out.write(first_xref(first_entries, main_xref))
+    out.write(bodies[plan.root])
+    out.write(hint_body)
+    for old in [*plan.first, *main]:
+        out.write(bodies[old])
+    out.write(main_table)
+    out.write(tail)
+    return out.getvalue()
+
+
+def write_linearized(writer: PdfWriter, fh: BinaryIO) -> None:
+    """Write ``writer`` to ``fh`` as a linearized PDF."""
+    buf = io.BytesIO()
+    writer.write(buf)
+    buf.seek(0)
+    fh.write(linearize_reader(PdfReader(buf)))
+
+
+def linearize_file(path: Path) -> None:
+    """Rewrite a PDF on disk as a linearized PDF (atomically)."""
+    with open_input(path) as src:
+        data = linearize_reader(PdfReader(src))
+    with atomic_writer(path) as fh:
+        fh.write(data)
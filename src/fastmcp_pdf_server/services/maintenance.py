@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from ..config import settings
+from ..utils.logger import get_logger
+from .file_manager import SweepStats, sweep
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MaintenanceMetrics:
+    runs: int = 0
+    skipped: int = 0
+    errors: int = 0
+    last_run: Optional[float] = None
+    last_duration_ms: Optional[int] = None
+    expired_files: int = 0
+    expired_bytes: int = 0
+    evicted_files: int = 0
+    evicted_bytes: int = 0
+    temp_bytes: Optional[int] = None
+    pinned_bytes: Optional[int] = None
+
+
+class MaintenanceScheduler:
+    """Runs temp-store expiry and quota eviction on a timer, off the request path.
+
+    Every worker process may run a scheduler; the sweep lock in file_manager
+    makes sure only one of them sweeps at a time.
+    """
+
+    def __init__(self, interval_seconds: Optional[float] = None) -> None:
+        self.interval_seconds = interval_seconds
+        self.metrics = MaintenanceMetrics()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> Optional[SweepStats]:
+        quota = settings.temp_quota_mb * 1024 * 1024
+        start = time.perf_counter()
+        try:
+            stats = sweep(quota_bytes=quota or None)
+        except Exception as exc:  # noqa: BLE001
+            with self._lock:
+                self.metrics.errors += 1
+            logger.error("maintenance sweep failed: %s", exc)
+            return None
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        with self._lock:
+            m = self.metrics
+            m.last_run = time.time()
+            m.last_duration_ms = duration_ms
+            if stats is None:
+                m.skipped += 1
+                return None
+            m.runs += 1
+            m.expired_files += stats.expired_files
+            m.expired_bytes += stats.expired_bytes
+            m.evicted_files += stats.evicted_files
+            m.evicted_bytes += stats.evicted_bytes
+            m.temp_bytes = stats.remaining_bytes
+            m.pinned_bytes = stats.pinned_bytes
+        if stats.expired_files or stats.evicted_files:
+            logger.info(
+                "maintenance reclaimed expired=%d/%dB evicted=%d/%dB remaining=%dB quota=%dB ms=%d",
+                stats.expired_files,
+                stats.expired_bytes,
+                stats.evicted_files,
+                stats.evicted_bytes,
+                stats.remaining_bytes,
+                quota,
+                duration_ms,
+            )
+        return stats
+
+    def _loop(self) -> None:
+        interval = self.interval_seconds or settings.maintenance_interval_seconds
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(interval)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="temp-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = asdict(self.metrics)
+        data.update(
+            running=self.running,
+            interval_seconds=self.interval_seconds or settings.maintenance_interval_seconds,
+            quota_bytes=settings.temp_quota_mb * 1024 * 1024,
+        )
+        return data
+
+
+scheduler = MaintenanceScheduler()
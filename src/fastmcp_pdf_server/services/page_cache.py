@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, PdfObject, StreamObject
+
+from ..config import settings
+from ..utils.logger import get_logger
+from ..utils.tracing import span
+from .file_manager import atomic_writer, open_input, temp_dir, touch_access
+from .text_engines import TextDocument, TextEngine
+
+
+logger = get_logger(__name__)
+
+CACHE_DIR = ".cache"
+PAGE_TEXT_DIR = "page_text"
+# Bump when the fingerprint recipe changes so old entries are ignored.
+FINGERPRINT_VERSION = 1
+# Page keys that affect extracted text besides the content stream.
+LAYOUT_KEYS = ("/MediaBox", "/CropBox", "/Rotate")
+# Without a trailer /ID, documents are keyed by the fingerprints of this many
+# leading pages plus the page count.
+KEY_FINGERPRINT_PAGES = 3
+
+
+def _token(value: PdfObject, memo: Dict[Tuple[int, int], bytes]) -> bytes:
+    """Stable digest of a PDF object graph, independent of object numbering.
+
+    Indirect objects are hashed once per document (fonts and images are shared
+    by many pages). /Parent links are skipped so a page never hashes the page
+    tree, and cycles hash to a placeholder.
+    """
+    if isinstance(value, IndirectObject):
+        key = (value.idnum, value.generation)
+        if key not in memo:
+            memo[key] = b"cycle"
+            memo[key] = _token(value.get_object(), memo)
+        return memo[key]
+    if isinstance(value, DictionaryObject):
+        h = hashlib.sha256(b"S" if isinstance(value, StreamObject) else b"D")
+        for key in sorted(value):
+            if key in ("/Parent", "/Length"):
+                continue
+            h.update(key.encode("latin-1"))
+            h.update(_token(value.raw_get(key), memo))
+        if isinstance(value, StreamObject):
+            data = value._data
+            h.update(data.encode("latin-1") if isinstance(data, str) else data)
+        return h.digest()
+    if isinstance(value, ArrayObject):
+        h = hashlib.sha256(b"A")
+        for item in value:
+            h.update(_token(item, memo))
+        return h.digest()
+    return repr(value).encode("utf-8", "replace") + b"|"
+
+
+def page_fingerprint(page: DictionaryObject, memo: Dict[Tuple[int, int], bytes]) -> str:
+    """Hex fingerprint of a page's content streams, resources and geometry."""
+    h = hashlib.sha256(b"page-v%d" % FINGERPRINT_VERSION)
+    for key in ("/Contents", "/Resources", *LAYOUT_KEYS):
+        h.update(key.encode("latin-1"))
+        if key in page:
+            h.update(_token(page.raw_get(key), memo))
+    return h.hexdigest()
+
+
+def document_key(reader: PdfReader, memo: Optional[Dict[Tuple[int, int], bytes]] = None) -> str:
+    """Revisions of one document share the first trailer /ID; without one the
+    key is derived from the content (page count and leading page fingerprints),
+    so unrelated files with the same name never share cache entries."""
+    try:
+        ids = reader.trailer.get("/ID")
+        if ids:
+            first = ids[0]
+            raw = first.original_bytes if hasattr(first, "original_bytes") else str(first).encode("latin-1")
+            if raw:
+                return "id:" + raw.hex()
+    except Exception:  # noqa: BLE001
+        pass
+    memo = {} if memo is None else memo
+    page_count = len(reader.pages)
+    h = hashlib.sha256(b"pages:%d" % page_count)
+    for index in range(min(page_count, KEY_FINGERPRINT_PAGES)):
+        h.update(page_fingerprint(reader.pages[index], memo).encode("ascii"))
+    return "fp:" + h.hexdigest()
+
+
+def _cache_path(doc_key: str, engine: str) -> Path:
+    digest = hashlib.sha1(f"{doc_key}\0{engine}".encode("utf-8")).hexdigest()
+    return temp_dir() / CACHE_DIR / PAGE_TEXT_DIR / f"{digest}.json"
+
+
+class CachedDocument:
+    """TextDocument that serves unchanged pages from the page-text cache.
+
+    The engine document is opened only on the first cache miss, so a revision
+    with no changed pages is answered without running the extractor at all.
+    """
+
+    def __init__(self, engine: TextEngine, pdf_path: Path, reader: PdfReader, stack: ExitStack) -> None:
+        self._engine = engine
+        self._path = pdf_path
+        self._reader = reader
+        self._stack = stack
+        self._doc: Optional[TextDocument] = None
+        self._memo: Dict[Tuple[int, int], bytes] = {}
+        self.page_count = len(reader.pages)
+        self.doc_key = document_key(reader, self._memo)
+        self.cache_file = _cache_path(self.doc_key, engine.name)
+        self._pages: Dict[str, str] = {}
+        self._texts: Dict[str, str] = {}
+        self._dirty = False
+        self.changed_pages: List[int] = []
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        # Quota eviction is LRU over outputs and caches alike
+        touch_access(self.cache_file)
+        if data.get("version") == FINGERPRINT_VERSION:
+            self._pages = data.get("pages", {})
+            self._texts = data.get("texts", {})
+
+    def fingerprint(self, page_no: int) -> str:
+        with span("fingerprint", page=page_no):
+            return page_fingerprint(self._reader.pages[page_no - 1], self._memo)
+
+    def extract_page(self, page_no: int) -> str:
+        fp = self.fingerprint(page_no)
+        if self._pages.get(str(page_no)) != fp:
+            self._pages[str(page_no)] = fp
+            self._dirty = True
+        text = self._texts.get(fp)
+        if text is None:
+            if self._doc is None:
+                self._doc = self._stack.enter_context(self._engine.open(self._path))
+            text = self._doc.extract_page(page_no)
+            self._texts[fp] = text
+            self.changed_pages.append(page_no)
+            self._dirty = True
+        return text
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        # Keep only texts still referenced by some page of the latest revision
+        pages = {p: fp for p, fp in self._pages.items() if int(p) <= self.page_count}
+        live = set(pages.values())
+        payload = {
+            "version": FINGERPRINT_VERSION,
+            "doc_key": self.doc_key,
+            "engine": self._engine.name,
+            "pages": pages,
+            "texts": {fp: t for fp, t in self._texts.items() if fp in live},
+        }
+        try:
+            with atomic_writer(self.cache_file) as fh:
+                fh.write(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        except OSError as e:
+            logger.warning("page text cache write failed for %s: %s", self._path, e)
+
+
+@contextmanager
+def open_cached(engine: TextEngine, pdf_path: Path, use_cache: Optional[bool] = None) -> Iterator[TextDocument]:
+    """Open ``pdf_path`` for extraction, through the page-text cache when enabled.
+
+    ``use_cache`` overrides the PAGE_TEXT_CACHE setting for one call. The
+    yielded document has ``changed_pages`` (pages that had to be extracted)
+    only when the cache is used.
+    """
+    enabled = settings.page_text_cache if use_cache is None else use_cache
+    if not enabled:
+        with engine.open(pdf_path) as doc:
+            yield doc
+        return
+    with ExitStack() as stack:
+        src = stack.enter_context(open_input(pdf_path))
+        with span("parse", engine="pypdf2"):
+            reader = PdfReader(src)
+        doc = CachedDocument(engine, pdf_path, reader, stack)
+        yield doc
+        doc.save()
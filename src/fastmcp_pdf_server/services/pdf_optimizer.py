@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    EncodedStreamObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    NumberObject,
+    PdfObject,
+    StreamObject,
+)
+
+from .file_manager import atomic_writer, open_input
+
+
+# Dictionary types that may safely be shared between pages once identical.
+SHAREABLE_TYPES = {"/Font", "/FontDescriptor", "/ExtGState", "/Encoding", "/XObject", "/Pattern"}
+# Deduplicating a font dict can make its parent identical too; bound the passes.
+MAX_DEDUPE_PASSES = 4
+# Images are only resampled when they exceed the target DPI by this factor.
+DPI_TOLERANCE = 1.05
+# Filters that decode to raw bytes without loss and can be replaced by Flate.
+LOSSLESS_FILTERS = {"/FlateDecode", "/ASCII85Decode", "/ASCIIHexDecode", "/LZWDecode"}
+
+
+@dataclass
+class OptimizeStats:
+    streams_recompressed: int = 0
+    recompressed_bytes_saved: int = 0
+    objects_deduplicated: int = 0
+    dedupe_bytes_saved: int = 0
+    images_downsampled: int = 0
+    image_bytes_saved: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _replace(writer: PdfWriter, idnum: int, obj: PdfObject) -> None:
+    writer._objects[idnum - 1] = obj
+    obj.indirect_reference = IndirectObject(idnum, 0, writer)
+
+
+def _stream_copy(src: StreamObject, data: bytes, drop: tuple = ()) -> EncodedStreamObject:
+    new = EncodedStreamObject()
+    for key, value in src.items():
+        if key not in ("/Filter", "/DecodeParms", "/Length", *drop):
+            new[NameObject(key)] = value
+    new._data = data
+    return new
+
+
+def _filters(obj: StreamObject) -> List[str]:
+    filt = obj.get("/Filter")
+    if isinstance(filt, ArrayObject):
+        return [str(f) for f in filt]
+    return [str(filt)] if filt is not None else []
+
+
+def _raw_bytes(obj: StreamObject) -> Optional[bytes]:
+    """Decoded stream bytes, or None when the filters are lossy or parameterized."""
+    if "/DecodeParms" in obj or not set(_filters(obj)) <= LOSSLESS_FILTERS:
+        return None
+    try:
+        data = obj.get_data()
+    except Exception:  # noqa: BLE001
+        return None
+    return data.encode("latin-1") if isinstance(data, str) else data
+
+
+def recompress_streams(writer: PdfWriter, stats: OptimizeStats, level: int = 9) -> None:
+    """Re-encode raw, ASCII-armoured and Flate/LZW streams as Flate at ``level``.
+
+    Image codecs (DCT, JPX, CCITT, JBIG2) and predictor parameters are left
+    alone, as is XMP metadata (kept readable for non-PDF tools).
+    """
+    for idx, obj in enumerate(writer._objects):
+        if not isinstance(obj, StreamObject) or obj.get("/Type") == "/Metadata":
+            continue
+        raw = _raw_bytes(obj)
+        if raw is None:
+            continue
+        packed = zlib.compress(raw, level)
+        if len(packed) >= len(obj._data):
+            continue
+        new = _stream_copy(obj, packed)
+        new[NameObject("/Filter")] = NameObject("/FlateDecode")
+        stats.streams_recompressed += 1
+        stats.recompressed_bytes_saved += len(obj._data) - len(packed)
+        _replace(writer, idx + 1, new)
+
+
+def _shareable(obj: PdfObject) -> bool:
+    if isinstance(obj, StreamObject):
+        return True
+    if isinstance(obj, DictionaryObject):
+        return obj.get("/Type") in SHAREABLE_TYPES
+    return isinstance(obj, ArrayObject)
+
+
+def _remap(
+    value: PdfObject, mapping: Dict[int, int], writer: PdfWriter, visited: set[int]
+) -> PdfObject:
+    if isinstance(value, IndirectObject):
+        if value.pdf is writer and value.idnum in mapping:
+            return IndirectObject(mapping[value.idnum], 0, writer)
+        return value
+    # Cloned outlines can hold direct objects that refer back to each other
+    if id(value) in visited:
+        return value
+    visited.add(id(value))
+    if isinstance(value, DictionaryObject):
+        for key in list(value.keys()):
+            value[key] = _remap(value.raw_get(key), mapping, writer, visited)
+    elif isinstance(value, ArrayObject):
+        for i, item in enumerate(value):
+            value[i] = _remap(item, mapping, writer, visited)
+    return value
+
+
+def _digest(obj: PdfObject, payloads: Dict[int, bytes], idnum: int) -> tuple[bytes, int]:
+    """Content hash and serialized size of an object.
+
+    A stream's payload is hashed once and reused across passes: remapping only
+    rewrites references in the stream dictionary, never the data.
+    """
+    if isinstance(obj, StreamObject):
+        data = obj._data
+        if idnum not in payloads:
+            raw = data.encode("latin-1") if isinstance(data, str) else data
+            payloads[idnum] = hashlib.sha256(raw).digest()
+        head = io.BytesIO()
+        DictionaryObject(obj).write_to_stream(head, None)
+        return hashlib.sha256(b"stream" + head.getvalue() + payloads[idnum]).digest(), head.tell() + len(data)
+    buf = io.BytesIO()
+    obj.write_to_stream(buf, None)
+    return hashlib.sha256(buf.getvalue()).digest(), buf.tell()
+
+
+def dedupe_objects(writer: PdfWriter, stats: OptimizeStats) -> None:
+    """Merge byte-identical streams (fonts, images, ICC profiles, content) and
+    shareable dictionaries into a single object.
+
+    Duplicates are re-pointed to the first copy and replaced by ``null``, so
+    object numbers stay valid. Pages, annotations and the catalog are never
+    merged.
+    """
+    protected = {ref.idnum for ref in (writer._root, writer._info, writer._pages) if ref is not None}
+    payloads: Dict[int, bytes] = {}
+    for _ in range(MAX_DEDUPE_PASSES):
+        seen: Dict[bytes, int] = {}
+        mapping: Dict[int, int] = {}
+        sizes: Dict[int, int] = {}
+        for idx, obj in enumerate(writer._objects):
+            idnum = idx + 1
+            if idnum in protected or obj is None or not _shareable(obj):
+                continue
+            digest, size = _digest(obj, payloads, idnum)
+            if digest in seen:
+                mapping[idnum] = seen[digest]
+                sizes[idnum] = size
+            else:
+                seen[digest] = idnum
+        if not mapping:
+            return
+        visited: set[int] = set()
+        for obj in [*writer._objects, writer._root_object]:
+            if obj is not None:
+                _remap(obj, mapping, writer, visited)
+        for idnum in mapping:
+            _replace(writer, idnum, NullObject())
+            stats.objects_deduplicated += 1
+            stats.dedupe_bytes_saved += sizes[idnum]
+
+
+def _decode_image(img: StreamObject) -> Optional[Image.Image]:
+    if any(key in img for key in ("/SMask", "/Mask", "/ImageMask", "/Decode")):
+        return None
+    if img.get("/BitsPerComponent") != 8:
+        return None
+    if _filters(img) == ["/DCTDecode"]:
+        pil = Image.open(io.BytesIO(img._data))
+        return pil if pil.mode in ("RGB", "L") else None
+    mode = {"/DeviceRGB": "RGB", "/DeviceGray": "L"}.get(str(img.get("/ColorSpace")))
+    raw = _raw_bytes(img) if mode else None
+    if raw is None:
+        return None
+    return Image.frombytes(mode, (int(img["/Width"]), int(img["/Height"])), raw)
+
+
+def downsample_images(
+    writer: PdfWriter, stats: OptimizeStats, target_dpi: int, jpeg_quality: int = 75
+) -> None:
+    """Resample page images above ``target_dpi`` and re-encode them as JPEG.
+
+    The effective DPI assumes the image spans the page, which under-estimates
+    images drawn smaller than the page, so images are never over-reduced.
+    Masked, CMYK, indexed and non 8-bit images are skipped.
+    """
+    done: set[int] = set()
+    for page in writer.pages:
+        resources = page.get("/Resources")
+        xobjects = resources.get_object().get("/XObject") if resources is not None else None
+        if xobjects is None:
+            continue
+        width_in = float(page.mediabox.width) / 72 or 1.0
+        height_in = float(page.mediabox.height) / 72 or 1.0
+        for ref in xobjects.get_object().values():
+            if not isinstance(ref, IndirectObject) or ref.idnum in done:
+                continue
+            done.add(ref.idnum)
+            img = ref.get_object()
+            if not isinstance(img, StreamObject) or img.get("/Subtype") != "/Image":
+                continue
+            try:
+                pil = _decode_image(img)
+            except Exception:  # noqa: BLE001
+                continue
+            if pil is None:
+                continue
+            dpi = max(pil.width / width_in, pil.height / height_in)
+            if dpi <= target_dpi * DPI_TOLERANCE:
+                continue
+            scale = target_dpi / dpi
+            size = (max(1, round(pil.width * scale)), max(1, round(pil.height * scale)))
+            out = io.BytesIO()
+            pil.resize(size, Image.LANCZOS).save(out, format="JPEG", quality=jpeg_quality, optimize=True)
+            data = out.getvalue()
+            if len(data) >= len(img._data):
+                continue
+            new = _stream_copy(img, data, drop=("/Width", "/Height", "/ColorSpace", "/BitsPerComponent"))
+            new[NameObject("/Width")] = NumberObject(size[0])
+            new[NameObject("/Height")] = NumberObject(size[1])
+            new[NameObject("/ColorSpace")] = NameObject("/DeviceRGB" if pil.mode == "RGB" else "/DeviceGray")
+            new[NameObject("/BitsPerComponent")] = NumberObject(8)
+            new[NameObject("/Filter")] = NameObject("/DCTDecode")
+            stats.images_downsampled += 1
+            stats.image_bytes_saved += len(img._data) - len(data)
+            _replace(writer, ref.idnum, new)
+
+
+def optimize_writer(
+    writer: PdfWriter,
+    target_dpi: Optional[int] = None,
+    jpeg_quality: int = 75,
+    dedupe: bool = True,
+) -> OptimizeStats:
+    """Optimize a writer in place before it is written.
+
+    Lossless steps (stream recompression, duplicate merging) always run; image
+    downsampling only when ``target_dpi`` is given.
+    """
+    stats = OptimizeStats()
+    if target_dpi:
+        downsample_images(writer, stats, target_dpi, jpeg_quality)
+    recompress_streams(writer, stats)
+    if dedupe:
+        dedupe_objects(writer, stats)
+    return stats
+
+
+def writer_from_reader(reader: PdfReader, pages: Optional[List[int]] = None) -> PdfWriter:
+    """Copy pages (all, or 0-based ``pages``), outline and document info into a new writer."""
+    writer = PdfWriter()
+    writer.append(reader, pages=pages)
+    if reader.metadata:
+        writer.add_metadata({k: v for k, v in reader.metadata.items() if isinstance(k, str)})
+    return writer
+
+
+def optimize_file(path: Path) -> OptimizeStats:
+    """Losslessly optimize a PDF on disk, replacing it only if it got smaller."""
+    with open_input(path) as src:
+        writer = writer_from_reader(PdfReader(src))
+        stats = optimize_writer(writer)
+        buf = io.BytesIO()
+        writer.write(buf)
+    if buf.tell() < path.stat().st_size:
+        with atomic_writer(path) as fh:
+            fh.write(buf.getvalue())
+    return stats
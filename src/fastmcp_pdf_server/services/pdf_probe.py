@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PyPDF2 import PdfReader
+
+from ..utils.files import file_identity
+from ..utils.validators import preflight_pdf
+from .file_manager import open_input
+
+# Bytes scanned at the start of the file for the header and linearization dict.
+HEAD_BYTES = 1024
+# Probes kept per process, keyed by file identity (least recently used dropped first).
+PROBE_CACHE_SIZE = 512
+
+INFO_KEYS = {
+    "title": "/Title",
+    "author": "/Author",
+    "creator": "/Creator",
+    "producer": "/Producer",
+    "creation_date": "/CreationDate",
+    "mod_date": "/ModDate",
+}
+
+
+@dataclass
+class PdfProbe:
+    path: Path
+    file_size: int
+    pdf_version: Optional[str]
+    page_count: Optional[int]
+    encrypted: bool
+    linearized: bool
+    info: Dict[str, Any] = field(default_factory=dict)
+    # "trailer" when /Count was read from the root Pages node, "full" after a page-tree walk.
+    method: str = "trailer"
+
+
+def _read_head(path: Path) -> bytes:
+    with path.open("rb") as fh:
+        return fh.read(HEAD_BYTES)
+
+
+def _header_version(head: bytes) -> Optional[str]:
+    if not head.startswith(b"%PDF-"):
+        return None
+    return head[:8].decode("latin-1")
+
+
+def _info_dict(reader: PdfReader) -> Dict[str, Any]:
+    info = reader.metadata or {}
+    return {key: getattr(info, key, None) or info.get(pdf_key) for key, pdf_key in INFO_KEYS.items()}
+
+
+def _count_from_root(reader: PdfReader) -> int:
+    pages = reader.trailer["/Root"].get_object()["/Pages"].get_object()
+    count = pages["/Count"]
+    if not isinstance(count, int) or count < 0:
+        raise ValueError(f"Invalid /Count in root Pages node: {count!r}")
+    return int(count)
+
+
+def _full_page_count(path: Path) -> Optional[int]:
+    try:
+        with open_input(path) as src:
+            return len(PdfReader(src).pages)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+_probe_cache: "OrderedDict[Tuple, PdfProbe]" = OrderedDict()
+_probe_lock = threading.Lock()
+
+
+def probe_pdf(path: Path) -> PdfProbe:
+    """Read header, trailer and Info dictionary without loading any page.
+
+    The page count comes from ``/Count`` on the root Pages node, so the cost does
+    not grow with the number of pages. The reader works on a mapped input and
+    only resolves the objects it needs. If the trailer or the Pages node is
+    malformed, the page tree is walked with a full parse instead. Results are
+    cached per file identity until the file changes.
+    """
+    key = file_identity(path)
+    with _probe_lock:
+        cached = _probe_cache.get(key)
+        if cached is not None:
+            _probe_cache.move_to_end(key)
+    if cached is None:
+        cached = _probe(path)
+        with _probe_lock:
+            _probe_cache[key] = cached
+            while len(_probe_cache) > PROBE_CACHE_SIZE:
+                _probe_cache.popitem(last=False)
+    return replace(cached, path=path, info=dict(cached.info))
+
+
+def _probe(path: Path) -> PdfProbe:
+    size = path.stat().st_size
+    head = _read_head(path)
+    try:
+        linearized = preflight_pdf(path).linearized
+    except ValueError:
+        # Broken tail: PyPDF2 may still recover the document, or the full parse below
+        linearized = False
+    version = _header_version(head)
+
+    with open_input(path) as fh:
+        try:
+            reader = PdfReader(fh)
+            encrypted = reader.is_encrypted
+        except Exception:  # noqa: BLE001
+            return PdfProbe(
+                path=path,
+                file_size=size,
+                pdf_version=version,
+                page_count=_full_page_count(path),
+                encrypted=False,
+                linearized=linearized,
+                info={key: None for key in INFO_KEYS},
+                method="full",
+            )
+        try:
+            info = _info_dict(reader)
+        except Exception:  # noqa: BLE001
+            # Encrypted Info strings cannot be read without the user password.
+            info = {key: None for key in INFO_KEYS}
+        try:
+            page_count: Optional[int] = _count_from_root(reader)
+            method = "trailer"
+        except Exception:  # noqa: BLE001
+            page_count = None
+            method = "full"
+
+    if page_count is None:
+        page_count = _full_page_count(path)
+
+    return PdfProbe(
+        path=path,
+        file_size=size,
+        pdf_version=version,
+        page_count=page_count,
+        encrypted=encrypted,
+        linearized=linearized,
+        info=info,
+        method=method,
+    )
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import io
+import shutil
+from contextlib import ExitStack
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, List, Optional
 
-import pdfplumber
-from PyPDF2 import PdfReader
+from PyPDF2 import PdfReader, PdfWriter
 
-from ..utils.parsers import clamp_pages, parse_page_range
-from ..utils.validators import validate_pdf
+from .file_manager import atomic_writer, ensure_within_temp, open_input
+from .incremental import append_update, supports_incremental
+from .linearizer import write_linearized
+from .page_cache import open_cached
+from .pdf_optimizer import OptimizeStats, dedupe_objects, optimize_writer, writer_from_reader
+from .pdf_probe import probe_pdf
+from .text_engines import get_engine
+from ..utils.parsers import PageSelection, clamp_pages, select_pages
+from ..utils.tracing import span
+from ..utils.validators import preflight_pdf, validate_pdf
 
 
 @dataclass
@@ -16,16 +26,32 @@ class TextExtractionResult:
     text: str
     page_count: int
     char_count: int
+    engine: str = "pdfplumber"
+    # Pages re-extracted because their fingerprint was not cached (None without cache)
+    changed_pages: Optional[List[int]] = None
 
 
-def extract_text(file_path: str, encoding: str = "utf-8") -> TextExtractionResult:
+def extract_text(
+    file_path: str,
+    encoding: str = "utf-8",
+    engine: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+) -> TextExtractionResult:
     pdf_path = validate_pdf(file_path)
-    with pdfplumber.open(str(pdf_path)) as pdf:
+    text_engine = get_engine(engine, pdf_path)
+    with open_cached(text_engine, pdf_path, use_cache) as doc:
         texts: List[str] = []
-        for page in pdf.pages:
-            texts.append(page.extract_text() or "")
+        for pno in range(1, doc.page_count + 1):
+            with span("page", page=pno):
+                texts.append(doc.extract_page(pno))
         text = "\n".join(texts)
-    return TextExtractionResult(text=text, page_count=len(texts), char_count=len(text))
+    return TextExtractionResult(
+        text=text,
+        page_count=len(texts),
+        char_count=len(text),
+        engine=text_engine.name,
+        changed_pages=getattr(doc, "changed_pages", None),
+    )
 
 
 def extract_text_by_page(
@@ -33,48 +59,90 @@ def extract_text_by_page(
     pages: Optional[List[int]] = None,
     page_range: Optional[str] = None,
     encoding: str = "utf-8",
+    engine: Optional[str] = None,
+    use_cache: Optional[bool] = None,
 ) -> List[dict]:
     pdf_path = validate_pdf(file_path)
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        max_page = len(pdf.pages)
-        selected: List[int]
+    text_engine = get_engine(engine, pdf_path)
+    with open_cached(text_engine, pdf_path, use_cache) as doc:
         if pages:
-            selected = clamp_pages(pages, max_page)
-        elif page_range:
-            selected = clamp_pages(parse_page_range(page_range), max_page)
+            # Explicit page lists keep the caller's order and repeats
+            selected: Iterable[int] = clamp_pages(pages, doc.page_count)
         else:
-            selected = list(range(1, max_page + 1))
+            selected = select_pages(doc.page_count, None, page_range)
 
         results: List[dict] = []
         for pno in selected:
-            page = pdf.pages[pno - 1]
-            text = page.extract_text() or ""
+            with span("page", page=pno):
+                text = doc.extract_page(pno)
             results.append({"page": pno, "text": text, "char_count": len(text)})
-        return results
+        changed = getattr(doc, "changed_pages", None)
+    if changed is not None:
+        changed_set = set(changed)
+        for item in results:
+            item["changed"] = item["page"] in changed_set
+    return results
 
 
 def extract_metadata(file_path: str) -> dict:
     pdf_path = validate_pdf(file_path)
-    reader = PdfReader(str(pdf_path))
-    info = reader.metadata or {}
+    probe = probe_pdf(pdf_path)
     meta = {
-        "title": getattr(info, "title", None) or info.get("/Title"),
-        "author": getattr(info, "author", None) or info.get("/Author"),
-        "creator": getattr(info, "creator", None) or info.get("/Creator"),
-        "producer": getattr(info, "producer", None) or info.get("/Producer"),
-        "creation_date": getattr(info, "creation_date", None) or info.get("/CreationDate"),
-        "mod_date": getattr(info, "mod_date", None) or info.get("/ModDate"),
-        "page_count": len(reader.pages),
-        "encrypted": reader.is_encrypted,
-        "pdf_version": getattr(reader, "pdf_header", None),
-        "file_size": pdf_path.stat().st_size,
+        **probe.info,
+        "page_count": probe.page_count,
+        "encrypted": probe.encrypted,
+        "linearized": probe.linearized,
+        "pdf_version": probe.pdf_version,
+        "file_size": probe.file_size,
     }
     return meta
 
 
-def merge_pdfs(input_files: list[str], output_path: str) -> dict:
-    from PyPDF2 import PdfMerger
-
+def _write_pdf(
+    writer: PdfWriter,
+    out: Path,
+    optimize: bool = False,
+    dedupe: bool = False,
+    linearize: bool = False,
+) -> Optional[dict]:
+    """Write ``writer`` to ``out``; with ``optimize`` run the lossless optimizer first
+    (``dedupe`` alone only merges duplicate objects) and return its stats.
+    ``linearize`` lays the file out for fast web view.
+
+    The file is replaced atomically, never truncated in place: ``out`` may be
+    an input that other requests still have mapped.
+    """
+    stats = None
+    if optimize:
+        with span("optimize"):
+            stats = optimize_writer(writer)
+    elif dedupe:
+        stats = OptimizeStats()
+        with span("dedupe"):
+            dedupe_objects(writer, stats)
+    with atomic_writer(out) as f:
+        if linearize:
+            with span("linearize"):
+                write_linearized(writer, f)
+        else:
+            writer.write(f)
+    return stats.as_dict() if stats is not None else None
+
+
+def merge_pdfs(
+    input_files: list[str],
+    output_path: str,
+    optimize: bool = False,
+    dedupe: bool = True,
+    linearize: bool = False,
+) -> dict:
+    """Concatenate PDFs into ``output_path``.
+
+    Inputs that embed the same fonts, images or ICC profiles carry one copy
+    each; ``dedupe`` (on by default) keeps a single copy of every identical
+    stream or resource dictionary in the output. ``optimize`` also
+    recompresses streams; ``linearize`` writes a fast-web-view file.
+    """
     if not input_files:
         raise ValueError("input_files cannot be empty")
     pdf_paths = [validate_pdf(p) for p in input_files]
@@ -84,104 +152,240 @@ def merge_pdfs(input_files: list[str], output_path: str) -> dict:
     # (output may be similar to sum of inputs); adjust if needed
     # Raises if any single file exceeded earlier.
 
-    merger = PdfMerger()
+    writer = PdfWriter()
     total_pages = 0
-    for p in pdf_paths:
-        reader = PdfReader(str(p))
-        total_pages += len(reader.pages)
-        merger.append(str(p))
-
     out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    with out.open("wb") as f:
-        merger.write(f)
-    merger.close()
-    return {
+    with ExitStack() as stack:
+        # Inputs stay mapped until the write: the writer resolves objects lazily
+        for p in pdf_paths:
+            reader = PdfReader(stack.enter_context(open_input(p)))
+            total_pages += len(reader.pages)
+            writer.append(reader)
+        stats = _write_pdf(writer, out, optimize, dedupe, linearize)
+    result = {
         "output_path": str(out.resolve()),
         "total_pages": total_pages,
         "output_size": out.stat().st_size,
         "inputs": [str(p) for p in input_files],
+        "linearized": linearize,
     }
-
-
-def split_pdf(file_path: str, split_ranges: list[dict]) -> list[dict]:
-    from PyPDF2 import PdfWriter
-
+    if stats is not None:
+        result["input_size"] = total_input_size
+        result["dedupe"] = {
+            "objects_deduplicated": stats["objects_deduplicated"],
+            "bytes_saved": stats["dedupe_bytes_saved"],
+        }
+    if optimize:
+        result["optimization"] = stats
+    return result
+
+
+def _pages_selection(value: object, max_page: int) -> PageSelection:
+    """A ``pages`` value: a page expression or, as sent in JSON, a list of page numbers."""
+    if isinstance(value, (list, tuple)):
+        return PageSelection.from_pages([int(p) for p in value], max_page)
+    return PageSelection.parse(str(value), max_page)
+
+
+def _range_selection(spec: dict, max_page: int) -> PageSelection:
+    """A split range is either ``pages`` (expression or list) or ``start_page``/``end_page``."""
+    if spec.get("pages"):
+        sel = _pages_selection(spec["pages"], max_page)
+        if not sel:
+            raise ValueError(f"Empty split range: {spec['pages']}")
+        return sel
+    s = int(spec.get("start_page"))
+    e = int(spec.get("end_page"))
+    if s < 1 or e < s or e > max_page:
+        raise ValueError(f"Invalid split range: {s}-{e}")
+    return PageSelection.from_range(s, e, max_page)
+
+
+def split_pdf(
+    file_path: str, split_ranges: list[dict], optimize: bool = False, linearize: bool = False
+) -> list[dict]:
     if not split_ranges:
         raise ValueError("split_ranges cannot be empty")
     pdf_path = validate_pdf(file_path)
-    reader = PdfReader(str(pdf_path))
-    max_page = len(reader.pages)
-
-    # Check overlaps
-    seen: set[int] = set()
-    for r in split_ranges:
-        s = int(r.get("start_page"))
-        e = int(r.get("end_page"))
-        if s < 1 or e < s or e > max_page:
-            raise ValueError(f"Invalid split range: {s}-{e}")
-        for p in range(s, e + 1):
-            if p in seen:
-                raise ValueError(f"Overlapping page in ranges: {p}")
-            seen.add(p)
-
-    results: list[dict] = []
-    for r in split_ranges:
-        s = int(r.get("start_page"))
-        e = int(r.get("end_page"))
-        output_path = r.get("output_path")
-        if not output_path:
-            raise ValueError("Each range must include output_path")
-
-        writer = PdfWriter()
-        for p in range(s - 1, e):
-            writer.add_page(reader.pages[p])
-        out = Path(output_path)
-        out.parent.mkdir(parents=True, exist_ok=True)
-        with out.open("wb") as f:
-            writer.write(f)
-        results.append({
-            "output_path": str(out.resolve()),
-            "pages": e - s + 1,
-            "output_size": out.stat().st_size,
-        })
+    with open_input(pdf_path) as src:
+        reader = PdfReader(src)
+        max_page = len(reader.pages)
+
+        # Check overlaps without expanding the ranges
+        selections: list[PageSelection] = []
+        for r in split_ranges:
+            sel = _range_selection(r, max_page)
+            for prev in selections:
+                common = prev.first_common(sel)
+                if common is not None:
+                    raise ValueError(f"Overlapping page in ranges: {common}")
+            selections.append(sel)
+
+        results: list[dict] = []
+        for r, sel in zip(split_ranges, selections):
+            output_path = r.get("output_path")
+            if not output_path:
+                raise ValueError("Each range must include output_path")
+
+            writer = PdfWriter()
+            for p in sel:
+                writer.add_page(reader.pages[p - 1])
+            out = Path(output_path)
+            stats = _write_pdf(writer, out, optimize, linearize=linearize)
+            item = {
+                "output_path": str(out.resolve()),
+                "pages": len(sel),
+                "output_size": out.stat().st_size,
+                "linearized": linearize,
+            }
+            if stats is not None:
+                item["optimization"] = stats
+            results.append(item)
 
     return results
 
 
-def rotate_pages(file_path: str, rotations: list[dict], output_path: str) -> dict:
-    from PyPDF2 import PdfReader, PdfWriter
-
+def rotate_pages(
+    file_path: str,
+    rotations: list[dict],
+    output_path: Optional[str] = None,
+    incremental: bool = False,
+    in_place: bool = False,
+    optimize: bool = False,
+    linearize: bool = False,
+) -> dict:
+    """Rotate pages and write the result.
+
+    With ``incremental=True`` only the rotated page objects and a new xref
+    section are appended to a copy of the original, so output cost scales with
+    the number of rotated pages. ``in_place=True`` appends to the original file
+    itself (temp directory files only). Documents that cannot take an
+    incremental update (encrypted, xref streams) are rewritten in full.
+    ``optimize`` applies to full rewrites only. ``linearize`` needs a full
+    rewrite (an appended update breaks linearization) and cannot be combined
+    with ``incremental`` or ``in_place``.
+    """
     if not rotations:
         raise ValueError("rotations cannot be empty")
+    if linearize and (incremental or in_place):
+        raise ValueError("linearize cannot be combined with incremental or in_place")
+    if not output_path and not in_place:
+        raise ValueError("output_path is required unless in_place is set")
     pdf_path = validate_pdf(file_path)
-    reader = PdfReader(str(pdf_path))
-    writer = PdfWriter()
+    if in_place:
+        ensure_within_temp(pdf_path)
+        incremental = True
+    with open_input(pdf_path) as src:
+        reader = PdfReader(src)
+
+        # Later entries win, as with repeated "page" keys
+        targets: list[tuple[PageSelection, int]] = []
+        for r in rotations:
+            deg = int(r["degrees"])
+            if deg not in {90, 180, 270}:
+                raise ValueError("degrees must be one of 90, 180, 270")
+            if r.get("pages"):
+                sel = _pages_selection(r["pages"], len(reader.pages))
+            else:
+                page_no = int(r["page"])
+                if page_no < 1 or page_no > len(reader.pages):
+                    raise ValueError(f"Page {page_no} out of bounds")
+                sel = PageSelection.from_pages([page_no], len(reader.pages))
+            targets.append((sel, deg))
+        rotation_map = {page_no: deg for sel, deg in targets for page_no in sel}
+
+        out = pdf_path if in_place else Path(output_path)  # type: ignore[arg-type]
+        stats = None
+        if incremental and supports_incremental(pdf_path, reader):
+            changed = {}
+            for page_no, deg in rotation_map.items():
+                page = reader.pages[page_no - 1]
+                page.rotate(deg)
+                ref = page.indirect_reference
+                changed[(ref.idnum, ref.generation)] = page
+            bytes_written = append_update(pdf_path, reader, changed, out)
+            mode = "incremental"
+        else:
+            writer = PdfWriter()
+            for idx, page in enumerate(reader.pages, start=1):
+                if idx in rotation_map:
+                    deg = rotation_map[idx]
+                    try:
+                        page = page.rotate(deg)
+                    except Exception:  # PyPDF2 backward compat
+                        page.rotate_clockwise(deg)
+                writer.add_page(page)
+
+            stats = _write_pdf(writer, out, optimize, linearize=linearize)
+            bytes_written = out.stat().st_size
+            mode = "full"
+
+    result = {
+        "output_path": str(out.resolve()),
+        "rotated_pages": sorted(list(rotation_map.keys())),
+        "page_count": len(reader.pages),
+        "output_size": out.stat().st_size,
+        "mode": mode,
+        "bytes_written": bytes_written,
+        "linearized": linearize,
+    }
+    if stats is not None:
+        result["optimization"] = stats
+    return result
 
-    rotation_map = {int(r["page"]): int(r["degrees"]) for r in rotations}
-    for page_no, deg in rotation_map.items():
-        if page_no < 1 or page_no > len(reader.pages):
-            raise ValueError(f"Page {page_no} out of bounds")
-        if deg not in {90, 180, 270}:
-            raise ValueError("degrees must be one of 90, 180, 270")
-
-    for idx, page in enumerate(reader.pages, start=1):
-        if idx in rotation_map:
-            deg = rotation_map[idx]
-            try:
-                page = page.rotate(deg)
-            except Exception:  # PyPDF2 backward compat
-                page.rotate_clockwise(deg)
-        writer.add_page(page)
 
+def compress_pdf(
+    file_path: str,
+    output_path: str,
+    target_dpi: Optional[int] = 150,
+    jpeg_quality: int = 75,
+    linearize: bool = False,
+) -> dict:
+    """Recompress streams, merge duplicate objects and downsample images above
+    ``target_dpi`` (None keeps images untouched, making the pass lossless).
+
+    If nothing could be saved the original bytes are written unchanged, unless
+    ``linearize`` asks for a fast-web-view layout.
+    """
+    if target_dpi is not None and target_dpi < 1:
+        raise ValueError("target_dpi must be >= 1")
+    if not 1 <= jpeg_quality <= 95:
+        raise ValueError("jpeg_quality must be between 1 and 95")
+    pdf_path = validate_pdf(file_path)
+    if preflight_pdf(pdf_path).encrypted:
+        raise ValueError("Encrypted PDFs cannot be compressed")
+    input_size = pdf_path.stat().st_size
+    with open_input(pdf_path) as src:
+        reader = PdfReader(src)
+        if reader.is_encrypted:
+            raise ValueError("Encrypted PDFs cannot be compressed")
+
+        writer = writer_from_reader(reader)
+        stats = optimize_writer(writer, target_dpi=target_dpi, jpeg_quality=jpeg_quality)
+        buf = io.BytesIO()
+        if linearize:
+            write_linearized(writer, buf)
+        else:
+            writer.write(buf)
+        page_count = len(reader.pages)
+    kept_original = not linearize and buf.tell() >= input_size
     out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    with out.open("wb") as f:
-        writer.write(f)
-
+    if kept_original:
+        if out.resolve() != pdf_path.resolve():
+            out.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(pdf_path, out)
+    else:
+        with atomic_writer(out) as fh:
+            fh.write(buf.getbuffer())
+    output_size = out.stat().st_size
     return {
         "output_path": str(out.resolve()),
-        "rotated_pages": sorted(list(rotation_map.keys())),
-        "page_count": len(reader.pages),
-        "output_size": out.stat().st_size,
+        "page_count": page_count,
+        "input_size": input_size,
+        "output_size": output_size,
+        "saved_bytes": input_size - output_size,
+        "ratio": round(output_size / input_size, 4) if input_size else 1.0,
+        "kept_original": kept_original,
+        "linearized": linearize,
+        "optimization": stats.as_dict(),
     }
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+
+from ..utils.parsers import PageSelection
+from ..utils.tracing import span
+from ..utils.validators import validate_pdf
+from .file_manager import open_input
+from .pdf_processor import _pages_selection, _range_selection, _write_pdf
+
+
+OPERATIONS = ("merge", "select", "rotate", "split", "write", "extract_text")
+# Steps that produce something; a pipeline without one would do no useful work.
+OUTPUT_OPERATIONS = {"split", "write", "extract_text"}
+
+
+@dataclass
+class PipelineResult:
+    page_count: int
+    outputs: List[dict]
+    texts: List[dict]
+    steps: List[dict]
+    inputs_parsed: int
+
+
+def _check_steps(steps: List[Dict[str, Any]]) -> None:
+    """Reject malformed pipelines before any input is parsed or output written.
+
+    Page numbers are checked later, by ``_plan``, once page counts are known.
+    """
+    if not steps:
+        raise ValueError("steps cannot be empty")
+    for i, step in enumerate(steps, start=1):
+        op = step.get("op") if isinstance(step, dict) else None
+        if op not in OPERATIONS:
+            raise ValueError(f"Step {i}: op must be one of {', '.join(OPERATIONS)}")
+        if op == "merge" and not step.get("inputs"):
+            raise ValueError(f"Step {i}: merge needs inputs")
+        if op == "select" and not step.get("pages"):
+            raise ValueError(f"Step {i}: select needs pages")
+        if op == "rotate":
+            if int(step.get("degrees", 0)) not in {90, 180, 270}:
+                raise ValueError(f"Step {i}: degrees must be one of 90, 180, 270")
+            if not step.get("pages") and step.get("page") is None:
+                raise ValueError(f"Step {i}: rotate needs pages or page")
+        if op == "split":
+            ranges = step.get("ranges") or []
+            if not ranges:
+                raise ValueError(f"Step {i}: split needs ranges")
+            if any(not r.get("output_path") for r in ranges):
+                raise ValueError(f"Step {i}: each range must include output_path")
+        if op == "write" and not step.get("output_path"):
+            raise ValueError(f"Step {i}: write needs output_path")
+    if steps[0]["op"] != "merge":
+        raise ValueError("The first step must be merge (it loads the input documents)")
+    if not any(step["op"] in OUTPUT_OPERATIONS for step in steps):
+        raise ValueError("Pipeline has no split, write or extract_text step")
+
+
+def _selection(step: dict, page_count: int) -> PageSelection:
+    if step.get("pages"):
+        sel = _pages_selection(step["pages"], page_count)
+    else:
+        sel = PageSelection.from_pages([int(step["page"])], page_count)
+    if not sel:
+        raise ValueError(f"Empty page selection: {step.get('pages')}")
+    return sel
+
+
+def _split_selections(ranges: List[dict], page_count: int) -> List[PageSelection]:
+    selections: List[PageSelection] = []
+    for r in ranges:
+        sel = _range_selection(r, page_count)
+        for prev in selections:
+            common = prev.first_common(sel)
+            if common is not None:
+                raise ValueError(f"overlapping page in ranges: {common}")
+        selections.append(sel)
+    return selections
+
+
+def _plan(
+    steps: List[Dict[str, Any]], stack: ExitStack
+) -> Tuple[Dict[int, List[PdfReader]], Dict[int, List[PageSelection]]]:
+    """Parse the inputs and resolve every page reference of every step.
+
+    Page counts only change on merge and select, so each step's selections
+    can be checked against the document as that step will see it. Bad
+    references therefore fail before the first output is written. Returns
+    the readers per merge step and the selections per step.
+    """
+    readers: Dict[int, List[PdfReader]] = {}
+    selections: Dict[int, List[PageSelection]] = {}
+    count = 0
+    for i, step in enumerate(steps, start=1):
+        op = step["op"]
+        try:
+            if op == "merge":
+                readers[i] = []
+                for path in step["inputs"]:
+                    reader = PdfReader(stack.enter_context(open_input(validate_pdf(path))))
+                    if reader.is_encrypted:
+                        raise ValueError(f"encrypted input {path}")
+                    readers[i].append(reader)
+                    count += len(reader.pages)
+            elif op == "split":
+                selections[i] = _split_selections(step["ranges"], count)
+            elif op in {"select", "rotate"} or (op == "extract_text" and step.get("pages")):
+                selections[i] = [_selection(step, count)]
+            elif op == "extract_text":
+                selections[i] = [PageSelection.all(count)]
+        except ValueError as e:
+            raise ValueError(f"Step {i}: {e}") from e
+        if op == "select":
+            count = len(selections[i][0])
+        if not count:
+            raise ValueError(f"Step {i}: the document has no pages")
+    return readers, selections
+
+
+def _write(pages: List[PageObject], output_path: str, step: dict, dedupe: bool) -> dict:
+    writer = PdfWriter()
+    for page in pages:
+        writer.add_page(page)
+    out = Path(output_path)
+    optimize = bool(step.get("optimize", False))
+    linearize = bool(step.get("linearize", False))
+    stats = _write_pdf(writer, out, optimize, bool(step.get("dedupe", dedupe)), linearize)
+    item = {
+        "output_path": str(out.resolve()),
+        "pages": len(pages),
+        "output_size": out.stat().st_size,
+        "linearized": linearize,
+    }
+    if optimize:
+        item["optimization"] = stats
+    elif stats is not None:
+        item["dedupe"] = {
+            "objects_deduplicated": stats["objects_deduplicated"],
+            "bytes_saved": stats["dedupe_bytes_saved"],
+        }
+    return item
+
+
+def run_pipeline(steps: List[Dict[str, Any]]) -> PipelineResult:
+    """Run ordered page operations on one in-memory document.
+
+    All inputs are parsed and all page references resolved up front (see
+    ``_plan``), so a pipeline that fails does so before writing anything.
+    ``merge`` appends the pages of its inputs (each parsed once); ``select``
+    keeps pages (in document order), ``rotate`` turns them; page numbers
+    always refer to the document as left by the previous step. ``split``
+    and ``write`` serialize the current pages, ``extract_text`` reads them
+    (PyPDF2 engine); nothing else touches the disk, so intermediate
+    documents are never written or re-parsed. Outlines are not carried over.
+    """
+    _check_steps(steps)
+    pages: List[PageObject] = []
+    outputs: List[dict] = []
+    texts: List[dict] = []
+    summaries: List[dict] = []
+    with ExitStack() as stack:
+        # Inputs stay mapped until the last write: pages resolve their objects lazily
+        with span("pipeline.plan"):
+            readers, selections = _plan(steps, stack)
+        for i, step in enumerate(steps, start=1):
+            op = step["op"]
+            summary: dict = {"step": i, "op": op}
+            with span(f"pipeline.{op}", step=i):
+                if op == "merge":
+                    for reader in readers[i]:
+                        pages.extend(reader.pages)
+                elif op == "select":
+                    pages = [pages[p - 1] for p in selections[i][0]]
+                elif op == "rotate":
+                    sel = selections[i][0]
+                    for p in sel:
+                        pages[p - 1].rotate(int(step["degrees"]))
+                    summary["rotated_pages"] = list(sel)
+                elif op == "split":
+                    for r, sel in zip(step["ranges"], selections[i]):
+                        part = [pages[p - 1] for p in sel]
+                        outputs.append({"step": i, **_write(part, r["output_path"], step, False)})
+                elif op == "write":
+                    outputs.append({"step": i, **_write(pages, step["output_path"], step, True)})
+                else:  # extract_text
+                    for p in selections[i][0]:
+                        with span("page", page=p):
+                            text = pages[p - 1].extract_text() or ""
+                        texts.append({"step": i, "page": p, "text": text, "char_count": len(text)})
+            summary["page_count"] = len(pages)
+            summaries.append(summary)
+    return PipelineResult(
+        page_count=len(pages),
+        outputs=outputs,
+        texts=texts,
+        steps=summaries,
+        inputs_parsed=sum(len(r) for r in readers.values()),
+    )
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional
+
+from ..config import settings
+from ..utils.tracing import span
+from .file_manager import atomic_writer, ensure_within_temp, temp_dir
+
+
+RESULTS_SUBDIR = "results"
+
+
+def _encode(item: Any) -> bytes:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+@span("encode", format="json")
+def exceeds_inline_limit(items: List[Any], limit: Optional[int] = None) -> bool:
+    """Whether the JSON size of ``items`` is above the inline limit.
+
+    Items are encoded one at a time and the scan stops as soon as the limit is
+    crossed, so a huge result is never serialized twice.
+    """
+    budget = settings.inline_result_max_bytes if limit is None else limit
+    total = 2
+    for item in items:
+        total += len(_encode(item)) + 1
+        if total > budget:
+            return True
+    return False
+
+
+@span("encode", format="ndjson")
+def spill_items(kind: str, items: List[Any]) -> dict:
+    """Write ``items`` as NDJSON to the temp store and return a handle with a preview."""
+    out_dir = temp_dir() / RESULTS_SUBDIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{kind}-{uuid.uuid4().hex[:12]}.ndjson"
+    digest = hashlib.sha256()
+    size = 0
+    with atomic_writer(path) as fh:
+        for item in items:
+            line = _encode(item) + b"\n"
+            digest.update(line)
+            size += len(line)
+            fh.write(line)
+    return {
+        "result_handle": {
+            "path": str(path.resolve()),
+            "format": "ndjson",
+            "count": len(items),
+            "bytes": size,
+            "sha256": digest.hexdigest(),
+        },
+        "count": len(items),
+        "preview": items[: settings.result_preview_items],
+    }
+
+
+def maybe_spill(kind: str, items: List[Any], inline: Optional[bool] = None) -> List[Any] | dict:
+    """Apply the result-size policy.
+
+    inline=True always returns the list, inline=False always writes a handle,
+    None writes a handle only above INLINE_RESULT_MAX_BYTES.
+    """
+    if inline is True:
+        return items
+    if inline is None and not exceeds_inline_limit(items):
+        return items
+    return spill_items(kind, items)
+
+
+def read_result(path: str, offset: int = 0, limit: int = 100) -> dict:
+    """Read ``limit`` NDJSON records starting at record ``offset`` from a result handle."""
+    if offset < 0 or limit < 1:
+        raise ValueError("offset must be >= 0 and limit >= 1")
+    p = ensure_within_temp(Path(path))
+    if not p.is_file():
+        raise ValueError(f"Result not found: {path}")
+    items: List[Any] = []
+    next_offset: Optional[int] = None
+    with p.open("rb") as fh:
+        for idx, line in enumerate(fh):
+            if idx < offset:
+                continue
+            if len(items) == limit:
+                next_offset = idx
+                break
+            items.append(json.loads(line))
+    return {"path": str(p), "offset": offset, "items": items, "next_offset": next_offset}
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pdfplumber.table import TableSettings
+from PyPDF2 import PdfReader
+
+from ..config import settings
+from ..utils.logger import get_logger
+from ..utils import tracing
+from ..utils.parsers import select_pages
+from ..utils.validators import validate_pdf
+from .file_manager import atomic_writer, open_input, temp_dir, touch_access
+from .page_cache import CACHE_DIR, FINGERPRINT_VERSION, document_key, page_fingerprint
+from .result_store import RESULTS_SUBDIR
+from .text_engines import PlumberPages
+
+
+logger = get_logger(__name__)
+
+TABLES_DIR = "tables"
+# Smaller jobs run in-process: shipping them to the pool costs more than it saves.
+PARALLEL_MIN_PAGES = 8
+# Chunks handed out per worker; each chunk opens the document once.
+CHUNKS_PER_WORKER = 2
+# Upper bound for TABLE_WORKERS=0 (one per CPU).
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class TableExtractionResult:
+    tables: List[dict]
+    page_count: int
+    pages_scanned: int
+    # Pages whose tables were detected in this call (the rest came from the cache)
+    extracted_pages: List[int]
+
+
+def resolve_settings(table_settings: Optional[Dict[str, Any]]) -> TableSettings:
+    """Validate pdfplumber table settings and fill in its defaults."""
+    try:
+        return TableSettings.resolve(dict(table_settings or {}))
+    except TypeError as e:
+        raise ValueError(f"Invalid table_settings: {e}") from e
+
+
+def _settings_digest(resolved: TableSettings) -> str:
+    return hashlib.sha256(json.dumps(asdict(resolved), sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _extract_chunk(path: str, pages: List[int], resolved: TableSettings) -> Dict[int, List[dict]]:
+    """Detect tables on ``pages``; runs in a pool worker (or inline for small jobs)."""
+    found: Dict[int, List[dict]] = {}
+    with open_input(path) as src, PlumberPages(src) as pdf:
+        for page_no in pages:
+            with tracing.span("page", page=page_no), pdf.page(page_no) as page:
+                found[page_no] = [
+                    {"bbox": [round(v, 2) for v in table.bbox], "rows": table.extract()}
+                    for table in page.find_tables(resolved)
+                ]
+    return found
+
+
+def _traced_chunk(
+    path: str, pages: List[int], resolved: TableSettings, parent: Optional[str]
+) -> Tuple[Dict[int, List[dict]], List[dict]]:
+    """``_extract_chunk`` in a pool worker, returning its spans for the caller's trace."""
+    with tracing.remote(parent) as spans:
+        with tracing.span("chunk", pages=len(pages)):
+            found = _extract_chunk(path, pages, resolved)
+    return found, spans
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    configured = settings.table_workers
+    if configured > 0:
+        return configured
+    return max(1, min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: forking a process that runs the event loop and worker threads is unsafe
+            _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_size = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool = None
+
+
+def _detect(path: Path, pages: List[int], resolved: TableSettings) -> Dict[int, List[dict]]:
+    workers = worker_count()
+    if workers == 1 or len(pages) < PARALLEL_MIN_PAGES:
+        return _extract_chunk(str(path), pages, resolved)
+    size = math.ceil(len(pages) / (workers * CHUNKS_PER_WORKER))
+    chunks = [pages[i : i + size] for i in range(0, len(pages), size)]
+    try:
+        pool = _get_pool(workers)
+        parent = tracing.carrier()
+        futures = [pool.submit(_traced_chunk, str(path), chunk, resolved, parent) for chunk in chunks]
+        found: Dict[int, List[dict]] = {}
+        for future in futures:
+            chunk_found, spans = future.result()
+            found.update(chunk_found)
+            tracing.adopt(spans)
+        return found
+    except BrokenProcessPool as e:
+        logger.warning("table worker pool failed (%s); extracting in-process", e)
+        shutdown_pool()
+        return _extract_chunk(str(path), pages, resolved)
+
+
+def _cache_path(doc_key: str, digest: str) -> Path:
+    name = hashlib.sha1(f"{doc_key}\0{digest}".encode("utf-8")).hexdigest()
+    return temp_dir() / CACHE_DIR / TABLES_DIR / f"{name}.json"
+
+
+def _load_cache(path: Path) -> Dict[str, List[dict]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    touch_access(path)
+    if data.get("version") != FINGERPRINT_VERSION:
+        return {}
+    return data.get("tables", {})
+
+
+def _save_cache(path: Path, doc_key: str, resolved: TableSettings, tables: Dict[str, List[dict]]) -> None:
+    payload = {"version": FINGERPRINT_VERSION, "doc_key": doc_key, "settings": asdict(resolved), "tables": tables}
+    try:
+        with atomic_writer(path) as fh:
+            fh.write(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+    except OSError as e:
+        logger.warning("table cache write failed for %s: %s", path, e)
+
+
+def extract_tables(
+    file_path: str,
+    pages: Optional[List[int]] = None,
+    page_range: Optional[str] = None,
+    table_settings: Optional[Dict[str, Any]] = None,
+    use_cache: Optional[bool] = None,
+) -> TableExtractionResult:
+    """Find tables with pdfplumber and return them as row arrays.
+
+    Pages are fingerprinted (content streams, resources, geometry); tables of
+    a page whose fingerprint was already processed with the same settings
+    come from ``<TEMP_DIR>/.cache/tables/``. The rest are detected across a
+    process pool of TABLE_WORKERS workers.
+    """
+    pdf_path = validate_pdf(file_path)
+    resolved = resolve_settings(table_settings)
+    enabled = settings.table_cache if use_cache is None else use_cache
+
+    with open_input(pdf_path) as src:
+        reader = PdfReader(src)
+        page_count = len(reader.pages)
+        selected = list(select_pages(page_count, pages, page_range))
+        memo: Dict[Tuple[int, int], bytes] = {}
+        fingerprints = {p: page_fingerprint(reader.pages[p - 1], memo) for p in selected} if enabled else {}
+        doc_key = document_key(reader, memo) if enabled else ""
+
+    cache_file = _cache_path(doc_key, _settings_digest(resolved)) if enabled else None
+    cached = _load_cache(cache_file) if cache_file else {}
+    missing = [p for p in selected if fingerprints.get(p) not in cached]
+    found = _detect(pdf_path, missing, resolved) if missing else {}
+    if cache_file and found:
+        merged = dict(cached)
+        if len(selected) == page_count:
+            # Whole document seen: drop pages that left this revision
+            live = set(fingerprints.values())
+            merged = {fp: t for fp, t in cached.items() if fp in live}
+        merged.update((fingerprints[p], t) for p, t in found.items())
+        _save_cache(cache_file, doc_key, resolved, merged)
+
+    tables: List[dict] = []
+    for page_no in selected:
+        page_tables = found[page_no] if page_no in found else cached[fingerprints[page_no]]
+        for index, table in enumerate(page_tables, start=1):
+            tables.append({"page": page_no, "index": index, **table})
+    return TableExtractionResult(
+        tables=tables,
+        page_count=page_count,
+        pages_scanned=len(selected),
+        extracted_pages=missing,
+    )
+
+
+def write_csv(tables: List[dict]) -> List[dict]:
+    """Write each table to its own CSV file in the temp store; return descriptors."""
+    out_dir = temp_dir() / RESULTS_SUBDIR / f"tables-{uuid.uuid4().hex[:12]}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: List[dict] = []
+    for table in tables:
+        buf = io.StringIO()
+        csv.writer(buf).writerows([["" if cell is None else cell for cell in row] for row in table["rows"]])
+        path = out_dir / f"page{table['page']}-table{table['index']}.csv"
+        with atomic_writer(path) as fh:
+            fh.write(buf.getvalue().encode("utf-8"))
+        written.append(
+            {
+                "page": table["page"],
+                "index": table["index"],
+                "bbox": table["bbox"],
+                "path": str(path.resolve()),
+                "row_count": len(table["rows"]),
+                "column_count": max((len(row) for row in table["rows"]), default=0),
+            }
+        )
+    return written
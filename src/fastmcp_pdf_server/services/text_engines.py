@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import gc
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, ContextManager, Dict, Iterator, List, Optional, Protocol
+
+import pdfplumber
+from PyPDF2 import PdfReader
+
+from ..config import settings
+from ..utils.tracing import span
+from .file_manager import open_input
+
+
+# Number of pages sampled by the "auto" selector.
+AUTO_SAMPLE_PAGES = 3
+# Fraction of unreadable characters above which the fast engine is rejected.
+AUTO_MAX_BAD_RATIO = 0.05
+# Below this whitespace ratio the fast engine is assumed to glue words together.
+AUTO_MIN_SPACE_RATIO = 0.05
+
+
+class TextDocument(Protocol):
+    page_count: int
+
+    def extract_page(self, page_no: int) -> str:
+        """Return the text of a 1-based page number."""
+
+
+class TextEngine(ABC):
+    """Base class for text extraction engines.
+
+    Engines open a document once and extract pages on demand, so callers can
+    extract everything or only a selection with the same interface.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    def open(self, pdf_path: Path) -> ContextManager[TextDocument]:
+        """Open ``pdf_path``; the document is usable until the context exits."""
+
+
+class PlumberPages:
+    """pdfplumber document that keeps memory flat across long page loops.
+
+    pdfplumber caches parsed layout objects on every page it touches, and the
+    underlying pdfminer document caches every object it resolves. Each page's
+    caches are released as soon as it is done, and every ``recycle_pages``
+    pages (PDFPLUMBER_RECYCLE_PAGES, 0 = never) the document is reopened over
+    the same input so the object cache starts empty again.
+    """
+
+    def __init__(self, src: BinaryIO, recycle_pages: Optional[int] = None) -> None:
+        self._src = src
+        self._recycle = settings.pdfplumber_recycle_pages if recycle_pages is None else recycle_pages
+        self._pdf = pdfplumber.open(src)
+        self._used = 0
+        self.page_count = len(self._pdf.pages)
+
+    @contextmanager
+    def page(self, page_no: int) -> Iterator["pdfplumber.page.Page"]:
+        """Yield a 1-based page; its parsed objects are dropped on exit."""
+        if self._recycle > 0 and self._used >= self._recycle:
+            self._pdf.close()
+            self._pdf = pdfplumber.open(self._src)
+            # Pages and their document reference each other: free the old one now
+            gc.collect()
+            self._used = 0
+        page = self._pdf.pages[page_no - 1]
+        try:
+            yield page
+        finally:
+            page.close()
+            self._used += 1
+
+    def close(self) -> None:
+        self._pdf.close()
+
+    def __enter__(self) -> "PlumberPages":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class _PdfPlumberDocument:
+    def __init__(self, pages: PlumberPages) -> None:
+        self._pages = pages
+        self.page_count = pages.page_count
+
+    def extract_page(self, page_no: int) -> str:
+        with self._pages.page(page_no) as page:
+            return page.extract_text() or ""
+
+
+class PdfPlumberEngine(TextEngine):
+    """Layout-aware extraction (slower, keeps reading order and spacing)."""
+
+    name = "pdfplumber"
+
+    @contextmanager
+    def open(self, pdf_path: Path) -> Iterator[TextDocument]:
+        with open_input(pdf_path) as src:
+            with span("parse", engine=self.name):
+                pages = PlumberPages(src)
+            with pages:
+                yield _PdfPlumberDocument(pages)
+
+
+class _PyPDF2Document:
+    def __init__(self, reader: PdfReader) -> None:
+        self._reader = reader
+        self.page_count = len(reader.pages)
+
+    def extract_page(self, page_no: int) -> str:
+        return self._reader.pages[page_no - 1].extract_text() or ""
+
+
+class PyPDF2Engine(TextEngine):
+    """Plain content-stream extraction (fast, raw text for retrieval)."""
+
+    name = "pypdf2"
+
+    @contextmanager
+    def open(self, pdf_path: Path) -> Iterator[TextDocument]:
+        with open_input(pdf_path) as src:
+            with span("parse", engine=self.name):
+                reader = PdfReader(src)
+            yield _PyPDF2Document(reader)
+
+
+ENGINES: Dict[str, TextEngine] = {}
+
+
+def register_engine(engine: TextEngine) -> None:
+    ENGINES[engine.name] = engine
+
+
+register_engine(PdfPlumberEngine())
+register_engine(PyPDF2Engine())
+
+
+def available_engines() -> List[str]:
+    return ["auto", *sorted(ENGINES)]
+
+
+def _sample_pages(page_count: int, samples: int) -> List[int]:
+    if page_count <= samples:
+        return list(range(1, page_count + 1))
+    step = page_count / samples
+    return sorted({int(i * step) + 1 for i in range(samples)})
+
+
+def _looks_clean(text: str) -> bool:
+    stripped = "".join(text.split())
+    if not stripped:
+        return False
+    bad = sum(1 for ch in stripped if ch == "�" or not ch.isprintable())
+    bad += text.count("(cid:")
+    if bad / len(stripped) > AUTO_MAX_BAD_RATIO:
+        return False
+    spaces = sum(1 for ch in text if ch.isspace())
+    return len(text) < 200 or spaces / len(text) >= AUTO_MIN_SPACE_RATIO
+
+
+def select_engine(pdf_path: Path) -> TextEngine:
+    """Pick an engine from a cheap sample of the document.
+
+    A few pages are extracted with the fast engine; if the sample is empty or
+    looks garbled (replacement characters, unmapped glyphs, glued words) the
+    layout-aware engine is used instead.
+    """
+    fast = ENGINES["pypdf2"]
+    try:
+        with fast.open(pdf_path) as doc:
+            sample = "\n".join(
+                doc.extract_page(p) for p in _sample_pages(doc.page_count, AUTO_SAMPLE_PAGES)
+            )
+    except Exception:  # noqa: BLE001
+        return ENGINES["pdfplumber"]
+    return fast if _looks_clean(sample) else ENGINES["pdfplumber"]
+
+
+def get_engine(name: str | None, pdf_path: Path) -> TextEngine:
+    """Resolve an engine name (or the configured default) to an engine instance."""
+    key = (name or settings.text_engine).lower()
+    if key == "auto":
+        return select_engine(pdf_path)
+    engine = ENGINES.get(key)
+    if engine is None:
+        raise ValueError(f"Unknown text engine '{name}', choose one of {available_engines()}")
+    return engine
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from ..config import settings
+from ..utils.files import file_identity
+from ..utils.logger import get_logger
+from ..utils.validators import validate_pdf
+from . import pdf_processor
+from .file_manager import LOCK_DIR, content_digest, lease, temp_dir
+from .pdf_probe import probe_pdf
+
+
+logger = get_logger(__name__)
+
+# inotify flags (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+# Longest single wait, so stop() and settling files are noticed promptly.
+MAX_WAIT_SECONDS = 1.0
+# Warmed files remembered (identities) and reported (recent entries).
+DONE_LIMIT = 4096
+RECENT_LIMIT = 20
+# Per-file claims shared by the watchers of all worker processes; older ones are
+# dropped (a claim also outlives the warm, so late scanners skip the file).
+CLAIM_DIR = "watch"
+CLAIM_STALE_SECONDS = 10 * 60
+
+
+@dataclass
+class WatcherMetrics:
+    mode: Optional[str] = None
+    scans: int = 0
+    files_seen: int = 0
+    files_warmed: int = 0
+    # Files another worker process claimed first
+    files_skipped: int = 0
+    errors: int = 0
+    bytes_warmed: int = 0
+    last_file: Optional[str] = None
+    last_duration_ms: Optional[int] = None
+
+
+class _Inotify:
+    """Minimal inotify binding: the fd becomes readable when the directory changes."""
+
+    def __init__(self, directory: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CREATE | IN_CLOSE_WRITE | IN_MOVED_TO
+        if libc.inotify_add_watch(fd, os.fsencode(str(directory)), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+
+    def wait(self, timeout: float) -> bool:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """Pre-warms caches for PDFs that appear in a watched directory.
+
+    New files are picked up through inotify where available, and by a full
+    rescan every ``watch_interval_seconds`` in any case (network mounts do
+    not report remote writes). A file is warmed once its size and mtime have
+    been stable for ``watch_settle_seconds``: validation (preflight cache),
+    content hash, probe (metadata and page count) and, when the page-text
+    cache is on, per-page text. Files are handled one at a time on a single
+    low-priority thread, so warming never competes with requests for more
+    than one core.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, mode: Optional[str] = None) -> None:
+        self.directory = directory
+        self.mode = mode
+        self.metrics = WatcherMetrics()
+        self.recent: Deque[dict] = deque(maxlen=RECENT_LIMIT)
+        self._pending: Dict[Path, Tuple[Tuple, float]] = {}
+        self._done: Set[Tuple] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def path(self) -> Path:
+        if self.directory is not None:
+            return Path(self.directory).resolve()
+        return Path(settings.watch_dir).resolve() if settings.watch_dir else settings.temp_path
+
+    def scan(self, now: Optional[float] = None) -> list[Path]:
+        """Record new or changed PDFs and return those that have settled."""
+        now = time.monotonic() if now is None else now
+        settle = settings.watch_settle_seconds
+        seen: Dict[Path, Tuple] = {}
+        for entry in os.scandir(self.path):
+            if entry.name.startswith(".") or not entry.name.lower().endswith(".pdf"):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                path = Path(entry.path)
+                seen[path] = file_identity(path)
+            except OSError:
+                continue
+        ready: list[Path] = []
+        with self._lock:
+            self.metrics.scans += 1
+            for path in list(self._pending):
+                if path not in seen:
+                    del self._pending[path]
+            for path, identity in seen.items():
+                if identity in self._done:
+                    continue
+                known = self._pending.get(path)
+                if known is None or known[0] != identity:
+                    if known is None:
+                        self.metrics.files_seen += 1
+                    self._pending[path] = (identity, now)
+                    if settle > 0:
+                        continue
+                elif now - known[1] < settle:
+                    continue
+                ready.append(path)
+        return ready
+
+    def _claim(self, identity: Tuple) -> bool:
+        """Claim a file version for this process; False if a live claim exists elsewhere.
+
+        Every uvicorn worker runs its own watcher over the same directory; the
+        claim (created with O_EXCL in the shared temp store, like the sweep
+        lock) makes exactly one of them warm each file.
+        """
+        key = hashlib.sha1(repr(identity).encode("utf-8")).hexdigest()
+        claim = temp_dir() / LOCK_DIR / CLAIM_DIR / f"{key}.claim"
+        claim.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(claim, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    stale = time.time() - claim.stat().st_mtime > CLAIM_STALE_SECONDS
+                except FileNotFoundError:
+                    continue
+                if not stale:
+                    return False
+                claim.unlink(missing_ok=True)
+                continue
+            try:
+                os.write(fd, str(os.getpid()).encode("ascii"))
+            finally:
+                os.close(fd)
+            return True
+        return False
+
+    def _prune_claims(self) -> None:
+        now = time.time()
+        for claim in (temp_dir() / LOCK_DIR / CLAIM_DIR).glob("*.claim"):
+            try:
+                if now - claim.stat().st_mtime > CLAIM_STALE_SECONDS:
+                    claim.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+    def warm(self, path: Path) -> Optional[dict]:
+        """Fill the preflight, probe and page-text caches for one file.
+
+        Returns None when the file failed to warm or another worker process
+        has claimed it.
+        """
+        start = time.perf_counter()
+        try:
+            identity = file_identity(path)
+            if not self._claim(identity):
+                with self._lock:
+                    self._pending.pop(path, None)
+                    self._remember(identity)
+                    self.metrics.files_skipped += 1
+                logger.debug("watcher skipped %s: claimed by another worker", path)
+                return None
+            with lease(path):
+                pdf_path = validate_pdf(str(path))
+                # Coalescing keys on this digest; computing it now spares the first call
+                digest = content_digest(pdf_path)
+                probe = probe_pdf(pdf_path)
+                if settings.page_text_cache and not probe.encrypted:
+                    pdf_processor.extract_text(str(pdf_path), use_cache=True)
+        except Exception as exc:  # noqa: BLE001
+            with self._lock:
+                self._pending.pop(path, None)
+                self.metrics.errors += 1
+                try:
+                    self._remember(file_identity(path))
+                except OSError:
+                    pass
+            logger.warning("watcher could not warm %s: %s", path, exc)
+            return None
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        item = {
+            "path": str(pdf_path),
+            "sha256": digest,
+            "page_count": probe.page_count,
+            "file_size": probe.file_size,
+            "execution_ms": duration_ms,
+        }
+        with self._lock:
+            self._pending.pop(path, None)
+            self._remember(identity)
+            m = self.metrics
+            m.files_warmed += 1
+            m.bytes_warmed += probe.file_size
+            m.last_file = str(pdf_path)
+            m.last_duration_ms = duration_ms
+            self.recent.append(item)
+        logger.info("watcher warmed %s pages=%s ms=%d", pdf_path, probe.page_count, duration_ms)
+        return item
+
+    def _remember(self, identity: Tuple) -> None:
+        if len(self._done) >= DONE_LIMIT:
+            self._done.clear()
+        self._done.add(identity)
+
+    def run_once(self, now: Optional[float] = None) -> list[dict]:
+        warmed = []
+        self._prune_claims()
+        for path in self.scan(now):
+            if self._stop.is_set():
+                break
+            item = self.warm(path)
+            if item is not None:
+                warmed.append(item)
+        return warmed
+
+    def _open_notifier(self) -> Optional[_Inotify]:
+        mode = self.mode or settings.watch_mode
+        if mode == "poll":
+            return None
+        try:
+            return _Inotify(self.path)
+        except (OSError, AttributeError) as exc:
+            if mode == "inotify":
+                logger.error("inotify unavailable, polling instead: %s", exc)
+            return None
+
+    def _loop(self) -> None:
+        try:
+            # Lower this thread's scheduling priority (Linux applies it per thread)
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+        notifier = self._open_notifier()
+        with self._lock:
+            self.metrics.mode = "inotify" if notifier else "poll"
+        interval = settings.watch_interval_seconds
+        next_scan = 0.0
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now >= next_scan or self._pending:
+                    try:
+                        self.run_once()
+                    except Exception as exc:  # noqa: BLE001
+                        with self._lock:
+                            self.metrics.errors += 1
+                        logger.error("watcher scan failed: %s", exc)
+                    next_scan = now + interval
+                timeout = min(MAX_WAIT_SECONDS, max(0.0, next_scan - time.monotonic()))
+                if notifier is not None:
+                    if notifier.wait(timeout):
+                        next_scan = 0.0
+                else:
+                    self._stop.wait(timeout)
+        finally:
+            if notifier is not None:
+                notifier.close()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="folder-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = asdict(self.metrics)
+            data["pending"] = len(self._pending)
+            data["recent"] = list(self.recent)
+        data.update(running=self.running, directory=str(self.path))
+        return data
+
+
+watcher = FolderWatcher()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import List, Optional
 import time
 import uuid
@@ -7,7 +8,12 @@ import uuid
 from fastmcp import FastMCP  # type: ignore
 
 from ..services import image_processor
+from ..services.coalescing import flight_key, single_flight
+from ..services.file_manager import lease
+from ..services.lanes import lanes
+from ..services.result_store import maybe_spill
 from ..utils.logger import get_logger
+from ..utils.tracing import traced
 
 
 logger = get_logger(__name__)
@@ -15,47 +21,164 @@ logger = get_logger(__name__)
 
 def register(app: FastMCP) -> None:
     @app.tool()
+    @traced("pdf_to_images")
     async def pdf_to_images(
         file_path: str,
         output_dir: str,
         format: str = "png",
         dpi: int = 150,
         pages: Optional[List[int]] = None,
-    ) -> list[dict]:
-        """Convert PDF pages to image files."""
+        inline: Optional[bool] = None,
+        page_range: Optional[str] = None,
+        quality: Optional[int] = None,
+        color_mode: str = "color",
+        max_dimension: Optional[int] = None,
+        target_bytes: Optional[int] = None,
+        lane: Optional[str] = None,
+    ) -> list[dict] | dict:
+        """Convert PDF pages to image files.
+
+        format: png, jpeg, webp, tiff or ppm; quality (1-100) applies to jpeg/webp.
+        page_range: page expression used when pages is empty, e.g. "1-5,last", "odd", "10-:2".
+        color_mode: color, gray, bilevel, or auto (detect per page).
+        max_dimension: cap on the longer side in pixels; target_bytes: per-page size budget.
+        inline: None returns a result handle above INLINE_RESULT_MAX_BYTES; True/False forces.
+        lane: 'interactive' or 'bulk' scheduling lane (defaults per tool, see INTERACTIVE_TOOLS).
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            result = image_processor.pdf_to_images(file_path, output_dir, format, dpi, pages)
+            def work() -> list[dict]:
+                with lease(file_path):
+                    return image_processor.pdf_to_images(
+                        file_path,
+                        output_dir,
+                        format,
+                        dpi,
+                        pages,
+                        page_range,
+                        quality,
+                        color_mode,
+                        max_dimension,
+                        target_bytes,
+                    )
+
+            # The first key for a file hashes it: keep that off the event loop
+            key = await lanes.run(
+                "pdf_to_images",
+                lambda: flight_key(
+                    "pdf_to_images",
+                    Path(file_path),
+                    output_dir=str(Path(output_dir).resolve()),
+                    format=format.lower(),
+                    dpi=dpi,
+                    pages=pages,
+                    page_range=page_range,
+                    quality=quality,
+                    color_mode=color_mode.lower(),
+                    max_dimension=max_dimension,
+                    target_bytes=target_bytes,
+                ),
+                lane,
+            )
+            result = await single_flight.run(key, work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             # x-fastmcp-wrap-result=true => return a list
-            return result
+            return maybe_spill("pdf_to_images", result, inline)
         except Exception as e:  # noqa: BLE001
             logger.error(
-                "pdf_to_images error file=%s dir=%s fmt=%s dpi=%s pages=%s: %s",
+                "pdf_to_images error file=%s dir=%s fmt=%s dpi=%s pages=%s range=%s: %s",
                 file_path,
                 output_dir,
                 format,
                 dpi,
                 pages,
+                page_range,
                 e,
             )
             raise ValueError(
-                f"pdf_to_images failed file={file_path} dir={output_dir} fmt={format} dpi={dpi} pages={pages}: {e}"
+                f"pdf_to_images failed file={file_path} dir={output_dir} fmt={format} dpi={dpi} pages={pages} range={page_range}: {e}"
             )
 
     @app.tool()
+    @traced("extract_images")
+    async def extract_images(
+        file_path: str,
+        output_dir: str,
+        pages: Optional[List[int]] = None,
+        page_range: Optional[str] = None,
+        inline: Optional[bool] = None,
+        lane: Optional[str] = None,
+    ) -> list[dict] | dict:
+        """Write the images embedded in a PDF without rendering its pages.
+
+        JPEG/JPEG 2000 streams are copied as-is; other images are decoded to PNG.
+        An image shared by several pages is written once and lists all of them.
+        page_range: same syntax as pdf_to_images (pages wins).
+        inline: None returns a result handle above INLINE_RESULT_MAX_BYTES; True/False forces.
+        lane: as in pdf_to_images.
+        """
+        op_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        try:
+            def work() -> list[dict]:
+                with lease(file_path):
+                    return image_processor.extract_images(file_path, output_dir, pages, page_range)
+
+            key = await lanes.run(
+                "extract_images",
+                lambda: flight_key(
+                    "extract_images",
+                    Path(file_path),
+                    output_dir=str(Path(output_dir).resolve()),
+                    pages=pages,
+                    page_range=page_range,
+                ),
+                lane,
+            )
+            result = await single_flight.run(key, work, lane)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            return maybe_spill("extract_images", result, inline)
+        except Exception as e:  # noqa: BLE001
+            logger.error(
+                "extract_images error file=%s dir=%s pages=%s range=%s: %s",
+                file_path,
+                output_dir,
+                pages,
+                page_range,
+                e,
+            )
+            raise ValueError(
+                f"extract_images failed file={file_path} dir={output_dir} pages={pages} range={page_range}: {e}"
+            )
+
+    @app.tool()
+    @traced("images_to_pdf")
     async def images_to_pdf(
         image_paths: List[str],
         output_path: str,
         page_size: str = "A4",
         orientation: str = "portrait",
+        optimize: bool = False,
+        linearize: bool = False,
+        lane: Optional[str] = None,
     ) -> dict:
-        """Create PDF from multiple image files."""
+        """Create PDF from multiple image files.
+
+        optimize: losslessly recompress and deduplicate the output (see compress_pdf).
+        linearize: write a linearized (fast web view) PDF.
+        lane: as in pdf_to_images.
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            result = image_processor.images_to_pdf(image_paths, output_path, page_size, orientation)
+            def work() -> dict:
+                with lease(*image_paths):
+                    return image_processor.images_to_pdf(
+                        image_paths, output_path, page_size, orientation, optimize, linearize
+                    )
+
+            result = await lanes.run("images_to_pdf", work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             result["meta"] = {"operation_id": op_id, "execution_ms": duration_ms}
             return result
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import time
 import uuid
 
 from fastmcp import FastMCP  # type: ignore
 
-from ..services import pdf_processor
+from ..services import pdf_processor, pipeline as pipeline_service
+from ..services.file_manager import lease
+from ..services.lanes import lanes
+from ..services.result_store import maybe_spill
 from ..utils.logger import get_logger
+from ..utils.tracing import traced
 
 
 logger = get_logger(__name__)
@@ -15,12 +19,32 @@ logger = get_logger(__name__)
 
 def register(app: FastMCP) -> None:
     @app.tool()
-    async def merge_pdfs(input_files: List[str], output_path: str) -> dict:
-        """Merge multiple PDF files into one document."""
+    @traced("merge_pdfs")
+    async def merge_pdfs(
+        input_files: List[str],
+        output_path: str,
+        optimize: bool = False,
+        dedupe: bool = True,
+        linearize: bool = False,
+        lane: Optional[str] = None,
+    ) -> dict:
+        """Merge multiple PDF files into one document.
+
+        dedupe: keep one copy of fonts, images and other resources shared by the inputs.
+        optimize: also losslessly recompress streams.
+        linearize: write a linearized (fast web view) PDF.
+        lane: 'interactive' or 'bulk' scheduling lane (defaults per tool, see INTERACTIVE_TOOLS).
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            result = pdf_processor.merge_pdfs(input_files, output_path)
+            def work() -> dict:
+                with lease(*input_files):
+                    return pdf_processor.merge_pdfs(
+                        input_files, output_path, optimize, dedupe, linearize
+                    )
+
+            result = await lanes.run("merge_pdfs", work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             result["meta"] = {"operation_id": op_id, "execution_ms": duration_ms}
             return result
@@ -29,26 +53,72 @@ def register(app: FastMCP) -> None:
             raise ValueError(f"merge_pdfs failed inputs={input_files} out={output_path}: {e}")
 
     @app.tool()
-    async def split_pdf(file_path: str, split_ranges: List[Dict[str, Any]]) -> list[dict]:
-        """Split PDF into separate files by page ranges."""
+    @traced("split_pdf")
+    async def split_pdf(
+        file_path: str,
+        split_ranges: List[Dict[str, Any]],
+        inline: Optional[bool] = None,
+        optimize: bool = False,
+        linearize: bool = False,
+        lane: Optional[str] = None,
+    ) -> list[dict] | dict:
+        """Split PDF into separate files by page ranges.
+
+        Each range has output_path plus start_page/end_page, or a "pages" expression
+        such as "1-3,last", "odd" or "10-:2" (ranges must not share pages).
+
+        optimize: losslessly recompress streams and merge duplicate objects in each part.
+        linearize: write each part as a linearized (fast web view) PDF.
+        inline: None returns a result handle above INLINE_RESULT_MAX_BYTES; True/False forces.
+        lane: as in merge_pdfs.
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            result = pdf_processor.split_pdf(file_path, split_ranges)
+            def work() -> list[dict]:
+                with lease(file_path):
+                    return pdf_processor.split_pdf(file_path, split_ranges, optimize, linearize)
+
+            result = await lanes.run("split_pdf", work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             # x-fastmcp-wrap-result=true => return a list
-            return result
+            return maybe_spill("split_pdf", result, inline)
         except Exception as e:  # noqa: BLE001
             logger.error("split_pdf error file=%s ranges=%s: %s", file_path, split_ranges, e)
             raise ValueError(f"split_pdf failed file={file_path} ranges={split_ranges}: {e}")
 
     @app.tool()
-    async def rotate_pages(file_path: str, rotations: List[Dict[str, int]], output_path: str) -> dict:
-        """Rotate specific pages in a PDF."""
+    @traced("rotate_pages")
+    async def rotate_pages(
+        file_path: str,
+        rotations: List[Dict[str, Any]],
+        output_path: Optional[str] = None,
+        incremental: bool = False,
+        in_place: bool = False,
+        optimize: bool = False,
+        linearize: bool = False,
+        lane: Optional[str] = None,
+    ) -> dict:
+        """Rotate specific pages in a PDF.
+
+        Each rotation has degrees plus "page" (number) or "pages" (expression, e.g. "even").
+
+        incremental: append only the rotated pages as an incremental update.
+        in_place: update file_path itself (temp directory files only; implies incremental).
+        optimize: losslessly recompress and deduplicate (full rewrites only).
+        linearize: write a linearized (fast web view) PDF; not with incremental/in_place.
+        lane: as in merge_pdfs.
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            result = pdf_processor.rotate_pages(file_path, rotations, output_path)
+            def work() -> dict:
+                with lease(file_path):
+                    return pdf_processor.rotate_pages(
+                        file_path, rotations, output_path, incremental, in_place, optimize, linearize
+                    )
+
+            result = await lanes.run("rotate_pages", work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             result["meta"] = {"operation_id": op_id, "execution_ms": duration_ms}
             return result
@@ -58,3 +128,85 @@ def register(app: FastMCP) -> None:
                 f"rotate_pages failed file={file_path} rotations={rotations} out={output_path}: {e}"
             )
 
+    @app.tool()
+    @traced("compress_pdf")
+    async def compress_pdf(
+        file_path: str,
+        output_path: str,
+        target_dpi: Optional[int] = 150,
+        jpeg_quality: int = 75,
+        linearize: bool = False,
+        lane: Optional[str] = None,
+    ) -> dict:
+        """Reduce PDF size: recompress streams, merge duplicate objects and
+        downsample images above target_dpi (null keeps images untouched).
+
+        linearize: write a linearized (fast web view) PDF.
+        lane: as in merge_pdfs.
+        """
+        op_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        try:
+            def work() -> dict:
+                with lease(file_path):
+                    return pdf_processor.compress_pdf(
+                        file_path, output_path, target_dpi, jpeg_quality, linearize
+                    )
+
+            result = await lanes.run("compress_pdf", work, lane)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            result["meta"] = {"operation_id": op_id, "execution_ms": duration_ms}
+            return result
+        except Exception as e:  # noqa: BLE001
+            logger.error(
+                "compress_pdf error file=%s out=%s dpi=%s quality=%s: %s",
+                file_path,
+                output_path,
+                target_dpi,
+                jpeg_quality,
+                e,
+            )
+            raise ValueError(
+                f"compress_pdf failed file={file_path} out={output_path} dpi={target_dpi} quality={jpeg_quality}: {e}"
+            )
+
+    @app.tool()
+    @traced("pipeline")
+    async def pipeline(
+        steps: List[Dict[str, Any]], inline: Optional[bool] = None, lane: Optional[str] = None
+    ) -> dict:
+        """Chain page operations in memory and write only the final outputs.
+
+        Steps run in order on one document; page numbers refer to the document
+        as left by the previous step:
+        - {"op": "merge", "inputs": [paths]}: append the pages of each input (first step)
+        - {"op": "select", "pages": "1-3,last"}: keep only these pages
+        - {"op": "rotate", "pages": "3,7" (or "page": 3), "degrees": 90}
+        - {"op": "split", "ranges": [{"pages": "1-4", "output_path": ...}, ...]}: as split_pdf
+        - {"op": "write", "output_path": ...}: write the current document
+        - {"op": "extract_text", "pages": "odd"}: PyPDF2 text of the current pages
+        split/write also take optimize, dedupe and linearize.
+        inline: as in extract_text_by_page, for the extracted texts.
+        lane: as in merge_pdfs.
+        """
+        op_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        inputs = [p for step in steps if isinstance(step, dict) for p in step.get("inputs") or []]
+        try:
+            def work() -> pipeline_service.PipelineResult:
+                with lease(*inputs):
+                    return pipeline_service.run_pipeline(steps)
+
+            res = await lanes.run("pipeline", work, lane)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            return {
+                "outputs": res.outputs,
+                "texts": maybe_spill("pipeline", res.texts, inline),
+                "page_count": res.page_count,
+                "inputs_parsed": res.inputs_parsed,
+                "steps": res.steps,
+                "meta": {"operation_id": op_id, "execution_ms": duration_ms},
+            }
+        except Exception as e:  # noqa: BLE001
+            logger.error("pipeline error steps=%s: %s", steps, e)
+            raise ValueError(f"pipeline failed steps={steps}: {e}")
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 import time
 import uuid
 
 from fastmcp import FastMCP  # type: ignore
 
-from ..services import pdf_processor
-from ..services.file_manager import resolve_to_path
+from ..config import settings
+from ..services import pdf_processor, table_extractor
+from ..services.coalescing import flight_key, single_flight
+from ..services.file_manager import lease, resolve_to_path
+from ..services.lanes import lanes
+from ..services.result_store import maybe_spill, spill_items
 from ..utils.logger import get_logger
+from ..utils.tracing import traced
 
 
 logger = get_logger(__name__)
@@ -16,24 +22,57 @@ logger = get_logger(__name__)
 
 def register(app: FastMCP) -> None:
     @app.tool()
-    async def extract_text(file: Any, encoding: str | None = "utf-8") -> dict:
+    @traced("extract_text")
+    async def extract_text(
+        file: Any,
+        encoding: str | None = "utf-8",
+        engine: Optional[str] = None,
+        use_cache: Optional[bool] = None,
+        lane: Optional[str] = None,
+    ) -> dict:
         """Extract all text from a PDF.
 
         Accepts:
         - Full path string
         - Short filename previously written to temp storage
         - Bytes / file-like / dict with base64 (will be saved to temp)
+
+        engine: 'pdfplumber' (layout-aware), 'pypdf2' (fast, raw text) or 'auto'.
+        Defaults to the configured TEXT_ENGINE.
+        use_cache: serve pages whose content fingerprint is unchanged from the
+        page-text cache (defaults to PAGE_TEXT_CACHE); changed_pages lists the rest.
+        lane: 'interactive' or 'bulk' scheduling lane (defaults per tool, see INTERACTIVE_TOOLS).
         """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            resolved = resolve_to_path(file, filename_hint="uploaded.pdf")
-            res = pdf_processor.extract_text(str(resolved), encoding or "utf-8")
+            encoding = encoding or "utf-8"
+
+            def prepare() -> Tuple[Path, Tuple]:
+                # Decoding inline payloads and hashing the file stay off the event loop
+                resolved = resolve_to_path(file, filename_hint="uploaded.pdf")
+                return resolved, flight_key(
+                    "extract_text",
+                    resolved,
+                    encoding=encoding,
+                    engine=(engine or settings.text_engine).lower(),
+                    use_cache=use_cache,
+                )
+
+            resolved, key = await lanes.run("extract_text", prepare, lane)
+
+            def work() -> pdf_processor.TextExtractionResult:
+                with lease(resolved):
+                    return pdf_processor.extract_text(str(resolved), encoding, engine, use_cache)
+
+            res = await single_flight.run(key, work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             return {
                 "text": res.text,
                 "page_count": res.page_count,
                 "char_count": res.char_count,
+                "engine": res.engine,
+                "changed_pages": res.changed_pages,
                 "meta": {"operation_id": op_id, "execution_ms": duration_ms, "resolved_path": str(resolved)},
             }
         except Exception as e:  # noqa: BLE001
@@ -46,26 +85,60 @@ def register(app: FastMCP) -> None:
             raise ValueError(f"extract_text failed: {e}. {hint}")
 
     @app.tool()
+    @traced("extract_text_by_page")
     async def extract_text_by_page(
         file: Any,
         pages: Optional[List[int]] = None,
         page_range: Optional[str] = None,
         encoding: str | None = "utf-8",
-    ) -> list[dict]:
-        """Extract text from specific pages or page ranges."""
+        engine: Optional[str] = None,
+        inline: Optional[bool] = None,
+        use_cache: Optional[bool] = None,
+        lane: Optional[str] = None,
+    ) -> list[dict] | dict:
+        """Extract text from specific pages or page ranges.
+
+        page_range: comma-separated terms such as "1-3", "9-" (to the end), "last",
+        "-2" (second to last), "odd"/"even" and steps like "1-20:5".
+        engine: 'pdfplumber', 'pypdf2' or 'auto' (defaults to TEXT_ENGINE).
+        inline: None returns a result handle above INLINE_RESULT_MAX_BYTES; True/False forces.
+        use_cache: as in extract_text; cached results mark each page with "changed".
+        lane: as in extract_text.
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            resolved = resolve_to_path(file, filename_hint="uploaded.pdf")
-            result = pdf_processor.extract_text_by_page(
-                file_path=str(resolved),
-                pages=pages,
-                page_range=page_range,
-                encoding=encoding or "utf-8",
-            )
+            encoding = encoding or "utf-8"
+
+            def prepare() -> Tuple[Path, Tuple]:
+                resolved = resolve_to_path(file, filename_hint="uploaded.pdf")
+                return resolved, flight_key(
+                    "extract_text_by_page",
+                    resolved,
+                    pages=pages,
+                    page_range=page_range,
+                    encoding=encoding,
+                    engine=(engine or settings.text_engine).lower(),
+                    use_cache=use_cache,
+                )
+
+            resolved, key = await lanes.run("extract_text_by_page", prepare, lane)
+
+            def work() -> list[dict]:
+                with lease(resolved):
+                    return pdf_processor.extract_text_by_page(
+                        file_path=str(resolved),
+                        pages=pages,
+                        page_range=page_range,
+                        encoding=encoding,
+                        engine=engine,
+                        use_cache=use_cache,
+                    )
+
+            result = await single_flight.run(key, work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             # x-fastmcp-wrap-result=true => return list; framework wraps.
-            return result
+            return maybe_spill("extract_text_by_page", result, inline)
         except Exception as e:  # noqa: BLE001
             logger.error(
                 "extract_text_by_page error pages=%s range=%s: %s",
@@ -78,13 +151,96 @@ def register(app: FastMCP) -> None:
             )
 
     @app.tool()
-    async def extract_metadata(file: Any) -> dict:
-        """Extract comprehensive PDF metadata."""
+    @traced("extract_tables")
+    async def extract_tables(
+        file: Any,
+        pages: Optional[List[int]] = None,
+        page_range: Optional[str] = None,
+        table_settings: Optional[Dict[str, Any]] = None,
+        output: str = "rows",
+        inline: Optional[bool] = None,
+        use_cache: Optional[bool] = None,
+        lane: Optional[str] = None,
+    ) -> dict:
+        """Detect tables with pdfplumber and return their cells.
+
+        page_range: same syntax as extract_text_by_page (pages wins).
+        table_settings: pdfplumber table settings, e.g. {"vertical_strategy": "text"}.
+        output: 'rows' (row arrays, spilled to a handle above INLINE_RESULT_MAX_BYTES
+        unless inline is set), 'ndjson' (always a result handle) or 'csv' (one CSV
+        file per table in the temp store).
+        use_cache: reuse tables of pages whose content fingerprint was already
+        processed with the same settings (defaults to TABLE_CACHE).
+        lane: as in extract_text.
+        """
+        op_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        try:
+            output = output.lower()
+            if output not in {"rows", "ndjson", "csv"}:
+                raise ValueError("output must be one of rows, ndjson, csv")
+
+            def prepare() -> Tuple[Path, Tuple]:
+                resolved = resolve_to_path(file, filename_hint="uploaded.pdf")
+                return resolved, flight_key(
+                    "extract_tables",
+                    resolved,
+                    pages=pages,
+                    page_range=page_range,
+                    table_settings=table_settings,
+                    use_cache=use_cache,
+                )
+
+            resolved, key = await lanes.run("extract_tables", prepare, lane)
+
+            def work() -> table_extractor.TableExtractionResult:
+                with lease(resolved):
+                    return table_extractor.extract_tables(
+                        str(resolved), pages, page_range, table_settings, use_cache
+                    )
+
+            res = await single_flight.run(key, work, lane)
+            if output == "csv":
+                tables: list[dict] | dict = table_extractor.write_csv(res.tables)
+            elif output == "ndjson":
+                tables = spill_items("extract_tables", res.tables)
+            else:
+                tables = maybe_spill("extract_tables", res.tables, inline)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            return {
+                "tables": tables,
+                "table_count": len(res.tables),
+                "page_count": res.page_count,
+                "pages_scanned": res.pages_scanned,
+                "extracted_pages": res.extracted_pages,
+                "format": output,
+                "meta": {"operation_id": op_id, "execution_ms": duration_ms, "resolved_path": str(resolved)},
+            }
+        except Exception as e:  # noqa: BLE001
+            logger.error("extract_tables error pages=%s range=%s: %s", pages, page_range, e)
+            raise ValueError(f"extract_tables failed for pages={pages} range={page_range}: {e}")
+
+    @app.tool()
+    @traced("extract_metadata")
+    async def extract_metadata(file: Any, lane: Optional[str] = None) -> dict:
+        """Extract comprehensive PDF metadata.
+
+        lane: as in extract_text.
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            resolved = resolve_to_path(file, filename_hint="uploaded.pdf")
-            result = pdf_processor.extract_metadata(str(resolved))
+            def prepare() -> Tuple[Path, Tuple]:
+                resolved = resolve_to_path(file, filename_hint="uploaded.pdf")
+                return resolved, flight_key("extract_metadata", resolved)
+
+            resolved, key = await lanes.run("extract_metadata", prepare, lane)
+
+            def work() -> dict:
+                with lease(resolved):
+                    return pdf_processor.extract_metadata(str(resolved))
+
+            result = await single_flight.run(key, work, lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             result["meta"] = {"operation_id": op_id, "execution_ms": duration_ms}
             return result
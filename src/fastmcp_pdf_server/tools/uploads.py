@@ -6,8 +6,10 @@ import uuid
 
 from fastmcp import FastMCP  # type: ignore
 
-from ..services.file_manager import resolve_to_path
+from ..services.file_manager import resolve_to_path, write_base64_unique
+from ..services.lanes import lanes
 from ..utils.logger import get_logger
+from ..utils.tracing import traced
 
 
 logger = get_logger(__name__)
@@ -15,18 +17,23 @@ logger = get_logger(__name__)
 
 def register(app: FastMCP) -> None:
     @app.tool()
-    async def upload_file(file: Any, filename: Optional[str] = None) -> dict:
+    @traced("upload_file")
+    async def upload_file(file: Any, filename: Optional[str] = None, lane: Optional[str] = None) -> dict:
         """Persist an uploaded file into the server temp directory.
 
         Accepts:
         - Full path string
         - Short filename previously written to temp storage
         - Bytes / file-like / dict with base64 (will be saved to temp)
+
+        lane: 'interactive' or 'bulk' scheduling lane (defaults per tool, see INTERACTIVE_TOOLS).
         """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            resolved = resolve_to_path(file, filename_hint=filename or "upload.bin")
+            resolved = await lanes.run(
+                "upload_file", lambda: resolve_to_path(file, filename_hint=filename or "upload.bin"), lane
+            )
             duration_ms = int((time.perf_counter() - start) * 1000)
             return {
                 "path": str(resolved),
@@ -39,24 +46,27 @@ def register(app: FastMCP) -> None:
             raise ValueError(f"upload_file failed: {e}")
 
     @app.tool()
-    async def upload_file_base64(base64: str, filename: str) -> dict:
+    @traced("upload_file_base64")
+    async def upload_file_base64(base64: str, filename: str, lane: Optional[str] = None) -> dict:
         """Upload a file encoded as base64 and persist it in temp storage.
 
         Pass the base64-encoded content and the desired filename (e.g., "document.pdf").
+        The content is decoded straight to disk; size and sha256 are computed in the same pass.
+        lane: as in upload_file.
         """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            from base64 import b64decode
-            data = b64decode(base64)
-            # Reuse generic resolver by passing a dict
-            resolved = resolve_to_path({"base64": base64, "filename": filename}, filename_hint=filename)
+            stored = await lanes.run(
+                "upload_file_base64", lambda: write_base64_unique(filename or "upload.bin", base64), lane
+            )
             duration_ms = int((time.perf_counter() - start) * 1000)
             return {
-                "path": str(resolved),
-                "filename": resolved.name,
-                "directory": str(resolved.parent),
-                "size": len(data),
+                "path": str(stored.path),
+                "filename": stored.path.name,
+                "directory": str(stored.path.parent),
+                "size": stored.size,
+                "sha256": stored.sha256,
                 "meta": {"operation_id": op_id, "execution_ms": duration_ms},
             }
         except Exception as e:  # noqa: BLE001
@@ -64,16 +74,19 @@ def register(app: FastMCP) -> None:
             raise ValueError(f"upload_file_base64 failed: {e}")
 
     @app.tool()
-    async def upload_file_url(url: str, filename: Optional[str] = None) -> dict:
+    @traced("upload_file_url")
+    async def upload_file_url(url: str, filename: Optional[str] = None, lane: Optional[str] = None) -> dict:
         """Download a file from a URL and persist it in temp storage.
 
         Provide a direct URL and optional filename override.
         Requires 'requests' to be installed.
+        lane: as in upload_file.
         """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         try:
-            resolved = resolve_to_path({"url": url, "filename": filename} if filename else {"url": url})
+            source = {"url": url, "filename": filename} if filename else {"url": url}
+            resolved = await lanes.run("upload_file_url", lambda: resolve_to_path(source), lane)
             duration_ms = int((time.perf_counter() - start) * 1000)
             return {
                 "path": str(resolved),
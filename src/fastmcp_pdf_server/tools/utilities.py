@@ -8,10 +8,15 @@ from fastmcp import FastMCP  # type: ignore
 from ..config import settings
 from pathlib import Path
 
-from PyPDF2 import PdfReader  # type: ignore
-
-from ..services.file_manager import cleanup_expired, ensure_within_temp, list_resources, to_base64
+from ..services.file_manager import ensure_within_temp, lease, list_resources, mapping_stats, to_base64
+from ..services.coalescing import single_flight
+from ..services.lanes import lanes
+from ..services.maintenance import scheduler
+from ..services.pdf_probe import PdfProbe, probe_pdf
+from ..services.result_store import maybe_spill, read_result as read_result_range
+from ..services.watcher import watcher
 from ..utils.logger import get_logger
+from ..utils.tracing import traced
 
 
 logger = get_logger(__name__)
@@ -19,6 +24,7 @@ logger = get_logger(__name__)
 
 def register(app: FastMCP) -> None:
     @app.tool()
+    @traced("server_info")
     async def server_info() -> dict:
         """Return basic server info and configuration snapshot (non-secret)."""
         op_id = uuid.uuid4().hex
@@ -30,22 +36,34 @@ def register(app: FastMCP) -> None:
             "max_file_size_mb": settings.max_file_size_mb,
             "temp_dir": str(settings.temp_path),
             "log_file": str(settings.log_path),
+            "maintenance": scheduler.snapshot(),
+            "watcher": watcher.snapshot(),
+            "inputs": mapping_stats(),
+            "coalescing": single_flight.snapshot(),
+            "scheduling": lanes.snapshot(),
         }
         duration_ms = int((time.perf_counter() - start) * 1000)
         logger.info("server_info done op_id=%s ms=%d", op_id, duration_ms)
         return {**result, "meta": {"operation_id": op_id, "execution_ms": duration_ms}}
 
     @app.tool()
-    async def list_temp_resources(content_type: str | None = None, max_items: int | None = 100) -> list[dict]:
+    @traced("list_temp_resources")
+    async def list_temp_resources(
+        content_type: str | None = None,
+        max_items: int | None = 100,
+        inline: bool | None = None,
+        lane: str | None = None,
+    ) -> list[dict] | dict:
         """List available temporary files with optional filtering.
         - content_type: filter by 'application/pdf', 'image/png', 'image/jpeg'
         - max_items: limit the number of returned entries
+        - inline: None returns a result handle above INLINE_RESULT_MAX_BYTES; True/False forces
+        - lane: 'interactive' or 'bulk' scheduling lane (defaults per tool, see INTERACTIVE_TOOLS)
         """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         logger.info("list_temp_resources called op_id=%s", op_id)
-        cleanup_expired()
-        resources = list_resources()
+        resources = await lanes.run("list_temp_resources", list_resources, lane)
         if content_type:
             resources = [r for r in resources if r.content_type == content_type]
         results = [
@@ -63,36 +81,77 @@ def register(app: FastMCP) -> None:
         duration_ms = int((time.perf_counter() - start) * 1000)
         logger.info("list_temp_resources done op_id=%s ms=%d", op_id, duration_ms)
         # x-fastmcp-wrap-result=true => return a list; framework wraps as {"result": [...]}.
-        return results[: max_items or 100]
+        return maybe_spill("list_temp_resources", results[: max_items or 100], inline)
 
     @app.tool()
-    async def get_pdf_info(file_path: str) -> dict:
-        """Get comprehensive PDF information without processing content."""
+    @traced("get_pdf_info")
+    async def get_pdf_info(file_path: str, lane: str | None = None) -> dict:
+        """Get comprehensive PDF information without processing content.
+
+        lane: as in list_temp_resources.
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         logger.info("get_pdf_info called op_id=%s", op_id)
         p = Path(file_path)
         if not p.exists() or not p.is_file():
             raise ValueError(f"File not found: {file_path}")
-        reader = PdfReader(str(p))
+
+        def work() -> PdfProbe:
+            with lease(p):
+                return probe_pdf(p.resolve())
+
+        probe = await lanes.run("get_pdf_info", work, lane)
         result = {
-            "pages": len(reader.pages),
-            "size": p.stat().st_size,
-            "version": getattr(reader, "pdf_header", None),
-            "encrypted": reader.is_encrypted,
+            "pages": probe.page_count,
+            "size": probe.file_size,
+            "version": probe.pdf_version,
+            "encrypted": probe.encrypted,
+            "linearized": probe.linearized,
         }
         duration_ms = int((time.perf_counter() - start) * 1000)
         logger.info("get_pdf_info done op_id=%s ms=%d", op_id, duration_ms)
         return {**result, "meta": {"operation_id": op_id, "execution_ms": duration_ms}}
 
     @app.tool()
-    async def get_resource_base64(file_path: str) -> dict:
-        """Return base64 for a file within the temp directory only."""
+    @traced("read_result")
+    async def read_result(path: str, offset: int = 0, limit: int = 100, lane: str | None = None) -> dict:
+        """Read a range of records from a result handle returned by a tool.
+
+        Tools whose output exceeds INLINE_RESULT_MAX_BYTES return `result_handle.path`
+        (NDJSON in the temp directory); page through it with offset/limit.
+        lane: as in list_temp_resources.
+        """
+        op_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        logger.info("read_result called op_id=%s", op_id)
+
+        def work() -> dict:
+            with lease(path):
+                return read_result_range(path, offset, limit)
+
+        result = await lanes.run("read_result", work, lane)
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        logger.info("read_result done op_id=%s ms=%d", op_id, duration_ms)
+        return {**result, "meta": {"operation_id": op_id, "execution_ms": duration_ms}}
+
+    @app.tool()
+    @traced("get_resource_base64")
+    async def get_resource_base64(file_path: str, lane: str | None = None) -> dict:
+        """Return base64 for a file within the temp directory only.
+
+        lane: as in list_temp_resources.
+        """
         op_id = uuid.uuid4().hex
         start = time.perf_counter()
         logger.info("get_resource_base64 called op_id=%s", op_id)
         p = ensure_within_temp(Path(file_path))
-        result = {"path": str(p), "base64": to_base64(p)}
+
+        def work() -> dict:
+            with lease(p):
+                return {"path": str(p), "base64": to_base64(p)}
+
+        result = await lanes.run("get_resource_base64", work, lane)
         duration_ms = int((time.perf_counter() - start) * 1000)
         logger.info("get_resource_base64 done op_id=%s ms=%d", op_id, duration_ms)
         return {**result, "meta": {"operation_id": op_id, "execution_ms": duration_ms}}
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Tuple
+
+
+def file_identity(path: Path) -> Tuple:
+    """File identity from stat: a replaced or rewritten file gets a new identity.
+
+    Cheap enough to key per-file caches on; two copies of the same bytes
+    have different identities (see ``file_manager.content_digest``).
+    """
+    st = path.stat()
+    return (str(path.resolve()), st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
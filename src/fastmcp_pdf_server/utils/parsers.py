@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Set
+import bisect
+import math
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
 
 
 def parse_page_range(expr: str) -> List[int]:
@@ -31,3 +35,231 @@ def clamp_pages(pages: Iterable[int], max_page: int) -> List[int]:
             raise ValueError(f"Page {p} is out of bounds (1..{max_page})")
         result.append(p)
     return result
+
+
+# A run is an arithmetic progression of 1-based pages: (first, last, step).
+Run = Tuple[int, int, int]
+
+_TERM_RE = re.compile(
+    r"^(?P<a>-?\d+|last)(?:(?P<dash>-)(?P<b>-?\d+|last)?)?(?::(?P<step>\d+))?$"
+)
+
+
+def _run_len(run: Run) -> int:
+    return (run[1] - run[0]) // run[2] + 1
+
+
+def _runs_from_pages(pages: List[int]) -> List[Run]:
+    """Compress sorted, distinct pages into runs (contiguous first, then progressions)."""
+    runs: List[Run] = []
+    i = 0
+    while i < len(pages):
+        if i + 1 == len(pages):
+            runs.append((pages[i], pages[i], 1))
+            break
+        step = pages[i + 1] - pages[i]
+        j = i + 1
+        while j + 1 < len(pages) and pages[j + 1] - pages[j] == step:
+            j += 1
+        runs.append((pages[i], pages[j], step))
+        i = j + 1
+    return runs
+
+
+def _normalize(runs: Iterable[Run]) -> Tuple[Run, ...]:
+    """Sort runs and make them disjoint in span.
+
+    Contiguous intervals and progressions with the same step and phase are
+    merged arithmetically; only clusters mixing different steps are expanded,
+    and those are bounded by the page count.
+    """
+    ordered = sorted(r for r in runs if r[0] <= r[1])
+    out: List[Run] = []
+    cluster: List[Run] = []
+    span_end = 0
+
+    def flush() -> None:
+        if not cluster:
+            return
+        steps = {r[2] for r in cluster}
+        if len(steps) == 1 and len({r[0] % r[2] for r in cluster}) == 1:
+            merged = [(cluster[0][0], max(r[1] for r in cluster), cluster[0][2])]
+        else:
+            pages = sorted({p for r in cluster for p in range(r[0], r[1] + 1, r[2])})
+            merged = _runs_from_pages(pages)
+        for run in merged:
+            if run[2] == 1 and out and out[-1][2] == 1 and out[-1][1] + 1 == run[0]:
+                out[-1] = (out[-1][0], run[1], 1)
+            else:
+                out.append(run)
+        cluster.clear()
+
+    for run in ordered:
+        if cluster and run[0] > span_end:
+            flush()
+        if not cluster:
+            span_end = run[1]
+        cluster.append(run)
+        span_end = max(span_end, run[1])
+    flush()
+    return tuple(out)
+
+
+def _first_common(a: Run, b: Run) -> Optional[int]:
+    """Smallest page in both progressions, or None (CRT on the two phases)."""
+    lo, hi = max(a[0], b[0]), min(a[1], b[1])
+    if lo > hi:
+        return None
+    g = math.gcd(a[2], b[2])
+    if (b[0] - a[0]) % g:
+        return None
+    lcm = a[2] // g * b[2]
+    # a[0] + a[2]*t == b[0] (mod b[2])  =>  t == ((b0-a0)/g) * inv(a2/g) (mod b2/g)
+    mod = b[2] // g
+    t = ((b[0] - a[0]) // g * pow(a[2] // g, -1, mod)) % mod if mod > 1 else 0
+    x = a[0] + a[2] * t
+    if x < lo:
+        x += -(-(lo - x) // lcm) * lcm
+    return x if x <= hi else None
+
+
+@dataclass(frozen=True)
+class PageSelection:
+    """A set of 1-based pages stored as sorted, span-disjoint runs.
+
+    Ranges are never expanded: membership is a binary search over the runs,
+    ``len`` is arithmetic and iteration is lazy.
+    """
+
+    runs: Tuple[Run, ...] = ()
+    page_count: int = 0
+
+    @classmethod
+    def all(cls, page_count: int) -> "PageSelection":
+        return cls(((1, page_count, 1),) if page_count > 0 else (), page_count)
+
+    @classmethod
+    def parse(cls, expr: str, page_count: int) -> "PageSelection":
+        """Parse a page expression against a document of ``page_count`` pages.
+
+        Comma-separated terms:
+        ``5``; ``2-7``; ``9-`` (to the end); ``last``; ``-1`` (last page),
+        ``-3-last`` or ``-3--1`` (last three); ``odd``/``even``; and a
+        ``:step`` suffix on any range, e.g. ``1-20:5`` or ``3-:2``.
+        """
+        runs: List[Run] = []
+        for raw in expr.split(","):
+            term = raw.strip().lower()
+            if not term:
+                continue
+            if term in ("odd", "even"):
+                runs.append((1 if term == "odd" else 2, page_count, 2))
+                continue
+            if term == "all":
+                runs.append((1, page_count, 1))
+                continue
+            m = _TERM_RE.match(term)
+            if not m:
+                raise ValueError(f"Invalid page term: {raw.strip()!r}")
+            first = cls._ref(m.group("a"), page_count, raw)
+            if m.group("dash"):
+                last = cls._ref(m.group("b"), page_count, raw) if m.group("b") else page_count
+            else:
+                last = first
+            step = int(m.group("step") or 1)
+            if step < 1:
+                raise ValueError(f"Invalid step in page term: {raw.strip()!r}")
+            if last < first:
+                raise ValueError(f"Invalid range segment: {raw.strip()}")
+            runs.append((first, last - (last - first) % step, step))
+        return cls(_normalize(runs), page_count)
+
+    @staticmethod
+    def _ref(token: str, page_count: int, raw: str) -> int:
+        if token == "last":
+            value = page_count
+        else:
+            value = int(token)
+            if value == 0:
+                raise ValueError(f"Invalid page number: {raw.strip()}")
+            if value < 0:
+                value = page_count + 1 + value
+        if value < 1 or value > page_count:
+            raise ValueError(f"Page {token} is out of bounds (1..{page_count})")
+        return value
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[int], page_count: int) -> "PageSelection":
+        runs: List[Run] = []
+        for p in pages:
+            if p < 1 or p > page_count:
+                raise ValueError(f"Page {p} is out of bounds (1..{page_count})")
+            runs.append((p, p, 1))
+        return cls(_normalize(runs), page_count)
+
+    @classmethod
+    def from_range(cls, start: int, end: int, page_count: int) -> "PageSelection":
+        if start < 1 or end < start or end > page_count:
+            raise ValueError(f"Invalid page range: {start}-{end}")
+        return cls(((start, end, 1),), page_count)
+
+    def __len__(self) -> int:
+        return sum(_run_len(r) for r in self.runs)
+
+    def __bool__(self) -> bool:
+        return bool(self.runs)
+
+    def __iter__(self) -> Iterator[int]:
+        for first, last, step in self.runs:
+            yield from range(first, last + 1, step)
+
+    def __contains__(self, page: object) -> bool:
+        if not isinstance(page, int):
+            return False
+        idx = bisect.bisect_right(self.runs, (page, math.inf, math.inf)) - 1
+        if idx < 0:
+            return False
+        first, last, step = self.runs[idx]
+        return page <= last and (page - first) % step == 0
+
+    def intervals(self) -> Iterator[Tuple[int, int]]:
+        """Contiguous (first, last) blocks, e.g. for renderers that take a page span."""
+        for first, last, step in self.runs:
+            if step == 1:
+                yield first, last
+            else:
+                for p in range(first, last + 1, step):
+                    yield p, p
+
+    def first_common(self, other: "PageSelection") -> Optional[int]:
+        """Smallest page in both selections (None if disjoint), without expansion."""
+        i = j = 0
+        best: Optional[int] = None
+        while i < len(self.runs) and j < len(other.runs):
+            a, b = self.runs[i], other.runs[j]
+            hit = _first_common(a, b)
+            if hit is not None and (best is None or hit < best):
+                best = hit
+            if a[1] < b[1]:
+                i += 1
+            else:
+                j += 1
+        return best
+
+    def __str__(self) -> str:
+        parts = []
+        for first, last, step in self.runs:
+            text = str(first) if first == last else f"{first}-{last}"
+            parts.append(text + (f":{step}" if step > 1 and first != last else ""))
+        return ",".join(parts)
+
+
+def select_pages(
+    page_count: int, pages: Optional[Iterable[int]] = None, page_range: Optional[str] = None
+) -> PageSelection:
+    """Resolve the usual ``pages`` / ``page_range`` tool arguments (pages wins; default all)."""
+    if pages:
+        return PageSelection.from_pages(pages, page_count)
+    if page_range:
+        return PageSelection.parse(page_range, page_count)
+    return PageSelection.all(page_count)
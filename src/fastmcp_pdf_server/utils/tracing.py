@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from .logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# (trace collecting the spans, id of the innermost open span)
+_active: ContextVar[Optional[Tuple["_Trace", str]]] = ContextVar("pdf_trace", default=None)
+_export_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return bool(settings.trace_file) or settings.trace_meta
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class _Trace:
+    """Finished spans of one tool call, as trace events (appended from any thread)."""
+
+    def __init__(self) -> None:
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, event: dict) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def extend(self, events: List[dict]) -> None:
+        with self._lock:
+            self.events.extend(events)
+
+
+def _event(name: str, span_id: str, parent_id: Optional[str], start_ns: int, dur_ns: int, attrs: dict) -> dict:
+    # Chrome/Perfetto trace event format: "X" = complete event, times in microseconds
+    return {
+        "name": name,
+        "ph": "X",
+        "ts": start_ns // 1000,
+        "dur": max(1, dur_ns // 1000),
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+        "args": {"span_id": span_id, "parent_id": parent_id, **attrs},
+    }
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[None]:
+    """Time a phase of the current tool call; a no-op outside a traced call.
+
+    Also usable as a decorator. Nested spans record their parent; worker
+    threads started by the scheduling lanes or ``asyncio.to_thread`` inherit
+    the current span.
+    """
+    active = _active.get()
+    if active is None:
+        yield
+        return
+    trace, parent_id = active
+    span_id = _new_id()
+    token = _active.set((trace, span_id))
+    start_ns = time.time_ns()
+    t0 = time.perf_counter_ns()
+    try:
+        yield
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _active.reset(token)
+        trace.add(_event(name, span_id, parent_id, start_ns, time.perf_counter_ns() - t0, attrs))
+
+
+def carrier() -> Optional[str]:
+    """Picklable handle of the current span, for work shipped to another process."""
+    active = _active.get()
+    return active[1] if active is not None else None
+
+
+@contextmanager
+def remote(parent_id: Optional[str]) -> Iterator[List[dict]]:
+    """Collect spans in a worker process under ``parent_id`` (see ``carrier``).
+
+    The yielded list holds the finished events once the block exits; return
+    it with the result and hand it to ``adopt`` in the calling process.
+    """
+    if parent_id is None:
+        yield []
+        return
+    trace = _Trace()
+    token = _active.set((trace, parent_id))
+    try:
+        yield trace.events
+    finally:
+        _active.reset(token)
+
+
+def adopt(events: List[dict]) -> None:
+    """Add spans recorded elsewhere (``remote``) to the current trace."""
+    active = _active.get()
+    if active is not None and events:
+        active[0].extend(events)
+
+
+def summarize(events: List[dict], root: dict) -> dict:
+    """Per-phase breakdown: inclusive milliseconds and count for each span name."""
+    phases: Dict[str, dict] = {}
+    for ev in events:
+        if ev is root:
+            continue
+        entry = phases.setdefault(ev["name"], {"ms": 0.0, "count": 0})
+        entry["ms"] += ev["dur"] / 1000
+        entry["count"] += 1
+    for entry in phases.values():
+        entry["ms"] = round(entry["ms"], 3)
+    return {
+        "trace_id": root["args"]["trace_id"],
+        "total_ms": round(root["dur"] / 1000, 3),
+        "phases": phases,
+    }
+
+
+def export(events: List[dict]) -> None:
+    """Append events to TRACE_FILE, one JSON object per line."""
+    path = Path(settings.trace_file)
+    data = "".join(json.dumps(ev, separators=(",", ":"), default=str) + "\n" for ev in events)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _export_lock, path.open("a", encoding="utf-8") as fh:
+            # One write per call keeps lines from concurrent HTTP workers intact
+            fh.write(data)
+    except OSError as e:
+        logger.warning("trace export to %s failed: %s", path, e)
+
+
+def _operation_id(result: Any) -> Optional[str]:
+    meta = result.get("meta") if isinstance(result, dict) else None
+    return meta.get("operation_id") if isinstance(meta, dict) else None
+
+
+def traced(tool: str) -> Callable[[Callable[..., Coroutine[Any, Any, Any]]], Callable[..., Coroutine[Any, Any, Any]]]:
+    """Open the root span of a tool call.
+
+    With TRACE_FILE set the call's spans are appended there; with TRACE_META
+    a per-phase summary is added as ``meta.trace`` to dict results. The trace
+    id is the result's ``operation_id`` when it has one.
+    """
+
+    def decorator(fn: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Coroutine[Any, Any, Any]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not enabled():
+                return await fn(*args, **kwargs)
+            trace = _Trace()
+            root_id = _new_id()
+            token = _active.set((trace, root_id))
+            start_ns = time.time_ns()
+            t0 = time.perf_counter_ns()
+            result: Any = None
+            attrs: dict = {}
+            try:
+                result = await fn(*args, **kwargs)
+                return result
+            except BaseException as e:
+                attrs["error"] = type(e).__name__
+                raise
+            finally:
+                _active.reset(token)
+                root = _event(tool, root_id, None, start_ns, time.perf_counter_ns() - t0, attrs)
+                trace.add(root)
+                trace_id = _operation_id(result) or uuid.uuid4().hex
+                for ev in trace.events:
+                    ev["args"]["trace_id"] = trace_id
+                if settings.trace_file:
+                    export(trace.events)
+                if settings.trace_meta and _operation_id(result) is not None:
+                    result["meta"]["trace"] = summarize(trace.events, root)
+
+        return wrapper
+
+    return decorator
@@ -1,15 +1,46 @@
 from __future__ import annotations
 
 import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Iterable, Optional, Tuple
 
 from ..config import settings
+from .files import file_identity
+from .tracing import span
 
 
 PDF_EXTENSIONS = {".pdf"}
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
 
+# The header may be preceded by junk, but must start within the first 1 KiB.
+PREFLIGHT_HEAD_BYTES = 1024
+# startxref must appear within this many bytes before the last %%EOF, which
+# is usually in the last block of the file.
+PREFLIGHT_TAIL_BYTES = 4096
+# Step used to search further back when bytes follow %%EOF (padding, appended
+# data): like PyPDF2, the whole file is searched before giving up.
+PREFLIGHT_SEARCH_BYTES = 1024 * 1024
+# Bytes read at the startxref offset to classify the xref and find /Encrypt.
+PREFLIGHT_XREF_BYTES = 1024
+PREFLIGHT_CACHE_SIZE = 512
+
+_MAGIC = {
+    b"\x89PNG": "a PNG image",
+    b"\xff\xd8\xff": "a JPEG image",
+    b"GIF8": "a GIF image",
+    b"PK\x03\x04": "a ZIP archive (e.g. DOCX/XLSX)",
+    b"\xd0\xcf\x11\xe0": "an OLE document (e.g. DOC/XLS)",
+    b"{\\rtf": "an RTF document",
+    b"<!DOCTYPE": "an HTML page",
+    b"<html": "an HTML page",
+}
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s+%%EOF", re.S)
+_LINEARIZED_RE = re.compile(rb"<<[^>]*?/Linearized\b[^>]*>>", re.S)
+
 
 def assert_file_exists(path: str | os.PathLike) -> Path:
     p = Path(path)
@@ -31,10 +62,12 @@ def assert_max_size(path: Path, max_mb: int | None = None) -> None:
         raise ValueError(f"File size {size} exceeds limit {limit} bytes")
 
 
+@span("validate")
 def validate_pdf(path: str | os.PathLike) -> Path:
     p = assert_file_exists(path)
     assert_extension(p, PDF_EXTENSIONS)
     assert_max_size(p)
+    preflight_pdf(p)
     return p
 
 
@@ -43,3 +76,134 @@ def validate_image(path: str | os.PathLike) -> Path:
     assert_extension(p, IMAGE_EXTENSIONS)
     assert_max_size(p)
     return p
+
+
+@dataclass(frozen=True)
+class PreflightReport:
+    """Result of the cheap structural check run before any parser touches a file."""
+
+    file_size: int
+    pdf_version: str
+    header_offset: int
+    startxref: int
+    # "table" (classic xref), "stream" (PDF 1.5 xref stream) or "unknown"
+    xref_kind: str
+    encrypted: bool
+    linearized: bool
+    # /N from a valid linearization dictionary; None otherwise
+    page_count_hint: Optional[int] = None
+
+
+_preflight_cache: "OrderedDict[Tuple, PreflightReport | str]" = OrderedDict()
+_preflight_lock = threading.Lock()
+
+
+def _describe(head: bytes) -> str:
+    for magic, kind in _MAGIC.items():
+        if head.lstrip().startswith(magic):
+            return f" (looks like {kind})"
+    return ""
+
+
+def _dict_int(blob: bytes, key: bytes) -> Optional[int]:
+    match = re.search(rb"/" + key + rb"\s+(\d+)", blob)
+    return int(match.group(1)) if match else None
+
+
+def _tail_window(fh: BinaryIO, size: int) -> bytes:
+    """The PREFLIGHT_TAIL_BYTES ending with the last %%EOF marker (b"" if none).
+
+    A normal file is answered by its last block; trailing bytes after %%EOF
+    make the search go back in PREFLIGHT_SEARCH_BYTES steps.
+    """
+    end, step, carry = size, PREFLIGHT_TAIL_BYTES, b""
+    while end > 0:
+        start = max(0, end - step)
+        fh.seek(start)
+        block = fh.read(end - start) + carry
+        pos = block.rfind(b"%%EOF")
+        if pos >= 0:
+            eof = start + pos + len(b"%%EOF")
+            first = max(0, eof - PREFLIGHT_TAIL_BYTES)
+            fh.seek(first)
+            return fh.read(eof - first)
+        # A marker may straddle two blocks
+        end, step, carry = start, PREFLIGHT_SEARCH_BYTES, block[:4]
+    return b""
+
+
+def _inspect(path: Path, size: int) -> PreflightReport:
+    if size == 0:
+        raise ValueError("Empty file")
+    with path.open("rb") as fh:
+        head = fh.read(PREFLIGHT_HEAD_BYTES)
+        offset = head.find(b"%PDF-")
+        if offset < 0:
+            raise ValueError(f"Not a PDF: missing %PDF- header{_describe(head)}")
+        tail = _tail_window(fh, size)
+        if not tail:
+            raise ValueError("Truncated or corrupt PDF: no %%EOF marker in file")
+        matches = list(_STARTXREF_RE.finditer(tail))
+        if not matches:
+            raise ValueError("Truncated or corrupt PDF: startxref not found")
+        startxref = int(matches[-1].group(1))
+        # Offsets are relative to the header when junk precedes it
+        if offset + startxref >= size:
+            raise ValueError(f"Truncated PDF: startxref {startxref} points past end of file ({size} bytes)")
+        fh.seek(offset + startxref)
+        xref = fh.read(PREFLIGHT_XREF_BYTES)
+
+    if xref.startswith(b"xref"):
+        xref_kind = "table"
+    elif re.match(rb"\d+\s+\d+\s+obj", xref) and b"/XRef" in xref:
+        xref_kind = "stream"
+    else:
+        xref_kind = "unknown"
+    trailer = tail[tail.rfind(b"trailer") :] if b"trailer" in tail else b""
+    encrypted = b"/Encrypt" in trailer or (xref_kind == "stream" and b"/Encrypt" in xref)
+
+    linearized = False
+    page_hint = None
+    lin = _LINEARIZED_RE.search(head, offset)
+    if lin is not None:
+        # After an incremental update /L no longer matches and the hints are stale
+        linearized = _dict_int(lin.group(0), b"L") == size
+        page_hint = _dict_int(lin.group(0), b"N") if linearized else None
+
+    return PreflightReport(
+        file_size=size,
+        pdf_version=head[offset + 5 : offset + 8].decode("latin-1"),
+        header_offset=offset,
+        startxref=startxref,
+        xref_kind=xref_kind,
+        encrypted=encrypted,
+        linearized=linearized,
+        page_count_hint=page_hint,
+    )
+
+
+def preflight_pdf(path: str | os.PathLike) -> PreflightReport:
+    """Structural sniff of a PDF in a few small reads; raises ValueError for bad input.
+
+    Checks the %PDF- header, the %%EOF marker and the startxref offset, and
+    detects encryption and linearization. Verdicts (good or bad) are cached
+    per file identity, so a file is sniffed once until it changes.
+    """
+    p = Path(path)
+    key = file_identity(p)
+    with _preflight_lock:
+        cached = _preflight_cache.get(key)
+        if cached is not None:
+            _preflight_cache.move_to_end(key)
+    if cached is None:
+        try:
+            cached = _inspect(p, key[3])
+        except ValueError as e:
+            cached = str(e)
+        with _preflight_lock:
+            _preflight_cache[key] = cached
+            while len(_preflight_cache) > PREFLIGHT_CACHE_SIZE:
+                _preflight_cache.popitem(last=False)
+    if isinstance(cached, str):
+        raise ValueError(cached)
+    return cached
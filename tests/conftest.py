@@ -6,3 +6,16 @@ root = Path(__file__).resolve().parents[1]
 src = root / "src"
 if str(src) not in sys.path:
     sys.path.insert(0, str(src))
+
+
+import pytest  # noqa: E402
+
+from fastmcp_pdf_server.config import settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_temp(tmp_path, monkeypatch):
+    # Caches under the temp store must never leak between tests or into the repo
+    monkeypatch.setattr(settings, "temp_dir", str(tmp_path / "temp_store"))
+    settings.temp_path.mkdir()
+    return settings.temp_path
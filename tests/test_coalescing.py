@@ -0,0 +1,126 @@
+import asyncio
+import base64
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import file_manager
+from fastmcp_pdf_server.services.coalescing import SingleFlight, flight_key
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(settings, "coalesce_tools", "op")
+
+
+class Counter:
+    def __init__(self, result=None, error: Exception | None = None, delay: float = 0.2):
+        self.calls = 0
+        self.result = result if result is not None else {"pages": [1, 2, 3]}
+        self.error = error
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def _doc(tmp_path: Path) -> Path:
+    p = tmp_path / "doc.pdf"
+    p.write_bytes(b"%PDF-1.4 same content")
+    return p
+
+
+def test_identical_concurrent_calls_run_once(tmp_path: Path):
+    sf = SingleFlight()
+    work = Counter()
+    key = flight_key("op", _doc(tmp_path), engine="pypdf2")
+
+    async def main():
+        return await asyncio.gather(*(sf.run(key, work) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert work.calls == 1
+    assert all(r == {"pages": [1, 2, 3]} for r in results)
+    # Every caller owns its result; mutating one never leaks into another
+    assert len({id(r) for r in results}) == 5
+    results[0]["meta"] = "x"
+    assert "meta" not in results[1]
+    m = sf.snapshot()["operations"]["op"]
+    assert m["leaders"] == 1 and m["coalesced"] == 4
+    assert m["saved_ms"] >= 4 * 150
+    assert sf.snapshot()["in_flight"] == 0
+
+
+def test_different_params_or_content_do_not_coalesce(tmp_path: Path):
+    sf = SingleFlight()
+    work = Counter()
+    doc = _doc(tmp_path)
+    k1 = flight_key("op", doc, engine="pypdf2")
+    k2 = flight_key("op", doc, engine="pdfplumber")
+    assert flight_key("op", doc, a=1, b=2) == flight_key("op", doc, b=2, a=1)
+
+    async def main():
+        await asyncio.gather(sf.run(k1, work), sf.run(k2, work))
+
+    asyncio.run(main())
+    assert work.calls == 2
+
+    before = flight_key("op", doc)
+    doc.write_bytes(b"%PDF-1.4 rewritten, new content")
+    os.utime(doc, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+    assert flight_key("op", doc) != before
+
+
+def test_same_bytes_at_different_paths_share_a_key(tmp_path: Path, monkeypatch):
+    doc = _doc(tmp_path)
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(doc.read_bytes())
+    assert flight_key("op", copy, engine="pypdf2") == flight_key("op", doc, engine="pypdf2")
+
+    # A retried inline upload gets a new temp name; its digest is recorded while decoding
+    payload = base64.b64encode(b"%PDF-1.4 uploaded twice").decode("ascii")
+    first = file_manager.write_base64_unique("upload.pdf", payload)
+    second = file_manager.write_base64_unique("upload.pdf", payload)
+    assert first.path != second.path
+    hashed = []
+    monkeypatch.setattr(file_manager, "open_input", lambda p: hashed.append(p))
+    assert flight_key("op", first.path) == flight_key("op", second.path)
+    assert hashed == []
+
+
+def test_followers_share_the_leader_error(tmp_path: Path):
+    sf = SingleFlight()
+    work = Counter(error=ValueError("bad pdf"))
+    key = flight_key("op", _doc(tmp_path))
+
+    async def main():
+        return await asyncio.gather(*(sf.run(key, work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert work.calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+    assert sf.snapshot()["operations"]["op"]["errors"] == 1
+
+
+def test_tools_not_opted_in_run_every_call(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "coalesce_tools", "")
+    sf = SingleFlight()
+    work = Counter(delay=0)
+    key = flight_key("op", _doc(tmp_path))
+
+    async def main():
+        await asyncio.gather(*(sf.run(key, work) for _ in range(3)))
+
+    asyncio.run(main())
+    assert work.calls == 3
+    assert sf.snapshot()["operations"] == {}
@@ -0,0 +1,68 @@
+import io
+from pathlib import Path
+
+from PIL import Image
+from PyPDF2 import PdfReader
+from PyPDF2.filters import ASCII85Decode
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services import image_processor, pdf_processor
+
+
+def jpeg_bytes(color: tuple) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def make_pdf(path: Path) -> Path:
+    """Page 1: logo (JPEG) + gray chart (Flate); page 2: logo again; page 3: no images."""
+    logo = ImageReader(io.BytesIO(jpeg_bytes((200, 30, 30))))
+    chart = ImageReader(Image.linear_gradient("L").resize((40, 30)))
+    c = canvas.Canvas(str(path))
+    c.drawImage(logo, 50, 600, width=64, height=48)
+    c.drawImage(chart, 200, 600, width=80, height=60)
+    c.showPage()
+    c.drawImage(logo, 50, 600, width=64, height=48)
+    c.showPage()
+    c.drawString(100, 700, "text only")
+    c.showPage()
+    c.save()
+    return path
+
+
+def test_extract_images_copies_jpeg_and_decodes_others(tmp_path: Path):
+    pdf = make_pdf(tmp_path / "imgs.pdf")
+    out = tmp_path / "out"
+    images = image_processor.extract_images(str(pdf), str(out))
+    assert len(images) == 2
+    logo = next(i for i in images if i["format"] == "jpg")
+    chart = next(i for i in images if i["format"] == "png")
+
+    assert logo["copied"] is True and logo["pages"] == [1, 2]
+    # reportlab stores JPEGs as [/ASCII85Decode /DCTDecode]: the file is the JPEG itself
+    reader = PdfReader(str(pdf))
+    xobjects = [x.get_object() for x in reader.pages[0]["/Resources"]["/XObject"].values()]
+    jpeg = next(x for x in xobjects if x["/Filter"][-1] == "/DCTDecode")
+    assert Path(logo["path"]).read_bytes() == ASCII85Decode.decode(jpeg._data)
+    with Image.open(logo["path"]) as im:
+        assert im.format == "JPEG" and im.size == (64, 48)
+
+    assert chart["copied"] is False and chart["pages"] == [1]
+    with Image.open(chart["path"]) as im:
+        assert im.size == (40, 30) and im.mode == "L"
+
+    only_two = image_processor.extract_images(str(pdf), str(tmp_path / "p2"), page_range="2-3")
+    assert [(i["format"], i["pages"]) for i in only_two] == [("jpg", [2])]
+
+
+def test_extract_images_dedupes_identical_streams_across_documents(tmp_path: Path):
+    a = make_pdf(tmp_path / "a.pdf")
+    assert pdf_processor.merge_pdfs([str(a), str(a)], str(tmp_path / "d.pdf"), dedupe=False)
+
+    images = image_processor.extract_images(str(tmp_path / "d.pdf"), str(tmp_path / "out"))
+    assert len(images) == 2
+    logo = next(i for i in images if i["format"] == "jpg")
+    assert logo["pages"] == [1, 2, 4, 5]
+    assert len(list((tmp_path / "out").iterdir())) == 2
@@ -0,0 +1,126 @@
+import base64
+import hashlib
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import file_manager
+
+
+def _upload(i: int) -> str:
+    return str(file_manager.write_bytes_unique("upload.pdf", bytes([i % 256]) * 4096))
+
+
+def test_concurrent_unique_writes_never_collide():
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(_upload, range(32)))
+    assert len(set(paths)) == 32
+    for i, p in enumerate(paths):
+        assert Path(p).read_bytes() == bytes([i % 256]) * 4096
+
+
+def test_unique_writes_across_processes(isolated_temp: Path):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        paths = list(pool.map(_upload, range(8)))
+    assert len(set(paths)) == 8
+    assert sorted(r.path.name for r in file_manager.list_resources()) == sorted(Path(p).name for p in paths)
+
+
+def test_atomic_writer_leaves_nothing_on_error(isolated_temp: Path):
+    target = isolated_temp / "out.bin"
+    with pytest.raises(RuntimeError):
+        with file_manager.atomic_writer(target) as fh:
+            fh.write(b"partial")
+            raise RuntimeError("boom")
+    assert not target.exists()
+    assert list(isolated_temp.iterdir()) == []
+
+
+def test_cleanup_skips_leased_files_and_internal_markers(isolated_temp: Path):
+    old = time.time() - settings.temp_retention_seconds - 10
+    kept = file_manager.write_bytes("kept.pdf", b"x")
+    gone = file_manager.write_bytes("gone.pdf", b"x")
+    for p in (kept, gone):
+        os.utime(p, (old, old))
+    with file_manager.lease(kept):
+        assert file_manager.is_leased(kept)
+        assert file_manager.cleanup_expired() == 1
+    assert kept.exists() and not gone.exists()
+    assert not file_manager.is_leased(kept)
+    assert [r.path.name for r in file_manager.list_resources()] == ["kept.pdf"]
+
+
+def test_only_one_sweep_runs_at_a_time():
+    with file_manager._sweep_lock() as first:
+        assert first is True
+        with file_manager._sweep_lock() as second:
+            assert second is False
+        assert file_manager.cleanup_expired() == 0
+    with file_manager._sweep_lock() as again:
+        assert again is True
+
+
+def test_open_input_shares_one_mapping(isolated_temp: Path):
+    data = b"%PDF-1.4\nline one\nline two\n%%EOF\n"
+    p = file_manager.write_bytes("in.pdf", data)
+    with file_manager.open_input(p) as a, file_manager.open_input(p) as b:
+        assert file_manager.mapping_stats() == {"mapped_files": 1, "mapped_bytes": len(data), "readers": 2}
+        assert a.readline() == b"%PDF-1.4\n"
+        assert b.read(4) == b"%PDF"
+        a.seek(-6, os.SEEK_END)
+        assert a.read() == b"%%EOF\n"
+        assert b.tell() == 4
+    assert file_manager.mapping_stats()["mapped_files"] == 0
+
+
+def test_open_input_never_serves_a_replaced_file(isolated_temp: Path):
+    p = file_manager.write_bytes("in.pdf", b"old content")
+    with file_manager.open_input(p) as old:
+        file_manager.write_bytes("in.pdf", b"new content!")
+        with file_manager.open_input(p) as new:
+            assert new.read() == b"new content!"
+            assert file_manager.mapping_stats()["mapped_files"] == 2
+        assert old.read() == b"old content"
+
+
+def test_to_base64_reads_from_mapping(isolated_temp: Path):
+    import base64
+
+    p = file_manager.write_bytes("blob.bin", bytes(range(256)) * 100)
+    assert base64.b64decode(file_manager.to_base64(p)) == p.read_bytes()
+    empty = file_manager.write_bytes("empty.bin", b"")
+    assert file_manager.to_base64(empty) == ""
+    assert file_manager.mapping_stats()["readers"] == 0
+
+
+def test_base64_upload_streams_in_windows(monkeypatch):
+    payload = os.urandom(3 * 1024 * 1024 + 7)
+    encoded = base64.encodebytes(payload).decode("ascii")  # MIME line breaks every 76 chars
+    monkeypatch.setattr(file_manager, "BASE64_WINDOW", 64 * 1024)
+
+    tracemalloc.start()
+    try:
+        stored = file_manager.write_base64_unique("scan.pdf", encoded)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert stored.path.read_bytes() == payload
+    assert stored.size == len(payload)
+    assert stored.sha256 == hashlib.sha256(payload).hexdigest()
+    # Never a decoded copy of the whole payload, only window-sized buffers
+    assert peak < len(payload) // 4
+
+    via_resolver = file_manager.resolve_to_path({"base64": encoded, "filename": "scan.pdf"})
+    assert via_resolver != stored.path and via_resolver.read_bytes() == payload
+
+
+@pytest.mark.parametrize("bad", ["QUJD*", "QUJDR", "QUJDé"])
+def test_base64_upload_rejects_invalid_input(isolated_temp: Path, bad: str):
+    with pytest.raises(ValueError, match="Invalid base64"):
+        file_manager.write_base64_unique("bad.bin", bad)
+    assert list(isolated_temp.iterdir()) == []
@@ -0,0 +1,42 @@
+import pytest
+
+from fastmcp_pdf_server import main
+from fastmcp_pdf_server.services.maintenance import scheduler
+
+
+# Starlette's TestClient is built on httpx
+pytest.importorskip("httpx")
+from starlette.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    fresh = main._WorkerStats()
+    monkeypatch.setattr(main, "worker_stats", fresh)
+    yield fresh
+    scheduler.stop()
+
+
+def test_health_reports_worker_counters(stats):
+    with TestClient(main.create_http_app()) as client:
+        first = client.get("/health")
+        assert first.status_code == 200
+        body = first.json()
+        # The /health request itself is counted and still in flight
+        assert body["status"] == "ok"
+        assert body["requests"] == 1 and body["in_flight"] == 1 and body["errors"] == 0
+        assert set(body["lanes"]) == {"interactive", "bulk"}
+
+        second = client.get("/health").json()
+        assert second["requests"] == 2 and second["in_flight"] == 1
+        assert second["uptime_s"] >= body["uptime_s"]
+    assert stats.in_flight == 0
+
+
+def test_counting_middleware_counts_errors(stats):
+    async def broken(scope, receive, send):
+        raise RuntimeError("boom")
+
+    client = TestClient(main._CountingMiddleware(broken), raise_server_exceptions=False)
+    assert client.get("/anything").status_code == 500
+    assert (stats.requests, stats.in_flight, stats.errors) == (1, 0, 1)
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pdfplumber
+import pytest
+from PyPDF2 import PdfReader
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import pdf_processor
+
+
+def make_pdf(path: Path, pages: int) -> Path:
+    c = canvas.Canvas(str(path))
+    for i in range(pages):
+        c.drawString(100, 750, f"Incremental p{i+1}")
+        c.showPage()
+    c.save()
+    return path
+
+
+def test_incremental_rotate_appends_only_changed_pages(tmp_path: Path):
+    src = make_pdf(tmp_path / "big.pdf", 200)
+    out = tmp_path / "rotated.pdf"
+    r = pdf_processor.rotate_pages(
+        str(src), [{"page": 2, "degrees": 90}, {"page": 150, "degrees": 180}], str(out), incremental=True
+    )
+    assert r["mode"] == "incremental"
+    assert r["bytes_written"] < 2048
+    data = out.read_bytes()
+    assert data.startswith(src.read_bytes())
+
+    reader = PdfReader(str(out))
+    assert len(reader.pages) == 200
+    assert reader.pages[1].get("/Rotate") == 90
+    assert reader.pages[149].get("/Rotate") == 180
+    assert reader.pages[0].get("/Rotate", 0) == 0
+    with pdfplumber.open(str(out)) as pdf:
+        assert pdf.pages[1].rotation == 90
+        assert "Incremental" in (pdf.pages[1].extract_text() or "")
+
+
+def test_in_place_requires_temp_dir(tmp_path: Path, monkeypatch):
+    src = make_pdf(tmp_path / "inplace.pdf", 3)
+    with pytest.raises(ValueError):
+        pdf_processor.rotate_pages(str(src), [{"page": 1, "degrees": 90}], in_place=True)
+
+    monkeypatch.setattr(settings, "temp_dir", str(tmp_path))
+    size = src.stat().st_size
+    r = pdf_processor.rotate_pages(str(src), [{"page": 1, "degrees": 90}], in_place=True)
+    assert r["output_path"] == str(src.resolve())
+    assert src.stat().st_size == size + r["bytes_written"]
+    assert PdfReader(str(src)).pages[0].get("/Rotate") == 90
@@ -1,6 +1,9 @@
+import io
 import shutil
 from pathlib import Path
 
+import pytest
+from PIL import Image, ImageDraw
 from reportlab.pdfgen import canvas
 
 from fastmcp_pdf_server.services import image_processor
@@ -28,4 +31,179 @@ def test_pdf_to_images_and_back(tmp_path: Path):
 
     out_pdf = tmp_path / "roundtrip.pdf"
     r = image_processor.images_to_pdf([i["path"] for i in images], str(out_pdf))
-    assert Path(r["output_path"]).exists()
\ No newline at end of file
+    assert Path(r["output_path"]).exists()
+
+
+def _page(color: bool = False, shades: bool = False) -> Image.Image:
+    img = Image.new("RGB", (600, 800), "white")
+    draw = ImageDraw.Draw(img)
+    for y in range(40, 760, 24):
+        draw.rectangle((40, y, 560, y + 10), fill="black")
+    if shades:
+        for x in range(600):
+            draw.line((x, 0, x, 300), fill=(x * 255 // 600,) * 3)
+    if color:
+        draw.rectangle((100, 100, 400, 400), fill=(200, 30, 30))
+    return img
+
+
+def test_detect_color_mode_and_encode_to_target():
+    assert image_processor.detect_color_mode(_page(color=True)) == "color"
+    assert image_processor.detect_color_mode(_page(shades=True)) == "gray"
+    assert image_processor.detect_color_mode(_page()) == "bilevel"
+
+    bilevel = image_processor._apply_color_mode(_page(), "bilevel", "PNG")
+    assert bilevel.mode == "1"
+    png, _, _ = image_processor.encode_page(bilevel, "PNG")
+    color_png, _, _ = image_processor.encode_page(_page(), "PNG")
+    assert len(png) < len(color_png)
+
+    noisy = Image.effect_noise((800, 800), 60).convert("RGB")
+    data, img, quality = image_processor.encode_page(noisy, "WEBP", target_bytes=40_000)
+    assert len(data) <= 40_000 and Image.open(io.BytesIO(data)).format == "WEBP"
+    assert quality is not None and quality < image_processor.DEFAULT_QUALITY["WEBP"]
+    data, img, quality = image_processor.encode_page(noisy, "JPEG", quality=90, target_bytes=8_000)
+    assert len(data) <= 8_000 and img.size == Image.open(io.BytesIO(data)).size
+    assert img.width < 800
+
+
+def test_pdf_to_images_rejects_bad_options(tmp_path: Path):
+    pdf = make_pdf(tmp_path, 1)
+    for kwargs, message in [
+        ({"format": "bmp"}, "Unsupported image format"),
+        ({"color_mode": "sepia"}, "color_mode"),
+        ({"format": "jpeg", "quality": 0}, "quality"),
+        ({"target_bytes": 10}, "target_bytes"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), **kwargs)
+
+
+class FakePoppler:
+    """Stands in for pdf2image.convert_from_path: records calls and returns
+    ``_page`` drawings at the size Poppler would produce for the requested DPI."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.pages: dict[int, dict] = {}  # page number -> _page() options
+
+    def __call__(self, path, dpi, first_page, last_page, grayscale):
+        self.calls.append(
+            {"dpi": dpi, "first_page": first_page, "last_page": last_page, "grayscale": grayscale}
+        )
+        # reportlab's default page is A4, 595 x 842 pt
+        size = (round(595 * dpi / 72), round(842 * dpi / 72))
+        images = []
+        for page_no in range(first_page, last_page + 1):
+            img = _page(**self.pages.get(page_no, {})).resize(size)
+            images.append(img.convert("L") if grayscale else img)
+        return images
+
+    def spans(self) -> list[tuple[int, int]]:
+        return [(c["first_page"], c["last_page"]) for c in self.calls]
+
+
+@pytest.fixture
+def poppler(monkeypatch) -> FakePoppler:
+    fake = FakePoppler()
+    monkeypatch.setattr(image_processor.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(image_processor, "convert_from_path", fake)
+    return fake
+
+
+def test_pdf_to_images_batches_renderer_calls(tmp_path: Path, poppler: FakePoppler):
+    pdf = make_pdf(tmp_path, 40)
+    images = image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), page_range="odd", dpi=10)
+    assert poppler.spans() == [(1, 39)]
+    assert [i["page_number"] for i in images] == list(range(1, 40, 2))
+    assert sorted(p.name for p in (tmp_path / "imgs").iterdir())[:2] == ["page-0001.png", "page-0003.png"]
+
+    poppler.calls.clear()
+    image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), page_range="1-2,10,30-31", dpi=10)
+    assert poppler.spans() == [(1, 2), (10, 10), (30, 31)]
+
+
+def test_render_blocks_caps_renderer_calls():
+    from fastmcp_pdf_server.utils.parsers import PageSelection
+
+    sparse = PageSelection.parse("1-500:5", 500)
+    blocks = image_processor.render_blocks(sparse)
+    assert len(blocks) == image_processor.MAX_RENDER_CALLS
+    assert blocks[0][0] == 1 and blocks[-1][1] == 496
+    assert all(any(a <= p <= b for a, b in blocks) for p in sparse)
+
+
+def test_max_dimension_lowers_render_dpi(tmp_path: Path, poppler: FakePoppler):
+    pdf = make_pdf(tmp_path, 2)
+    images = image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), dpi=150, max_dimension=400)
+    # 400 px over the 842 pt side: Poppler is asked for 34 DPI, not 150
+    assert [c["dpi"] for c in poppler.calls] == [int(400 * 72 / 842)]
+    assert all(max(i["width"], i["height"]) <= 400 for i in images)
+
+    poppler.calls.clear()
+    image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), dpi=20)
+    assert [c["dpi"] for c in poppler.calls] == [20]
+
+
+@pytest.mark.parametrize(
+    "color_mode, grayscale, image_mode",
+    [("color", False, "RGB"), ("gray", True, "L"), ("bilevel", True, "1")],
+)
+def test_gray_modes_render_in_grayscale(tmp_path: Path, poppler: FakePoppler, color_mode, grayscale, image_mode):
+    pdf = make_pdf(tmp_path, 1)
+    [item] = image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), dpi=30, color_mode=color_mode)
+    assert [c["grayscale"] for c in poppler.calls] == [grayscale]
+    assert item["color_mode"] == color_mode
+    assert Image.open(item["path"]).mode == image_mode
+
+
+def test_auto_color_mode_is_chosen_per_page(tmp_path: Path, poppler: FakePoppler):
+    pdf = make_pdf(tmp_path, 3)
+    poppler.pages = {1: {"color": True}, 2: {"shades": True}}
+    images = image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), dpi=72, color_mode="auto")
+    assert [c["grayscale"] for c in poppler.calls] == [False]
+    assert [i["color_mode"] for i in images] == ["color", "gray", "bilevel"]
+    assert [Image.open(i["path"]).mode for i in images] == ["RGB", "L", "1"]
+
+
+def test_webp_output_is_encoded_once_per_page(tmp_path: Path, poppler: FakePoppler):
+    pdf = make_pdf(tmp_path, 2)
+    images = image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), format="webp", dpi=72)
+    for item in images:
+        path = Path(item["path"])
+        assert path.suffix == ".webp" and item["format"] == "webp"
+        assert item["quality"] == image_processor.DEFAULT_QUALITY["WEBP"]
+        assert item["size"] == path.stat().st_size
+        with Image.open(path) as img:
+            assert img.format == "WEBP" and img.size == (item["width"], item["height"]) == (595, 842)
+
+    [small] = image_processor.pdf_to_images(
+        str(pdf), str(tmp_path / "small"), format="webp", dpi=72, pages=[1], target_bytes=2048
+    )
+    assert small["size"] <= 2048
+
+
+@pytest.mark.parametrize("fmt, pillow_format", [("tiff", "TIFF"), ("tif", "TIFF"), ("ppm", "PPM")])
+def test_lossless_formats_from_pdf2image_still_work(
+    tmp_path: Path, poppler: FakePoppler, fmt, pillow_format
+):
+    pdf = make_pdf(tmp_path, 1)
+    [item] = image_processor.pdf_to_images(str(pdf), str(tmp_path / "imgs"), format=fmt, dpi=20)
+    assert item["path"].endswith(f"page-0001.{fmt}") and "quality" not in item
+    with Image.open(item["path"]) as img:
+        assert img.format == pillow_format
+
+
+def test_pdf_to_images_rejects_encrypted_pdf(tmp_path: Path, poppler: FakePoppler):
+    from PyPDF2 import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for page in PdfReader(str(make_pdf(tmp_path, 2))).pages:
+        writer.add_page(page)
+    writer.encrypt("secret")
+    locked = tmp_path / "locked.pdf"
+    with open(locked, "wb") as fh:
+        writer.write(fh)
+    with pytest.raises(ValueError, match="encrypted or unreadable PDF"):
+        image_processor.pdf_to_images(str(locked), str(tmp_path / "imgs"))
+    assert poppler.calls == []
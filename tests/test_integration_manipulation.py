@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+from PyPDF2 import PdfReader
 from reportlab.pdfgen import canvas
 
 from fastmcp_pdf_server.services import pdf_processor
@@ -34,4 +36,29 @@ def test_merge_split_rotate(tmp_path: Path):
 
     rotated = tmp_path / "rotated.pdf"
     r = pdf_processor.rotate_pages(str(merged), [{"page": 1, "degrees": 90}], str(rotated))
-    assert Path(r["output_path"]).exists()
\ No newline at end of file
+    assert Path(r["output_path"]).exists()
+
+
+def test_split_and_rotate_with_page_expressions(tmp_path: Path):
+    src = make_pdf(tmp_path, "E", 6)
+    odd, even = tmp_path / "odd.pdf", tmp_path / "even.pdf"
+    s = pdf_processor.split_pdf(str(src), [
+        {"pages": "odd", "output_path": str(odd)},
+        {"pages": "even", "output_path": str(even)},
+    ])
+    assert [part["pages"] for part in s] == [3, 3]
+    assert "E p5" in PdfReader(str(odd)).pages[2].extract_text()
+
+    with pytest.raises(ValueError, match="Overlapping page in ranges: 6"):
+        pdf_processor.split_pdf(str(src), [
+            {"pages": "even", "output_path": str(tmp_path / "x.pdf")},
+            {"start_page": 5, "end_page": 6, "output_path": str(tmp_path / "y.pdf")},
+        ])
+
+    rotated = tmp_path / "rotated.pdf"
+    r = pdf_processor.rotate_pages(
+        str(src), [{"pages": "-2-last", "degrees": 90}, {"page": 6, "degrees": 180}], str(rotated)
+    )
+    assert r["rotated_pages"] == [5, 6]
+    pages = PdfReader(str(rotated)).pages
+    assert [p.get("/Rotate", 0) for p in pages] == [0, 0, 0, 0, 90, 180]
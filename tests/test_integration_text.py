@@ -23,4 +23,12 @@ def test_extract_text_and_metadata(tmp_path: Path):
 
     meta = pdf_processor.extract_metadata(str(pdf))
     assert meta["page_count"] == 2
-    assert meta["file_size"] > 0
\ No newline at end of file
+    assert meta["file_size"] > 0
+
+def test_explicit_pages_keep_request_order(tmp_path: Path):
+    pdf = make_pdf(tmp_path, pages=4)
+    res = pdf_processor.extract_text_by_page(str(pdf), pages=[4, 2, 4])
+    assert [r["page"] for r in res] == [4, 2, 4]
+    assert "p4" in res[0]["text"] and "p2" in res[1]["text"]
+    ranged = pdf_processor.extract_text_by_page(str(pdf), page_range="3,1")
+    assert [r["page"] for r in ranged] == [1, 3]
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services.lanes import BULK, INTERACTIVE, LaneScheduler, lane_for
+
+
+def sleeper(delay: float, log: list | None = None, label: str = ""):
+    def work():
+        if log is not None:
+            log.append(label)
+        time.sleep(delay)
+        return label
+
+    return work
+
+
+def test_default_lanes_and_override(monkeypatch):
+    monkeypatch.setattr(settings, "interactive_tools", "server_info,get_pdf_info")
+    assert lane_for("get_pdf_info") == INTERACTIVE
+    assert lane_for("pdf_to_images") == BULK
+    assert lane_for("pdf_to_images", "Interactive") == INTERACTIVE
+    assert lane_for("get_pdf_info", "bulk") == BULK
+    with pytest.raises(ValueError):
+        lane_for("get_pdf_info", "urgent")
+
+
+def test_interactive_calls_bypass_saturated_bulk_lane(monkeypatch):
+    monkeypatch.setattr(settings, "interactive_tools", "get_pdf_info")
+    sched = LaneScheduler({INTERACTIVE: 1, BULK: 1})
+
+    async def main():
+        renders = [asyncio.ensure_future(sched.run("pdf_to_images", sleeper(0.3))) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        t0 = time.perf_counter()
+        info = await sched.run("get_pdf_info", sleeper(0, label="info"))
+        elapsed = time.perf_counter() - t0
+        during = sched.snapshot()["lanes"]
+        await asyncio.gather(*renders)
+        return info, elapsed, during
+
+    info, elapsed, during = asyncio.run(main())
+    assert info == "info"
+    assert elapsed < 0.1
+    assert during[BULK]["running"] == 1 and during[BULK]["queue_depth"] == 2
+    assert during[INTERACTIVE]["queue_depth"] == 0
+    lanes = sched.snapshot()["lanes"]
+    assert lanes[BULK]["completed"] == 3 and lanes[BULK]["max_queue_depth"] == 2
+    assert lanes[BULK]["wait_ms"]["max"] >= 250
+    assert lanes[INTERACTIVE]["wait_ms"]["max"] < 50
+
+
+def test_clients_are_served_round_robin():
+    sched = LaneScheduler({BULK: 1})
+    order: list = []
+
+    async def main():
+        jobs = [asyncio.ensure_future(sched.run("merge_pdfs", sleeper(0.1), client="blocker"))]
+        await asyncio.sleep(0.02)
+        for label in ("a1", "a2", "a3"):
+            jobs.append(asyncio.ensure_future(sched.run("merge_pdfs", sleeper(0.01, order, label), client="a")))
+        await asyncio.sleep(0)
+        jobs.append(asyncio.ensure_future(sched.run("merge_pdfs", sleeper(0.01, order, "b1"), client="b")))
+        await asyncio.gather(*jobs)
+
+    asyncio.run(main())
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_cancelled_waiter_frees_its_place():
+    sched = LaneScheduler({BULK: 1})
+    release = threading.Event()
+
+    async def main():
+        first = asyncio.ensure_future(sched.run("split_pdf", release.wait))
+        await asyncio.sleep(0.02)
+        queued = asyncio.ensure_future(sched.run("split_pdf", sleeper(0)))
+        await asyncio.sleep(0.02)
+        assert sched.snapshot()["lanes"][BULK]["queue_depth"] == 1
+        queued.cancel()
+        await asyncio.sleep(0)
+        assert sched.snapshot()["lanes"][BULK]["queue_depth"] == 0
+        release.set()
+        await first
+        return await sched.run("split_pdf", sleeper(0, label="next"))
+
+    assert asyncio.run(main()) == "next"
+    assert sched.snapshot()["lanes"][BULK]["running"] == 0
@@ -0,0 +1,141 @@
+import re
+import shutil
+import subprocess
+import zlib
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from PyPDF2 import PdfReader
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services import image_processor, pdf_processor
+from fastmcp_pdf_server.utils.validators import preflight_pdf
+
+
+def make_pdf(path: Path, pages: int) -> Path:
+    logo = ImageReader(Image.effect_noise((120, 120), 50).convert("RGB"))
+    c = canvas.Canvas(str(path))
+    for i in range(pages):
+        c.drawImage(logo, 50, 600, width=120, height=120)
+        c.drawString(100, 750, f"Linear page {i+1}")
+        c.bookmarkPage(f"p{i}")
+        c.addOutlineEntry(f"Page {i+1}", f"p{i}", level=0)
+        c.showPage()
+    c.save()
+    return path
+
+
+def linearization(path: Path) -> dict:
+    data = path.read_bytes()
+    match = re.match(rb"%PDF-1\.\d\n%[^\n]*\n\d+ 0 obj\n<<(.*?)>>\nendobj\n", data, re.S)
+    assert match, "linearization dictionary must be the first object"
+    lin = {key.decode(): int(value) for key, value in re.findall(rb"/(\w+)\s+(\d+)", match.group(1))}
+    hint = re.search(rb"/H\s*\[\s*(\d+)\s+(\d+)\s*\]", match.group(1))
+    lin["H"] = (int(hint.group(1)), int(hint.group(2)))
+    lin["xref_offset"] = match.end()
+    return lin
+
+
+def assert_linearized(path: Path, pages: int) -> None:
+    data = path.read_bytes()
+    lin = linearization(path)
+    assert lin["Linearized"] == 1
+    assert lin["L"] == len(data)
+    assert lin["N"] == pages
+
+    # First-page xref table follows the dictionary and the file's last startxref points at it
+    assert data[lin["xref_offset"] :].startswith(b"xref\n")
+    assert int(re.findall(rb"startxref\s+(\d+)", data)[-1]) == lin["xref_offset"]
+    # /O is the first page, inside the first /E bytes
+    first_page = data.index(b"\n%d 0 obj\n" % lin["O"])
+    assert b"/Type /Page\n" in data[first_page : data.index(b"endobj", first_page)]
+    assert first_page < lin["E"]
+    # /H points at the hint stream, which decodes to the tables
+    hint_offset, hint_length = lin["H"]
+    hint = data[hint_offset : hint_offset + hint_length]
+    assert re.match(rb"\d+ 0 obj\n<< /Filter /FlateDecode /Length \d+ /S \d+ (/O \d+ )?>>\nstream\n", hint)
+    payload = hint[hint.index(b"stream\n") + 7 : hint.rindex(b"\nendstream")]
+    assert zlib.decompress(payload)
+    assert data[lin["T"] + 1 :].startswith(b"0000000000 65535 f")
+
+    report = preflight_pdf(path)
+    assert report.linearized and report.page_count_hint == pages
+    reader = PdfReader(str(path))
+    assert len(reader.pages) == pages
+    assert "Linear page" in reader.pages[-1].extract_text()
+
+
+def test_merge_split_rotate_linearize(tmp_path: Path):
+    a = make_pdf(tmp_path / "a.pdf", 3)
+    b = make_pdf(tmp_path / "b.pdf", 2)
+    merged = pdf_processor.merge_pdfs([str(a), str(b)], str(tmp_path / "m.pdf"), linearize=True)
+    assert merged["linearized"] is True
+    assert_linearized(tmp_path / "m.pdf", 5)
+    assert len(PdfReader(str(tmp_path / "m.pdf")).outline) == 5
+
+    parts = pdf_processor.split_pdf(
+        str(a), [{"start_page": 1, "end_page": 2, "output_path": str(tmp_path / "s.pdf")}], linearize=True
+    )
+    assert parts[0]["linearized"] is True
+    assert PdfReader(str(tmp_path / "s.pdf")).pages and linearization(tmp_path / "s.pdf")["N"] == 2
+
+    r = pdf_processor.rotate_pages(
+        str(a), [{"page": 2, "degrees": 90}], str(tmp_path / "r.pdf"), optimize=True, linearize=True
+    )
+    assert r["mode"] == "full"
+    assert_linearized(tmp_path / "r.pdf", 3)
+    assert PdfReader(str(tmp_path / "r.pdf")).pages[1].get("/Rotate") == 90
+
+    # Plain writes stay unlinearized
+    plain = pdf_processor.merge_pdfs([str(a)], str(tmp_path / "p.pdf"))
+    assert plain["linearized"] is False
+    assert not preflight_pdf(tmp_path / "p.pdf").linearized
+
+
+def test_rotate_linearize_rejects_incremental(tmp_path: Path):
+    a = make_pdf(tmp_path / "a.pdf", 2)
+    with pytest.raises(ValueError):
+        pdf_processor.rotate_pages(
+            str(a), [{"page": 1, "degrees": 90}], str(tmp_path / "r.pdf"), incremental=True, linearize=True
+        )
+
+
+def test_images_to_pdf_and_compress_linearize(tmp_path: Path):
+    images = []
+    for i in range(3):
+        p = tmp_path / f"img{i}.png"
+        Image.effect_noise((200, 300), 30 + i).convert("RGB").save(p)
+        images.append(str(p))
+    r = image_processor.images_to_pdf(images, str(tmp_path / "imgs.pdf"), optimize=True, linearize=True)
+    assert r["linearized"] is True
+    assert r["output_size"] == (tmp_path / "imgs.pdf").stat().st_size
+    report = preflight_pdf(tmp_path / "imgs.pdf")
+    assert report.linearized and report.page_count_hint == 3
+
+    src = make_pdf(tmp_path / "c.pdf", 2)
+    c = pdf_processor.compress_pdf(str(src), str(tmp_path / "c_out.pdf"), None, linearize=True)
+    assert c["linearized"] is True and c["kept_original"] is False
+    assert_linearized(tmp_path / "c_out.pdf", 2)
+
+
+@pytest.mark.skipif(shutil.which("qpdf") is None, reason="qpdf not installed")
+def test_outputs_pass_qpdf_check_linearization(tmp_path: Path):
+    a = make_pdf(tmp_path / "a.pdf", 3)
+    b = make_pdf(tmp_path / "b.pdf", 2)
+    outputs = [tmp_path / name for name in ("m.pdf", "s.pdf", "r.pdf", "c.pdf", "one.pdf")]
+    pdf_processor.merge_pdfs([str(a), str(b)], str(outputs[0]), linearize=True)
+    pdf_processor.split_pdf(
+        str(a), [{"start_page": 2, "end_page": 3, "output_path": str(outputs[1])}], linearize=True
+    )
+    pdf_processor.rotate_pages(str(b), [{"page": 1, "degrees": 270}], str(outputs[2]), linearize=True)
+    pdf_processor.compress_pdf(str(a), str(outputs[3]), None, linearize=True)
+    pdf_processor.merge_pdfs([str(make_pdf(tmp_path / "single.pdf", 1))], str(outputs[4]), linearize=True)
+    for out in outputs:
+        check = subprocess.run(
+            ["qpdf", "--check-linearization", str(out)], capture_output=True, text=True, timeout=60
+        )
+        # Exit code 3 means warnings, which qpdf also reports for bad hint tables
+        assert check.returncode == 0, f"{out.name}: {check.stdout}{check.stderr}"
+        assert "no linearization errors" in check.stdout
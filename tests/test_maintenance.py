@@ -0,0 +1,83 @@
+import os
+import time
+from pathlib import Path
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import file_manager
+from fastmcp_pdf_server.services.maintenance import MaintenanceScheduler
+
+
+def _file(name: str, size: int, accessed: float) -> Path:
+    p = file_manager.write_bytes(name, b"x" * size)
+    os.utime(p, (accessed, accessed))
+    return p
+
+
+def test_quota_evicts_least_recently_accessed_first():
+    now = time.time()
+    oldest = _file("a.pdf", 1000, now - 300)
+    middle = _file("b.pdf", 1000, now - 200)
+    newest = _file("c.pdf", 1000, now - 100)
+    file_manager.touch_access(oldest)  # reading a file makes it recent again
+
+    stats = file_manager.sweep(quota_bytes=2000)
+    assert stats.evicted_files == 1 and stats.evicted_bytes == 1000
+    assert stats.remaining_bytes == 2000
+    assert oldest.exists() and not middle.exists() and newest.exists()
+
+
+def test_quota_never_evicts_leased_files():
+    now = time.time()
+    a = _file("a.pdf", 1000, now - 300)
+    b = _file("b.pdf", 1000, now - 200)
+    with file_manager.lease(a):
+        stats = file_manager.sweep(quota_bytes=500)
+    assert a.exists() and not b.exists()
+    assert stats.evicted_files == 1
+
+
+def test_scheduler_reports_reclaimed_bytes(monkeypatch):
+    monkeypatch.setattr(settings, "temp_quota_mb", 0)
+    old = time.time() - settings.temp_retention_seconds - 10
+    _file("old.pdf", 500, old)
+    sched = MaintenanceScheduler(interval_seconds=0.05)
+    sched.start()
+    try:
+        deadline = time.time() + 5
+        while sched.metrics.runs == 0 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        sched.stop()
+    snap = sched.snapshot()
+    assert snap["runs"] >= 1
+    assert snap["expired_files"] == 1 and snap["expired_bytes"] == 500
+    assert snap["running"] is False
+
+
+def test_quota_evicts_stale_cache_before_recent_outputs():
+    now = time.time()
+    cache = file_manager.temp_dir() / ".cache" / "page_text" / "doc.json"
+    with file_manager.atomic_writer(cache) as fh:
+        fh.write(b"{}" * 1_500_000)
+    os.utime(cache, (now - 500, now - 500))
+    outputs = [_file(f"out{i}.pdf", 100_000, now - 100 + i) for i in range(3)]
+    in_flight = file_manager.temp_dir() / ".out3.pdf.abcd1234.tmp"
+    in_flight.write_bytes(b"x" * 10)
+    os.utime(in_flight, (now - 900, now - 900))
+
+    stats = file_manager.sweep(quota_bytes=2_000_000)
+    assert not cache.exists()
+    assert all(p.exists() for p in outputs) and in_flight.exists()
+    assert stats.evicted_files == 1 and stats.evicted_bytes == 3_000_000
+    assert stats.remaining_bytes == 300_010
+
+
+def test_pinned_files_do_not_force_evicting_everything_else():
+    now = time.time()
+    big = _file("big.pdf", 5000, now - 500)
+    small = [_file(f"s{i}.pdf", 100, now - 100 + i) for i in range(3)]
+    with file_manager.lease(big):
+        stats = file_manager.sweep(quota_bytes=1000)
+    assert big.exists() and all(p.exists() for p in small)
+    assert stats.evicted_files == 0
+    assert stats.pinned_bytes == 5000 and stats.remaining_bytes == 5300
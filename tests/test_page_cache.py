@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+from pathlib import Path
+
+from PyPDF2 import PdfReader, PdfWriter
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import page_cache, pdf_processor
+from fastmcp_pdf_server.services.text_engines import ENGINES, PyPDF2Engine, register_engine
+
+
+def make_pdf(path: Path, texts: list[str]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    c = canvas.Canvas(str(path), invariant=1)
+    for text in texts:
+        c.drawString(100, 750, text)
+        c.showPage()
+    c.save()
+    return path
+
+
+def without_id(src: Path, dest: Path) -> Path:
+    """Rewrite ``src`` without a trailer /ID (PdfWriter does not add one)."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    writer = PdfWriter()
+    writer.append_pages_from_reader(PdfReader(str(src)))
+    with open(dest, "wb") as fh:
+        writer.write(fh)
+    return dest
+
+
+class CountingEngine(PyPDF2Engine):
+    """Records which pages actually reach the extractor."""
+
+    name = "counting"
+
+    def __init__(self):
+        self.pages: list[int] = []
+
+    @contextmanager
+    def open(self, pdf_path):
+        with super().open(pdf_path) as doc:
+            inner = doc.extract_page
+
+            def extract_page(page_no):
+                self.pages.append(page_no)
+                return inner(page_no)
+
+            doc.extract_page = extract_page
+            yield doc
+
+
+def test_revision_only_reextracts_changed_pages(tmp_path: Path):
+    engine = CountingEngine()
+    register_engine(engine)
+    try:
+        v1 = make_pdf(tmp_path / "v1" / "report.pdf", ["alpha", "beta", "gamma", "delta"])
+        v2 = make_pdf(tmp_path / "v2" / "report.pdf", ["alpha", "BETA v2", "gamma", "delta"])
+
+        first = pdf_processor.extract_text(str(v1), engine="counting")
+        assert first.changed_pages == [1, 2, 3, 4]
+        assert engine.pages == [1, 2, 3, 4]
+
+        engine.pages.clear()
+        second = pdf_processor.extract_text(str(v2), engine="counting")
+        assert second.changed_pages == [2]
+        assert engine.pages == [2]
+        assert "BETA v2" in second.text and "gamma" in second.text
+
+        engine.pages.clear()
+        by_page = pdf_processor.extract_text_by_page(str(v2), page_range="2-3", engine="counting")
+        assert [(r["page"], r["changed"]) for r in by_page] == [(2, False), (3, False)]
+        assert engine.pages == []
+
+        # Per-call override bypasses the cache entirely
+        uncached = pdf_processor.extract_text(str(v2), engine="counting", use_cache=False)
+        assert uncached.changed_pages is None
+        assert engine.pages == [1, 2, 3, 4]
+    finally:
+        ENGINES.pop("counting", None)
+
+
+def test_cache_setting_disables_fingerprinting(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "page_text_cache", False)
+    pdf = make_pdf(tmp_path / "doc.pdf", ["one", "two"])
+    res = pdf_processor.extract_text(str(pdf), engine="pypdf2")
+    assert res.changed_pages is None
+    assert not (Path(settings.temp_dir) / ".cache").exists()
+    assert pdf_processor.extract_text(str(pdf), engine="pypdf2", use_cache=True).changed_pages == [1, 2]
+
+
+def test_documents_without_id_are_keyed_by_content(tmp_path: Path):
+    a = without_id(make_pdf(tmp_path / "src" / "a.pdf", ["alpha", "beta"]), tmp_path / "a" / "report.pdf")
+    b = without_id(make_pdf(tmp_path / "src" / "b.pdf", ["other", "file"]), tmp_path / "b" / "report.pdf")
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(a.read_bytes())
+    keys = {p: page_cache.document_key(PdfReader(str(p))) for p in (a, b, copy)}
+    assert keys[a].startswith("fp:")
+    # Same name, different content: separate entries; same content elsewhere: shared
+    assert keys[a] != keys[b]
+    assert keys[a] == keys[copy]
+
+    assert pdf_processor.extract_text(str(a), engine="pypdf2").changed_pages == [1, 2]
+    assert pdf_processor.extract_text(str(b), engine="pypdf2").changed_pages == [1, 2]
+    # b did not overwrite a's entry
+    assert pdf_processor.extract_text(str(copy), engine="pypdf2").changed_pages == []
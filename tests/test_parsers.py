@@ -1,4 +1,6 @@
-from fastmcp_pdf_server.utils.parsers import parse_page_range, clamp_pages
+import pytest
+
+from fastmcp_pdf_server.utils.parsers import PageSelection, clamp_pages, parse_page_range, select_pages
 
 
 def test_parse_page_range():
@@ -14,4 +16,37 @@ def test_clamp_pages_oob():
         clamp_pages([0, 6], 5)
         assert False, "should have raised"
     except ValueError:
-        pass
\ No newline at end of file
+        pass
+
+
+def test_page_selection_grammar():
+    assert list(PageSelection.parse("1-3,5,7-9", 10)) == [1, 2, 3, 5, 7, 8, 9]
+    assert list(PageSelection.parse("last,-3", 10)) == [8, 10]
+    assert list(PageSelection.parse("-3-last", 10)) == [8, 9, 10]
+    assert list(PageSelection.parse("8-", 10)) == [8, 9, 10]
+    assert list(PageSelection.parse("odd", 7)) == [1, 3, 5, 7]
+    assert list(PageSelection.parse("even,1", 7)) == [1, 2, 4, 6]
+    assert list(PageSelection.parse("1-20:5,3-:7", 20)) == [1, 3, 6, 10, 11, 16, 17]
+    # Overlapping and adjacent terms merge into compact runs
+    assert PageSelection.parse("odd,even", 9).runs == ((1, 9, 1),)
+    assert str(PageSelection.parse("4-6,1-3,9", 9)) == "1-6,9"
+
+
+def test_page_selection_is_not_expanded():
+    n = 10**12
+    sel = PageSelection.parse("2-:3,last", n)
+    assert len(sel) == (n - 2) // 3 + 2
+    assert 5 in sel and 6 not in sel and n in sel
+    assert sel.runs[-1] == (n, n, 1)
+    assert PageSelection.parse("odd", n).first_common(PageSelection.parse("even", n)) is None
+    assert PageSelection.parse("odd", n).first_common(PageSelection.parse("50-:5", n)) == 55
+
+
+def test_page_selection_bounds():
+    for expr in ("0", "11", "3-12", "-11", "5-2", "x", "1-3:0"):
+        with pytest.raises(ValueError):
+            PageSelection.parse(expr, 10)
+    with pytest.raises(ValueError, match="out of bounds"):
+        select_pages(5, pages=[6])
+    assert list(select_pages(3)) == [1, 2, 3]
+    assert list(select_pages(5, pages=[4, 2, 4], page_range="1")) == [2, 4]
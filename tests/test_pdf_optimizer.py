@@ -0,0 +1,125 @@
+from pathlib import Path
+
+from PIL import Image
+from PyPDF2 import PdfReader
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services import pdf_processor
+
+
+def photo(size: int = 1600) -> Image.Image:
+    """Photo-like image: smooth gradients plus noise (poor Flate, good JPEG)."""
+    return Image.merge(
+        "RGB",
+        (
+            Image.radial_gradient("L").resize((size, size)),
+            Image.effect_noise((size, size), 40),
+            Image.linear_gradient("L").resize((size, size)),
+        ),
+    )
+
+
+def make_image_pdf(path: Path, pages: int) -> Path:
+    c = canvas.Canvas(str(path))
+    img = ImageReader(photo())
+    for i in range(pages):
+        c.drawString(100, 750, f"Scanned page {i+1}")
+        c.drawImage(img, 0, 0, width=595, height=842)
+        c.showPage()
+    c.save()
+    return path
+
+
+def make_text_pdf(path: Path, pages: int) -> Path:
+    c = canvas.Canvas(str(path))
+    for i in range(pages):
+        c.drawString(100, 750, f"Text page {i+1}")
+        c.showPage()
+    c.save()
+    return path
+
+
+def test_compress_pdf_downsamples_images(tmp_path: Path):
+    src = make_image_pdf(tmp_path / "scan.pdf", 2)
+    out = tmp_path / "small.pdf"
+    r = pdf_processor.compress_pdf(str(src), str(out), target_dpi=100)
+    assert r["input_size"] == src.stat().st_size
+    assert r["output_size"] == out.stat().st_size
+    assert r["output_size"] < r["input_size"] / 4
+    assert r["saved_bytes"] == r["input_size"] - r["output_size"]
+    assert r["optimization"]["images_downsampled"] == 1
+
+    reader = PdfReader(str(out))
+    assert len(reader.pages) == 2
+    assert "Scanned page 2" in reader.pages[1].extract_text()
+    img = next(iter(reader.pages[0]["/Resources"]["/XObject"].values())).get_object()
+    assert img["/Filter"] == "/DCTDecode"
+    assert img["/Width"] < 1600
+
+
+def test_compress_pdf_lossless_keeps_images(tmp_path: Path):
+    src = make_image_pdf(tmp_path / "scan.pdf", 1)
+    out = tmp_path / "lossless.pdf"
+    r = pdf_processor.compress_pdf(str(src), str(out), target_dpi=None)
+    assert r["optimization"]["images_downsampled"] == 0
+    assert r["output_size"] <= r["input_size"]
+    img = next(iter(PdfReader(str(out)).pages[0]["/Resources"]["/XObject"].values())).get_object()
+    assert img["/Width"] == 1600
+
+
+def test_merge_optimize_dedupes_repeated_inputs(tmp_path: Path):
+    a = make_image_pdf(tmp_path / "a.pdf", 1)
+    plain = pdf_processor.merge_pdfs([str(a), str(a)], str(tmp_path / "plain.pdf"), dedupe=False)
+    optimized = pdf_processor.merge_pdfs([str(a), str(a)], str(tmp_path / "opt.pdf"), optimize=True)
+    assert "optimization" not in plain and "dedupe" not in plain
+    assert optimized["optimization"]["objects_deduplicated"] >= 1
+    assert optimized["output_size"] < plain["output_size"] * 0.6
+
+    reader = PdfReader(optimized["output_path"])
+    assert len(reader.pages) == 2
+    assert "Scanned page 1" in reader.pages[1].extract_text()
+
+
+def test_merge_dedupes_resources_shared_across_documents(tmp_path: Path):
+    logo = Image.effect_noise((300, 300), 60).convert("RGB")
+    inputs = []
+    for i in range(3):
+        p = tmp_path / f"invoice{i}.pdf"
+        c = canvas.Canvas(str(p), invariant=1)
+        c.drawImage(ImageReader(logo), 50, 600, width=150, height=150)
+        c.drawString(50, 550, f"Invoice {i} total {i * 10}")
+        c.showPage()
+        c.save()
+        inputs.append(str(p))
+
+    plain = pdf_processor.merge_pdfs(inputs, str(tmp_path / "plain.pdf"), dedupe=False)
+    merged = pdf_processor.merge_pdfs(inputs, str(tmp_path / "merged.pdf"))
+    assert merged["dedupe"]["objects_deduplicated"] >= 2
+    assert merged["dedupe"]["bytes_saved"] > 0
+    assert "optimization" not in merged
+    assert merged["output_size"] < plain["output_size"] * 0.5
+
+    reader = PdfReader(merged["output_path"])
+    logos = {
+        xobjects.raw_get(name).idnum
+        for xobjects in (page["/Resources"]["/XObject"] for page in reader.pages)
+        for name in xobjects
+    }
+    assert len(logos) == 1
+    assert "Invoice 2" in reader.pages[2].extract_text()
+
+
+def test_split_optimize_reports_stats(tmp_path: Path):
+    src = make_text_pdf(tmp_path / "t.pdf", 4)
+    parts = pdf_processor.split_pdf(
+        str(src),
+        [
+            {"start_page": 1, "end_page": 2, "output_path": str(tmp_path / "p1.pdf")},
+            {"start_page": 3, "end_page": 4, "output_path": str(tmp_path / "p2.pdf")},
+        ],
+        optimize=True,
+    )
+    for part in parts:
+        assert "optimization" in part
+        assert len(PdfReader(part["output_path"]).pages) == 2
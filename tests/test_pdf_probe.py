@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services.pdf_probe import probe_pdf
+
+
+def make_pdf(tmp_path: Path, pages: int = 3) -> Path:
+    p = tmp_path / "probe.pdf"
+    c = canvas.Canvas(str(p))
+    c.setTitle("Probe Title")
+    for i in range(pages):
+        c.drawString(100, 750, f"Probe p{i+1}")
+        c.showPage()
+    c.save()
+    return p
+
+
+def test_probe_reads_count_from_trailer(tmp_path: Path):
+    pdf = make_pdf(tmp_path, 3)
+    probe = probe_pdf(pdf)
+    assert probe.method == "trailer"
+    assert probe.page_count == 3
+    assert probe.encrypted is False
+    assert probe.linearized is False
+    assert probe.pdf_version.startswith("%PDF-1.")
+    assert probe.info["title"] == "Probe Title"
+    assert probe.file_size == pdf.stat().st_size
+
+
+def test_probe_falls_back_on_malformed_count(tmp_path: Path):
+    pdf = make_pdf(tmp_path, 3)
+    data = pdf.read_bytes()
+    assert b"/Count 3" in data
+    pdf.write_bytes(data.replace(b"/Count 3", b"/Cxunt 3"))
+    probe = probe_pdf(pdf)
+    assert probe.method == "full"
+    assert probe.page_count == 3
+
+
+def test_probe_falls_back_on_malformed_trailer(tmp_path: Path):
+    pdf = make_pdf(tmp_path, 3)
+    data = pdf.read_bytes()
+    tail = data.rindex(b"startxref")
+    # startxref past the end of the file: preflight rejects it, PyPDF2 recovers
+    pdf.write_bytes(data[:tail] + b"startxref\n99999999\n%%EOF\n")
+    probe = probe_pdf(pdf)
+    assert probe.page_count == 3 and probe.linearized is False
+
+    # No trailer at all: nothing to read, but the probe still answers
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(data[: data.rindex(b"trailer")])
+    probe = probe_pdf(broken)
+    assert probe.method == "full"
+    assert probe.page_count is None
+    assert probe.pdf_version.startswith("%PDF-1.")
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services import pipeline
+
+
+def make_pdf(tmp_path: Path, label: str, pages: int) -> Path:
+    p = tmp_path / f"{label}.pdf"
+    c = canvas.Canvas(str(p))
+    for i in range(pages):
+        c.drawString(100, 750, f"{label} p{i+1}")
+        c.showPage()
+    c.save()
+    return p
+
+
+def page_labels(path: str) -> list[str]:
+    return [page.extract_text().strip() for page in PdfReader(path).pages]
+
+
+def test_merge_rotate_split_and_extract(tmp_path: Path):
+    a = make_pdf(tmp_path, "A", 3)
+    b = make_pdf(tmp_path, "B", 4)
+    res = pipeline.run_pipeline(
+        [
+            {"op": "merge", "inputs": [str(a), str(b)]},
+            {"op": "rotate", "pages": "3,7", "degrees": 90},
+            {"op": "split", "ranges": [
+                {"pages": "1-3", "output_path": str(tmp_path / "ch1.pdf")},
+                {"start_page": 4, "end_page": 7, "output_path": str(tmp_path / "ch2.pdf")},
+            ]},
+            {"op": "select", "pages": "odd"},
+            {"op": "extract_text", "pages": "2-"},
+            {"op": "write", "output_path": str(tmp_path / "odd.pdf"), "linearize": True},
+        ]
+    )
+    assert res.inputs_parsed == 2 and res.page_count == 4
+    assert [s["page_count"] for s in res.steps] == [7, 7, 7, 4, 4, 4]
+    assert [o["pages"] for o in res.outputs] == [3, 4, 4]
+    assert res.outputs[2]["linearized"] is True
+
+    assert page_labels(str(tmp_path / "ch1.pdf")) == ["A p1", "A p2", "A p3"]
+    ch2 = PdfReader(str(tmp_path / "ch2.pdf"))
+    assert [p.get("/Rotate", 0) for p in ch2.pages] == [0, 0, 0, 90]
+    assert page_labels(str(tmp_path / "odd.pdf")) == ["A p1", "A p3", "B p2", "B p4"]
+    assert [(t["page"], t["text"].strip()) for t in res.texts] == [(2, "A p3"), (3, "B p2"), (4, "B p4")]
+
+
+def test_invalid_pipelines_fail_before_writing(tmp_path: Path):
+    a = make_pdf(tmp_path, "A", 2)
+    out = tmp_path / "out.pdf"
+    with pytest.raises(ValueError, match="first step"):
+        pipeline.run_pipeline([{"op": "write", "output_path": str(out)}])
+    with pytest.raises(ValueError, match="no split, write"):
+        pipeline.run_pipeline([{"op": "merge", "inputs": [str(a)]}, {"op": "select", "pages": "1"}])
+    with pytest.raises(ValueError, match="degrees"):
+        pipeline.run_pipeline(
+            [
+                {"op": "merge", "inputs": [str(a)]},
+                {"op": "write", "output_path": str(out)},
+                {"op": "rotate", "page": 1, "degrees": 45},
+            ]
+        )
+    assert not out.exists()
+    with pytest.raises(ValueError, match="out of bounds"):
+        pipeline.run_pipeline(
+            [{"op": "merge", "inputs": [str(a)]}, {"op": "select", "pages": "3"}, {"op": "extract_text"}]
+        )
+
+
+def test_page_lists_from_json(tmp_path: Path):
+    a = make_pdf(tmp_path, "A", 5)
+    res = pipeline.run_pipeline(
+        [
+            {"op": "merge", "inputs": [str(a)]},
+            {"op": "select", "pages": [5, 1, 3]},
+            {"op": "rotate", "pages": [2], "degrees": 180},
+            {"op": "split", "ranges": [
+                {"pages": [1, 3], "output_path": str(tmp_path / "ends.pdf")},
+                {"pages": "2", "output_path": str(tmp_path / "middle.pdf")},
+            ]},
+            {"op": "extract_text", "pages": [3]},
+        ]
+    )
+    # select keeps document order, whatever the list order
+    assert page_labels(str(tmp_path / "ends.pdf")) == ["A p1", "A p5"]
+    assert PdfReader(str(tmp_path / "middle.pdf")).pages[0].get("/Rotate") == 180
+    assert [(t["page"], t["text"].strip()) for t in res.texts] == [(3, "A p5")]
+
+
+def test_page_bounds_are_checked_before_the_first_write(tmp_path: Path):
+    a = make_pdf(tmp_path, "A", 4)
+    out = tmp_path / "out.pdf"
+    part = tmp_path / "part.pdf"
+    for late_step, message in [
+        ({"op": "rotate", "page": 3, "degrees": 90}, "Step 4: .*out of bounds"),
+        ({"op": "select", "pages": [1, 9]}, "Step 4: .*out of bounds"),
+        ({"op": "split", "ranges": [{"start_page": 1, "end_page": 3, "output_path": str(part)}]}, "Step 4: Invalid"),
+        ({"op": "extract_text", "pages": "2-5"}, "Step 4: .*out of bounds"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            pipeline.run_pipeline(
+                [
+                    {"op": "merge", "inputs": [str(a)]},
+                    {"op": "select", "pages": "1-2"},
+                    {"op": "write", "output_path": str(out)},
+                    late_step,
+                ]
+            )
+        assert not out.exists() and not part.exists()
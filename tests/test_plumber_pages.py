@@ -0,0 +1,75 @@
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import pdf_processor
+from fastmcp_pdf_server.services.file_manager import open_input
+from fastmcp_pdf_server.services.text_engines import PlumberPages
+
+
+def make_pdf(tmp_path: Path, pages: int, lines: int = 5) -> Path:
+    p = tmp_path / "large.pdf"
+    c = canvas.Canvas(str(p))
+    for i in range(pages):
+        for line in range(lines):
+            c.drawString(72, 750 - line * 30, f"Page {i+1} line {line} lorem ipsum dolor sit amet")
+        c.showPage()
+    c.save()
+    return p
+
+
+def test_memory_stays_flat_across_pages(tmp_path: Path):
+    pdf = make_pdf(tmp_path, 60)
+    samples = []
+    tracemalloc.start()
+    try:
+        with open_input(pdf) as src, PlumberPages(src, recycle_pages=20) as pages:
+            for pno in range(1, pages.page_count + 1):
+                with pages.page(pno) as page:
+                    assert f"Page {pno} line 0" in page.extract_text()
+                samples.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+    # Later windows stay within one window's footprint; a retained page alone is ~400 KB
+    assert max(samples[20:]) - max(samples[:20]) < 512 * 1024
+
+
+def test_default_extract_text_memory_stays_flat(tmp_path: Path, monkeypatch):
+    # Whole tool path with default settings: no recycling, page text cache on
+    assert settings.pdfplumber_recycle_pages == 0
+    pdf = make_pdf(tmp_path, 200)
+    samples = []
+    real_span = pdf_processor.span
+
+    @contextmanager
+    def sampling_span(name, **attrs):
+        with real_span(name, **attrs):
+            yield
+        if name == "page":
+            samples.append(tracemalloc.get_traced_memory()[0])
+
+    monkeypatch.setattr(pdf_processor, "span", sampling_span)
+    tracemalloc.start()
+    try:
+        result = pdf_processor.extract_text(str(pdf))
+    finally:
+        tracemalloc.stop()
+    assert result.engine == "pdfplumber" and result.page_count == 200 == len(samples)
+    # Document-level object caches, the collected text and uncollected cycles
+    # add a few KB a page (~0.5 MB here); keeping each page's layout would
+    # add ~100 MB
+    assert max(samples[-40:]) - max(samples[:40]) < 2 * 1024 * 1024
+
+
+def test_recycling_keeps_text_identical(tmp_path: Path, monkeypatch):
+    pdf = make_pdf(tmp_path, 7, lines=2)
+    baseline = pdf_processor.extract_text(str(pdf), engine="pdfplumber", use_cache=False)
+    monkeypatch.setattr(settings, "pdfplumber_recycle_pages", 2)
+    recycled = pdf_processor.extract_text(str(pdf), engine="pdfplumber", use_cache=False)
+    assert recycled.text == baseline.text
+    pages = pdf_processor.extract_text_by_page(str(pdf), page_range="2,6-7", engine="pdfplumber", use_cache=False)
+    assert [p["page"] for p in pages] == [2, 6, 7]
+    assert "Page 7 line 1" in pages[2]["text"]
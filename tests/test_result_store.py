@@ -0,0 +1,39 @@
+import hashlib
+from pathlib import Path
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services.result_store import maybe_spill, read_result
+
+
+def test_small_results_stay_inline(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "temp_dir", str(tmp_path))
+    items = [{"page": 1, "text": "short"}]
+    assert maybe_spill("t", items) is items
+
+
+def test_large_results_spill_to_ndjson(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "temp_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "inline_result_max_bytes", 1024)
+    items = [{"page": i, "text": "x" * 100} for i in range(1, 51)]
+    res = maybe_spill("extract_text_by_page", items)
+    handle = res["result_handle"]
+    assert handle["count"] == 50
+    assert len(res["preview"]) == settings.result_preview_items
+    data = Path(handle["path"]).read_bytes()
+    assert handle["bytes"] == len(data)
+    assert handle["sha256"] == hashlib.sha256(data).hexdigest()
+
+    first = read_result(handle["path"], offset=0, limit=20)
+    assert [i["page"] for i in first["items"]] == list(range(1, 21))
+    assert first["next_offset"] == 20
+    last = read_result(handle["path"], offset=40, limit=20)
+    assert [i["page"] for i in last["items"]] == list(range(41, 51))
+    assert last["next_offset"] is None
+
+
+def test_inline_flag_overrides_policy(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "temp_dir", str(tmp_path))
+    items = [{"a": 1}]
+    assert "result_handle" in maybe_spill("t", items, inline=False)
+    monkeypatch.setattr(settings, "inline_result_max_bytes", 1)
+    assert maybe_spill("t", items, inline=True) is items
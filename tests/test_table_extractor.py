@@ -0,0 +1,72 @@
+import csv
+from pathlib import Path
+
+import pytest
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import PageBreak, SimpleDocTemplate, Table, TableStyle
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import table_extractor
+
+
+def make_table_pdf(path: Path, pages: int, label: str = "Q") -> Path:
+    story = []
+    for i in range(pages):
+        rows = [["Region", "Revenue", "Cost"]] + [
+            [f"{label}{i+1}-R{r}", str(100 * r + i), str(50 * r)] for r in range(1, 4)
+        ]
+        table = Table(rows)
+        table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.black)]))
+        story += [table, PageBreak()]
+    SimpleDocTemplate(str(path), pagesize=A4).build(story[:-1])
+    return path
+
+
+def test_extract_tables_rows_and_cache(tmp_path: Path):
+    pdf = make_table_pdf(tmp_path / "report.pdf", 3)
+    first = table_extractor.extract_tables(str(pdf))
+    assert first.page_count == 3 and first.extracted_pages == [1, 2, 3]
+    assert [t["page"] for t in first.tables] == [1, 2, 3]
+    assert first.tables[1]["rows"][0] == ["Region", "Revenue", "Cost"]
+    assert first.tables[1]["rows"][2] == ["Q2-R2", "201", "100"]
+
+    again = table_extractor.extract_tables(str(pdf), page_range="2-3")
+    assert again.extracted_pages == []
+    assert again.tables == first.tables[1:]
+
+    # Different settings are cached separately
+    text = table_extractor.extract_tables(str(pdf), pages=[1], table_settings={"vertical_strategy": "text"})
+    assert text.extracted_pages == [1]
+
+    uncached = table_extractor.extract_tables(str(pdf), pages=[1], use_cache=False)
+    assert uncached.extracted_pages == [1]
+
+
+def test_extract_tables_parallel_matches_inline(tmp_path: Path, monkeypatch):
+    pdf = make_table_pdf(tmp_path / "big.pdf", 6)
+    inline = table_extractor.extract_tables(str(pdf), use_cache=False)
+
+    monkeypatch.setattr(settings, "table_workers", 2)
+    monkeypatch.setattr(table_extractor, "PARALLEL_MIN_PAGES", 2)
+    try:
+        parallel = table_extractor.extract_tables(str(pdf), use_cache=False)
+    finally:
+        table_extractor.shutdown_pool()
+    assert parallel.tables == inline.tables
+    assert len(parallel.tables) == 6
+
+
+def test_write_csv_and_invalid_settings(tmp_path: Path):
+    pdf = make_table_pdf(tmp_path / "csv.pdf", 1)
+    res = table_extractor.extract_tables(str(pdf))
+    written = table_extractor.write_csv(res.tables)
+    assert written[0]["row_count"] == 4 and written[0]["column_count"] == 3
+    with open(written[0]["path"], newline="", encoding="utf-8") as fh:
+        rows = list(csv.reader(fh))
+    assert rows[1] == ["Q1-R1", "100", "50"]
+
+    with pytest.raises(ValueError):
+        table_extractor.extract_tables(str(pdf), table_settings={"bogus": 1})
+    with pytest.raises(ValueError):
+        table_extractor.extract_tables(str(pdf), table_settings={"vertical_strategy": "nope"})
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services import pdf_processor
+from fastmcp_pdf_server.services.text_engines import TextEngine, available_engines, get_engine
+
+
+def make_pdf(tmp_path: Path, pages: int = 3) -> Path:
+    p = tmp_path / "engines.pdf"
+    c = canvas.Canvas(str(p))
+    for i in range(pages):
+        c.drawString(100, 750, f"Engine test page {i+1}")
+        c.showPage()
+    c.save()
+    return p
+
+
+def test_engines_agree_on_plain_text(tmp_path: Path):
+    pdf = make_pdf(tmp_path)
+    for name in ("pdfplumber", "pypdf2"):
+        res = pdf_processor.extract_text(str(pdf), engine=name)
+        assert res.engine == name
+        assert res.page_count == 3
+        assert "Engine test page 2" in res.text
+
+
+def test_auto_prefers_fast_engine_for_clean_text(tmp_path: Path):
+    pdf = make_pdf(tmp_path)
+    assert get_engine("auto", pdf).name == "pypdf2"
+    pages = pdf_processor.extract_text_by_page(str(pdf), page_range="2-3", engine="auto")
+    assert [p["page"] for p in pages] == [2, 3]
+
+
+def test_auto_falls_back_when_no_text(tmp_path: Path):
+    p = tmp_path / "blank.pdf"
+    c = canvas.Canvas(str(p))
+    c.rect(100, 100, 200, 200)
+    c.showPage()
+    c.save()
+    assert get_engine("auto", p).name == "pdfplumber"
+
+
+def test_unknown_engine(tmp_path: Path):
+    pdf = make_pdf(tmp_path, 1)
+    assert "auto" in available_engines()
+    with pytest.raises(ValueError):
+        pdf_processor.extract_text(str(pdf), engine="nope")
+
+
+def test_engines_must_implement_open():
+    class Incomplete(TextEngine):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        TextEngine()
+    with pytest.raises(TypeError, match="open"):
+        Incomplete()
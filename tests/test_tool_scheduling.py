@@ -0,0 +1,71 @@
+import asyncio
+import base64
+import threading
+from pathlib import Path
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services import coalescing
+
+
+fastmcp = pytest.importorskip("fastmcp")
+from fastmcp_pdf_server.tools import conversion, text_extraction  # noqa: E402
+
+
+def make_pdf(tmp_path: Path) -> Path:
+    p = tmp_path / "tools.pdf"
+    c = canvas.Canvas(str(p))
+    c.drawString(100, 750, "scheduled")
+    c.showPage()
+    c.save()
+    return p
+
+
+@pytest.fixture
+def app():
+    server = fastmcp.FastMCP("test")
+    text_extraction.register(server)
+    conversion.register(server)
+    return server
+
+
+def call(app, tool: str, **arguments):
+    return asyncio.run(app.call_tool(tool, arguments))
+
+
+def test_flight_keys_are_hashed_in_lane_workers(app, tmp_path: Path, monkeypatch):
+    threads = []
+    digest = coalescing.content_digest
+
+    def recording_digest(path):
+        threads.append(threading.current_thread().name)
+        return digest(path)
+
+    monkeypatch.setattr(coalescing, "content_digest", recording_digest)
+    pdf = make_pdf(tmp_path)
+    call(app, "extract_text", file=str(pdf), engine="pypdf2")
+    call(app, "extract_metadata", file=str(pdf))
+    call(app, "extract_images", file_path=str(pdf), output_dir=str(tmp_path / "imgs"))
+    assert len(threads) == 3
+    assert all(name.startswith("lane-") for name in threads), threads
+
+
+def test_inline_payloads_are_resolved_in_lane_workers(app, tmp_path: Path, monkeypatch):
+    threads = []
+    resolve = text_extraction.resolve_to_path
+
+    def recording_resolve(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return resolve(*args, **kwargs)
+
+    monkeypatch.setattr(text_extraction, "resolve_to_path", recording_resolve)
+    encoded = base64.b64encode(make_pdf(tmp_path).read_bytes()).decode("ascii")
+    payload = {"base64": encoded, "filename": "in.pdf"}
+    result = call(app, "extract_text", file=payload, engine="pypdf2")
+    assert "scheduled" in result.structured_content["text"]
+    call(app, "extract_text_by_page", file=payload, engine="pypdf2")
+    call(app, "extract_tables", file=payload)
+    call(app, "extract_metadata", file=payload)
+    assert len(threads) == 4
+    assert all(name.startswith("lane-") for name in threads), threads
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import pdf_processor, table_extractor
+from fastmcp_pdf_server.utils import tracing
+
+
+def make_pdf(path: Path, pages: int) -> Path:
+    c = canvas.Canvas(str(path))
+    for i in range(pages):
+        c.drawString(100, 700, f"Page {i+1}")
+        c.showPage()
+    c.save()
+    return path
+
+
+def run_traced(name: str, fn):
+    @tracing.traced(name)
+    async def tool() -> dict:
+        result = await asyncio.to_thread(fn)
+        return {"result": result, "meta": {"operation_id": "op-1"}}
+
+    return asyncio.run(tool())
+
+
+def read_events(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_spans_nest_export_and_summarize(tmp_path: Path, monkeypatch):
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(settings, "trace_file", str(trace_file))
+    monkeypatch.setattr(settings, "trace_meta", True)
+    pdf = make_pdf(tmp_path / "doc.pdf", 3)
+
+    res = run_traced("extract_text", lambda: pdf_processor.extract_text(str(pdf), engine="pypdf2", use_cache=False))
+    summary = res["meta"]["trace"]
+    assert summary["trace_id"] == "op-1"
+    assert summary["phases"]["page"]["count"] == 3
+    assert {"validate", "open", "parse"} <= set(summary["phases"])
+
+    events = read_events(trace_file)
+    assert all(ev["ph"] == "X" and ev["args"]["trace_id"] == "op-1" for ev in events)
+    root = next(ev for ev in events if ev["name"] == "extract_text")
+    assert root["args"]["parent_id"] is None
+    pages = [ev for ev in events if ev["name"] == "page"]
+    assert sorted(ev["args"]["page"] for ev in pages) == [1, 2, 3]
+    assert {ev["args"]["parent_id"] for ev in pages} == {root["args"]["span_id"]}
+
+
+def test_spans_are_noops_when_disabled(tmp_path: Path):
+    assert not tracing.enabled()
+    pdf = make_pdf(tmp_path / "doc.pdf", 1)
+    res = run_traced("extract_text", lambda: pdf_processor.extract_text(str(pdf), use_cache=False))
+    assert "trace" not in res["meta"]
+    with tracing.span("page"):
+        assert tracing.carrier() is None
+
+
+def test_spans_cross_the_table_worker_pool(tmp_path: Path, monkeypatch):
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(settings, "trace_file", str(trace_file))
+    monkeypatch.setattr(settings, "table_workers", 2)
+    monkeypatch.setattr(table_extractor, "PARALLEL_MIN_PAGES", 2)
+    pdf = make_pdf(tmp_path / "doc.pdf", 4)
+    try:
+        run_traced("extract_tables", lambda: table_extractor.extract_tables(str(pdf), use_cache=False))
+    finally:
+        table_extractor.shutdown_pool()
+
+    events = read_events(trace_file)
+    ids = {ev["args"]["span_id"] for ev in events}
+    chunks = [ev for ev in events if ev["name"] == "chunk"]
+    assert chunks and all(ev["pid"] != os.getpid() for ev in chunks)
+    assert all(ev["args"]["parent_id"] in ids for ev in events if ev["args"]["parent_id"])
+    assert sorted(ev["args"]["page"] for ev in events if ev["name"] == "page") == [1, 2, 3, 4]
@@ -2,7 +2,12 @@ from pathlib import Path
 
 import os
 
-from fastmcp_pdf_server.utils.validators import assert_extension, assert_max_size
+import pytest
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.services import pdf_processor
+from fastmcp_pdf_server.services.pdf_probe import probe_pdf
+from fastmcp_pdf_server.utils.validators import assert_extension, assert_max_size, preflight_pdf, validate_pdf
 
 
 def test_assert_extension_ok(tmp_path: Path):
@@ -14,4 +19,84 @@ def test_assert_extension_ok(tmp_path: Path):
 def test_assert_max_size(tmp_path: Path):
     p = tmp_path / "big.bin"
     p.write_bytes(b"0" * 1024)
-    assert_max_size(p, max_mb=1)  # 1MB OK for 1KB file
\ No newline at end of file
+    assert_max_size(p, max_mb=1)  # 1MB OK for 1KB file
+
+
+def _pdf(tmp_path: Path, name: str = "ok.pdf", pages: int = 1) -> Path:
+    p = tmp_path / name
+    c = canvas.Canvas(str(p))
+    for _ in range(pages):
+        c.drawString(100, 750, "preflight")
+        c.showPage()
+    c.save()
+    return p
+
+
+def test_preflight_accepts_pdf_and_caches_verdict(tmp_path: Path):
+    p = _pdf(tmp_path)
+    report = preflight_pdf(p)
+    assert report.xref_kind == "table"
+    assert report.encrypted is False and report.linearized is False
+    assert report.page_count_hint is None
+    assert report.startxref < report.file_size
+    assert preflight_pdf(p) is report
+
+
+def test_preflight_rejects_mislabeled_and_truncated_files(tmp_path: Path):
+    png = tmp_path / "scan.pdf"
+    png.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+    with pytest.raises(ValueError, match="looks like a PNG image"):
+        validate_pdf(png)
+
+    data = _pdf(tmp_path).read_bytes()
+    cut = tmp_path / "cut.pdf"
+    cut.write_bytes(data[: len(data) // 2])
+    with pytest.raises(ValueError, match="no %%EOF"):
+        validate_pdf(cut)
+
+    bad_xref = tmp_path / "bad_xref.pdf"
+    bad_xref.write_bytes(data[:-30] + b"\nstartxref\n99999999\n%%EOF\n")
+    with pytest.raises(ValueError, match="past end of file"):
+        validate_pdf(bad_xref)
+
+    # Verdict is keyed by content identity: fixing the file clears it
+    cut.write_bytes(data)
+    os.utime(cut, ns=(0, 10**9))
+    assert validate_pdf(cut) == cut.resolve()
+
+
+def test_preflight_reads_linearization_hints(tmp_path: Path):
+    def build(length: int) -> bytes:
+        head = b"%%PDF-1.7\n1 0 obj\n<< /Linearized 1 /L %d /N 42 /O 3 >>\nendobj\n" % length
+        trailer = b"trailer\n<< /Size 1 /Encrypt 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % len(head)
+        return head + b"xref\n0 1\n0000000000 65535 f \n" + trailer
+
+    size = len(build(0))
+    while len(build(size)) != size:
+        size = len(build(size))
+    p = tmp_path / "lin.pdf"
+    p.write_bytes(build(size))
+    report = preflight_pdf(p)
+    assert report.linearized is True
+    assert report.page_count_hint == 42
+    assert report.encrypted is True
+    assert report.pdf_version == "1.7"
+
+    # An appended update invalidates the linearization hints
+    with p.open("ab") as fh:
+        fh.write(b"%% update\nstartxref\n%d\n%%%%EOF\n" % report.startxref)
+    updated = preflight_pdf(p)
+    assert updated.linearized is False and updated.page_count_hint is None
+
+
+@pytest.mark.parametrize("padding", [5000, 3 * 1024 * 1024])
+def test_preflight_accepts_bytes_after_eof(tmp_path: Path, padding: int):
+    p = _pdf(tmp_path, pages=3)
+    clean = preflight_pdf(p)
+    with p.open("ab") as fh:
+        fh.write(b"\0" * padding)
+    report = preflight_pdf(p)
+    assert report.startxref == clean.startxref and report.xref_kind == "table"
+    assert validate_pdf(p) == p.resolve()
+    assert probe_pdf(p).page_count == 3
+    assert pdf_processor.extract_text(str(p), engine="pypdf2").page_count == 3
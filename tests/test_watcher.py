@@ -0,0 +1,95 @@
+import os
+import time
+from pathlib import Path
+
+from reportlab.pdfgen import canvas
+
+from fastmcp_pdf_server.config import settings
+from fastmcp_pdf_server.services import file_manager, pdf_probe
+from fastmcp_pdf_server.services import watcher as watcher_module
+from fastmcp_pdf_server.services.watcher import FolderWatcher
+from fastmcp_pdf_server.utils import validators
+
+
+def make_pdf(path: Path, pages: int) -> Path:
+    c = canvas.Canvas(str(path))
+    for i in range(pages):
+        c.drawString(100, 700, f"Inbox page {i+1}")
+        c.showPage()
+    c.save()
+    return path
+
+
+def test_scan_waits_for_settle_then_warms_caches(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "watch_settle_seconds", 2)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    pdf = make_pdf(inbox / "report.pdf", 3)
+    (inbox / "notes.txt").write_text("not a pdf")
+    make_pdf(inbox / ".partial.pdf", 1)
+    watcher = FolderWatcher(inbox, mode="poll")
+
+    assert watcher.scan(now=100.0) == []
+    assert watcher.scan(now=103.0) == [pdf]
+    warmed = watcher.run_once(now=103.0)
+    assert [(w["path"], w["page_count"]) for w in warmed] == [(str(pdf.resolve()), 3)]
+    assert len(warmed[0]["sha256"]) == 64
+    assert watcher.run_once(now=200.0) == []  # already warm
+
+    key = pdf_probe.file_identity(pdf)
+    assert key in pdf_probe._probe_cache
+    assert any(k[0] == str(pdf.resolve()) for k in validators._preflight_cache)
+    assert file_manager._digests[key] == warmed[0]["sha256"]
+    assert list((settings.temp_path / ".cache").rglob("*.json"))
+    snap = watcher.snapshot()
+    assert snap["files_seen"] == 1 and snap["files_warmed"] == 1 and snap["errors"] == 0
+
+
+def test_rewritten_and_broken_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "watch_settle_seconds", 0)
+    watcher = FolderWatcher(tmp_path, mode="poll")
+    pdf = make_pdf(tmp_path / "a.pdf", 1)
+    (tmp_path / "broken.pdf").write_bytes(b"not really a pdf")
+    assert [w["page_count"] for w in watcher.run_once()] == [1]
+    assert watcher.metrics.errors == 1
+    assert watcher.run_once() == []  # the broken file is not retried
+
+    time.sleep(0.01)
+    make_pdf(pdf, 2)
+    assert [w["page_count"] for w in watcher.run_once()] == [2]
+
+
+def test_background_thread_picks_up_new_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "watch_settle_seconds", 0)
+    monkeypatch.setattr(settings, "watch_interval_seconds", 30)
+    watcher = FolderWatcher(tmp_path, mode="auto")
+    watcher.start()
+    try:
+        make_pdf(tmp_path / "late.pdf", 2)
+        deadline = time.monotonic() + 10
+        while watcher.metrics.files_warmed == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+    snap = watcher.snapshot()
+    assert snap["files_warmed"] == 1 and snap["mode"] == "inotify"
+
+
+def test_each_file_is_warmed_by_one_worker(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "watch_settle_seconds", 0)
+    make_pdf(tmp_path / "shared.pdf", 2)
+    # One watcher per uvicorn worker, all sharing the temp store
+    first, second = FolderWatcher(tmp_path, mode="poll"), FolderWatcher(tmp_path, mode="poll")
+    assert [w["page_count"] for w in first.run_once()] == [2]
+    assert second.run_once() == []
+    assert second.metrics.files_skipped == 1 and second.metrics.files_warmed == 0
+    assert second.run_once() == []  # not retried
+    assert second.metrics.files_skipped == 1
+
+    # A claim left by a crashed worker expires
+    claims = list((settings.temp_path / ".locks" / "watch").glob("*.claim"))
+    assert len(claims) == 1
+    old = time.time() - watcher_module.CLAIM_STALE_SECONDS - 1
+    os.utime(claims[0], (old, old))
+    third = FolderWatcher(tmp_path, mode="poll")
+    assert [w["page_count"] for w in third.run_once()] == [2]